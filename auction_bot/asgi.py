@@ -1,10 +1,20 @@
 """
 ASGI config for auction_bot project (simplified - no WebSockets).
+
+Live auction streams (/api/auctions/<id>/stream/) are served by
+auctions.live.stream_app; everything else goes to Django.
 """
 import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'auction_bot.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from auctions.live import STREAM_PATH, stream_app  # noqa: E402  (needs the app registry)
+
 
+async def application(scope, receive, send):
+    if scope['type'] == 'http' and STREAM_PATH.match(scope['path']):
+        return await stream_app(scope, receive, send)
+    return await django_application(scope, receive, send)
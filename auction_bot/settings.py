@@ -98,6 +98,25 @@ except ImportError:
     }
 
 
+# Cache
+# Shared Redis cache if REDIS_URL is set (multiple workers), otherwise per-process memory
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        }
+    }
+
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -179,7 +198,7 @@ CORS_ALLOWED_ORIGINS = config(
 CORS_ALLOW_CREDENTIALS = True
 
 
-# Bot runs using Django's threading (no Celery/Redis needed)
+# Bots run on a single in-process scheduler with a small worker pool (no Celery/Redis needed)
 
 
 # Auction Bot Configuration
@@ -190,10 +209,29 @@ AUCTION_CONFIG = {
     'PHASE_1_END': 0.25,  # 25% of total time
     'PHASE_2_END': 0.75,  # 75% of total time
     'PHASE_3_EXTENSION_TIME': 5,  # seconds to extend per bid in Phase 3
+    'PHASE_3_MAX_EXTENSION': 30,  # seconds Phase 3 bids may extend an auction past its original end
     'BOT_REACTION_DELAY_MIN': 1,  # seconds
     'BOT_REACTION_DELAY_MAX': 3,  # seconds
     'PHASE_3_BID_PROBABILITY': 0.30,  # 30% chance per second
+    'BOT_PLAN_SEED': None,  # salt of the seeded bot plans; None uses SECRET_KEY
     'WAIT_PERCENTAGE': 0.75,  # Wait 75% of phase before bidding
+    'BOT_ENGINE_WORKERS': 4,  # worker threads shared by all running bots
+    'BOT_ENGINE_BATCH': False,  # evaluate due bots together with set-based queries
+    'BOT_BATCH_WINDOW': 1.0,  # seconds; batch mode aligns wakeups to this grid
+    'BOT_LEASE_TTL': 15,  # seconds before a dead process's bots can be taken over
+    'BOT_LEASE_HEARTBEAT': 5,  # seconds between lease renewals / orphan scans
+    'BOT_BID_WATCH_INTERVAL': 0.5,  # seconds between checks for human bids from other processes
+    'LIVE_POLL_INTERVAL': 1.0,  # seconds between live stream reloads of a watched auction
+    'LIVE_HEARTBEAT': 15,  # seconds of silence before a live stream sends a keep-alive
+    'LIVE_QUEUE_SIZE': 100,  # events buffered per viewer before a slow viewer is dropped
+    'READ_CACHE_TTL': 0.5,  # seconds hot read responses are cached; 0 disables
+    'READ_CACHE_ALIAS': 'default',  # CACHES alias holding cached responses
+    'LOG_WRITER_SYNC': False,  # save auction logs in the bid transaction (tests)
+    'LOG_BATCH_SIZE': 100,  # queued auction logs that trigger an immediate flush
+    'LOG_FLUSH_INTERVAL': 0.5,  # seconds between auction log flushes
+    'LOG_FLUSH_ON_EXIT': True,  # flush queued auction logs at interpreter shutdown
+    'COMPLETION_SWEEP_INTERVAL': 5,  # max seconds between completion sweeps for expired auctions
+    'START_SCHEDULER_LOOKAHEAD': 5,  # seconds of upcoming scheduled starts held in the start scheduler's heap
 }
 
 
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Auction, Bid, AuctionLog
+from .models import Auction, Bid, AuctionLog, AuctionSummary, BotLease, ProxyBid
 
 
 @admin.register(Auction)
@@ -12,7 +12,8 @@ class AuctionAdmin(admin.ModelAdmin):
     readonly_fields = ['id', 'current_price', 'start_time', 'end_time', 
                       'extended_time', 'bot_current_bid', 'winner', 
                       'created_at', 'updated_at', 'current_phase', 
-                      'phase_progress', 'remaining_time', 'elapsed_time']
+                      'phase_progress', 'remaining_time', 'elapsed_time',
+                      'total_bids', 'human_bids_count', 'bot_bids_count', 'latest_bid']
     fieldsets = (
         ('Basic Information', {
             'fields': ('id', 'title', 'description', 'created_by')
@@ -21,7 +22,7 @@ class AuctionAdmin(admin.ModelAdmin):
             'fields': ('start_price', 'max_bid', 'current_price')
         }),
         ('Timing', {
-            'fields': ('duration', 'start_time', 'end_time', 'extended_time',
+            'fields': ('duration', 'scheduled_start', 'start_time', 'end_time', 'extended_time',
                       'remaining_time', 'elapsed_time')
         }),
         ('Status', {
@@ -30,6 +31,9 @@ class AuctionAdmin(admin.ModelAdmin):
         ('Bot Configuration', {
             'fields': ('bot_active', 'bot_current_bid')
         }),
+        ('Bids', {
+            'fields': ('total_bids', 'human_bids_count', 'bot_bids_count', 'latest_bid')
+        }),
         ('Timestamps', {
             'fields': ('created_at', 'updated_at')
         }),
@@ -45,6 +49,14 @@ class BidAdmin(admin.ModelAdmin):
     readonly_fields = ['id', 'timestamp']
 
 
+@admin.register(ProxyBid)
+class ProxyBidAdmin(admin.ModelAdmin):
+    """Admin interface for ProxyBid model."""
+    list_display = ['auction', 'bidder', 'ceiling', 'created_at', 'updated_at']
+    search_fields = ['auction__title', 'bidder__username']
+    readonly_fields = ['created_at', 'updated_at']
+
+
 @admin.register(AuctionLog)
 class AuctionLogAdmin(admin.ModelAdmin):
     """Admin interface for AuctionLog model."""
@@ -54,3 +66,24 @@ class AuctionLogAdmin(admin.ModelAdmin):
     readonly_fields = ['timestamp']
     ordering = ['-timestamp']
 
+
+@admin.register(BotLease)
+class BotLeaseAdmin(admin.ModelAdmin):
+    """Admin interface for BotLease model."""
+    list_display = ['auction', 'owner', 'expires_at', 'heartbeat_at', 'acquired_at']
+    search_fields = ['auction__title', 'owner']
+    readonly_fields = ['acquired_at', 'heartbeat_at']
+
+
+@admin.register(AuctionSummary)
+class AuctionSummaryAdmin(admin.ModelAdmin):
+    """Admin interface for AuctionSummary model (read-only)."""
+    list_display = ['auction', 'final_price', 'winner_type', 'total_bids', 'duration_seconds', 'created_at']
+    list_filter = ['winner_type', 'created_at']
+    search_fields = ['auction__title']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -16,29 +16,27 @@ class AuctionsConfig(AppConfig):
             self._start_existing_bots()
     
     def _start_existing_bots(self):
-        """Start bots for all active auctions on server startup."""
+        """Take over bots for active auctions that no running process owns."""
         try:
             # Import here to avoid circular imports
-            from .models import Auction
-            from .bot_runner import start_auction_bot
+            from .bot_runner import get_engine
+            from .completion import start_sweeper
+            from .scheduled_starts import get_scheduler
             import logging
             
             logger = logging.getLogger('auctions')
             
-            # Find all active auctions with bots enabled
-            active_auctions = Auction.objects.filter(
-                status='active',
-                bot_active=True
-            )
+            # Every worker process runs this; leases make sure each auction's
+            # bot is only claimed once, and the keeper keeps claiming auctions
+            # whose owner dies.
+            engine = get_engine()
+            claimed = engine.claim_orphaned_bots()
+            engine.start_keeper(claim_orphans=True)
+            # Completes expired auctions whatever happened to their bots
+            start_sweeper()
+            get_scheduler().start()
             
-            logger.info(f"Starting bots for {active_auctions.count()} active auctions on server startup")
-            
-            for auction in active_auctions:
-                try:
-                    start_auction_bot(str(auction.id))
-                    logger.info(f"Auto-started bot for auction: {auction.title} ({auction.id})")
-                except Exception as e:
-                    logger.error(f"Failed to start bot for auction {auction.id}: {e}")
+            logger.info(f"Claimed bots for {len(claimed)} active auctions on server startup")
                     
         except Exception as e:
             # Don't crash Django startup if bot starting fails
@@ -55,7 +53,11 @@ class AuctionsConfig(AppConfig):
             return False
             
         # Skip if running migrations or other management commands
-        if len(sys.argv) > 1 and sys.argv[1] in ['migrate', 'makemigrations', 'collectstatic', 'shell', 'test']:
+        if len(sys.argv) > 1 and sys.argv[1] in [
+            'migrate', 'makemigrations', 'collectstatic', 'shell', 'test',
+            'simulate_auctions', 'sync_bid_counters', 'backfill_auction_summaries',
+            'reconcile_stats', 'benchmark_serializers', 'backtest_strategy',
+        ]:
             return False
             
         # Skip if in development and this is a reload (RUN_MAIN is set by Django dev server)
@@ -0,0 +1,354 @@
+"""
+Vectorized strategy backtester over historical auctions.
+
+Replays the human bids of completed auctions against the bot strategy for
+a whole grid of parameter sets at once. History is loaded into columnar
+NumPy arrays with one query for the auctions and one for their bids. The
+replay then steps through time one second (one Phase 3 roll) at a time and
+updates every (parameter set, auction, run) combination with array
+operations, so its cost follows the longest auction, not the number of
+auctions or parameter sets.
+
+Replay model: every human bidder of a historical auction bids again at the
+second they bid originally, raising the price by what they raised it then,
+unless they are leading or the new price would pass the highest amount
+they ever bid on that auction (their revealed valuation). The bot follows
+AuctionBot's strategy with the parameters under test:
+- Phases 1 and 2: one bid at the wait point unless it has already bid in
+  that phase, and an answer to human bids after the reaction delay.
+- Phase 3: an immediate answer to human bids, a bid on each roll with the
+  roll probability, and an extension when it bids in the last seconds.
+The bot bids at most once per second.
+
+Every parameter set sees the same random draws, so the differences between
+them are not noise from the draws. Runs repeat the replay with fresh draws.
+"""
+import itertools
+import math
+import numpy as np
+from django.conf import settings
+from .bot_logic import AuctionBot
+from .bot_plan import roll_probability
+from .models import Auction, Bid
+
+# Parameters a backtest grid can vary, with the source of their current values
+GRID_KEYS = ('PHASE_3_BID_PROBABILITY', 'PHASE_1_WAIT_PERCENTAGE', 'PHASE_2_WAIT_PERCENTAGE', 'BID_INCREMENTS')
+
+# Upper bound on (parameter set x auction x run) cells replayed together
+MAX_CELLS = 2_000_000
+
+# Leader codes besides human bidder slots (which are >= 0)
+_NOBODY = -1
+_BOT = -2
+
+
+def current_params(config=None):
+    """The strategy parameters the bot runs with today."""
+    config = config or settings.AUCTION_CONFIG
+    return {
+        'PHASE_3_BID_PROBABILITY': config['PHASE_3_BID_PROBABILITY'],
+        'PHASE_1_WAIT_PERCENTAGE': AuctionBot.PHASE_1_WAIT_PERCENTAGE,
+        'PHASE_2_WAIT_PERCENTAGE': AuctionBot.PHASE_2_WAIT_PERCENTAGE,
+        'BID_INCREMENTS': list(config['BID_INCREMENTS']),
+    }
+
+
+def parameter_grid(values, config=None):
+    """
+    Every combination of the given parameter values.
+
+    `values` maps GRID_KEYS to lists of values; keys left out keep their
+    current value.
+    """
+    unknown = set(values) - set(GRID_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown strategy parameters: {', '.join(sorted(unknown))}")
+    base = current_params(config)
+    keys = list(GRID_KEYS)
+    choices = [values.get(key, [base[key]]) for key in keys]
+    return [dict(zip(keys, combination)) for combination in itertools.product(*choices)]
+
+
+class History:
+    """Completed auctions and their human bids as columnar arrays."""
+
+    def __init__(self, auctions, bids):
+        """
+        `auctions`: (id, duration, start_price, max_bid, final_price, winner_is_human) rows.
+        `bids`: (auction index, seconds after start, bidder, bidder_type, amount) rows in bid order.
+        """
+        self.ids = [row[0] for row in auctions]
+        self.duration = np.array([row[1] for row in auctions], dtype=float)
+        self.start_price = np.array([row[2] for row in auctions], dtype=float)
+        self.max_bid = np.array([row[3] for row in auctions], dtype=float)
+        self.final_price = np.array([row[4] for row in auctions], dtype=float)
+        self.human_won = np.array([row[5] for row in auctions], dtype=bool)
+
+        auction = np.array([row[0] for row in bids], dtype=np.int64)
+        second = np.array([row[1] for row in bids], dtype=float)
+        human = np.array([row[3] == 'human' for row in bids], dtype=bool)
+        amount = np.array([row[4] for row in bids], dtype=float)
+
+        # The price each bid raised: the previous bid of the same auction, or the start price
+        previous = np.empty_like(amount)
+        if len(amount):
+            previous[0] = self.start_price[auction[0]]
+            previous[1:] = np.where(auction[1:] == auction[:-1], amount[:-1], self.start_price[auction[1:]])
+        step = min(settings.AUCTION_CONFIG['BID_INCREMENTS'])
+        raise_by = np.maximum(amount - previous, step)
+
+        # One slot per (auction, human bidder); a slot's cap is the most that bidder ever bid
+        bidder = np.array([row[2] or 0 for row in bids], dtype=np.int64)
+        slot = np.zeros(0, dtype=np.int64)
+        if human.any():
+            pairs = np.stack([auction[human], bidder[human]], axis=1)
+            slot = np.unique(pairs, axis=0, return_inverse=True)[1].reshape(-1)
+        self.cap = np.zeros(slot.max() + 1 if len(slot) else 0)
+        np.maximum.at(self.cap, slot, amount[human])
+
+        self.bid_auction = auction[human]
+        self.bid_second = np.floor(np.maximum(second[human], 0)).astype(np.int64)
+        self.bid_slot = slot
+        self.bid_raise = raise_by[human]
+
+    @property
+    def size(self):
+        return len(self.ids)
+
+    def summary(self):
+        """What actually happened in these auctions, to compare the backtest with."""
+        return {
+            'auctions': self.size,
+            'human_bids': len(self.bid_second),
+            'final_price_mean': float(self.final_price.mean()) if self.size else 0,
+            'human_win_rate': float(self.human_won.mean()) if self.size else 0,
+        }
+
+    @classmethod
+    def load(cls, auctions=None):
+        """Load completed auctions (or the given Auction queryset) and their bids."""
+        if auctions is None:
+            auctions = Auction.objects.filter(status='completed')
+        rows = list(auctions.filter(start_time__isnull=False).order_by('start_time').values_list(
+            'id', 'start_time', 'duration', 'start_price', 'max_bid', 'current_price', 'winner_id'
+        ))
+        index = {row[0]: position for position, row in enumerate(rows)}
+        start_times = [row[1] for row in rows]
+
+        bids = [
+            (index[auction_id], (timestamp - start_times[index[auction_id]]).total_seconds(),
+             bidder_id, bidder_type, float(amount))
+            for auction_id, timestamp, bidder_id, bidder_type, amount in Bid.objects.filter(
+                auction_id__in=list(index)
+            ).order_by('auction_id', 'timestamp').values_list(
+                'auction_id', 'timestamp', 'bidder_id', 'bidder_type', 'amount'
+            ).iterator()
+        ]
+        bids.sort(key=lambda bid: bid[0])  # stable: keeps each auction's bids in time order
+        return cls(
+            [(row[0], row[2], float(row[3]), float(row[4]), float(row[5]), row[6] is not None) for row in rows],
+            bids
+        )
+
+    def chunk(self, start, stop):
+        """The auctions start..stop as their own History."""
+        part = History.__new__(History)
+        part.ids = self.ids[start:stop]
+        for name in ('duration', 'start_price', 'max_bid', 'final_price', 'human_won'):
+            setattr(part, name, getattr(self, name)[start:stop])
+        selected = (self.bid_auction >= start) & (self.bid_auction < stop)
+        part.bid_auction = self.bid_auction[selected] - start
+        part.bid_second = self.bid_second[selected]
+        part.bid_slot = self.bid_slot[selected]
+        part.bid_raise = self.bid_raise[selected]
+        part.cap = self.cap
+        return part
+
+
+def backtest(history, grid, runs=8, seed=None, config=None):
+    """
+    Replay `history` under every parameter set of `grid`.
+
+    Returns one report per parameter set, in grid order.
+    """
+    config = {**settings.AUCTION_CONFIG, **(config or {})}
+    rng = np.random.default_rng(seed)
+    totals = [_Totals() for _ in grid]
+    if history.size:
+        per_chunk = max(1, MAX_CELLS // (len(grid) * runs))
+        for start in range(0, history.size, per_chunk):
+            part = history.chunk(start, min(start + per_chunk, history.size))
+            _replay(part, grid, runs, rng, config, totals)
+    return [
+        {**params, **total.report(runs, history)}
+        for params, total in zip(grid, totals)
+    ]
+
+
+class _Totals:
+    """Running sums of one parameter set's outcomes across chunks."""
+
+    def __init__(self):
+        self.final_price = 0.0
+        self.final_prices = []
+        self.bot_wins = 0
+        self.human_wins = 0
+        self.extensions = 0.0
+        self.max_extensions = 0.0
+        self.bot_bids = 0
+
+    def add(self, price, leader, extensions, bot_bids):
+        self.final_price += price.sum()
+        self.final_prices.append(price.reshape(-1))
+        self.bot_wins += int((leader == _BOT).sum())
+        self.human_wins += int((leader >= 0).sum())
+        self.extensions += extensions.sum()
+        self.max_extensions = max(self.max_extensions, float(extensions.max(initial=0)))
+        self.bot_bids += int(bot_bids.sum())
+
+    def report(self, runs, history):
+        replays = history.size * runs
+        prices = np.concatenate(self.final_prices) if self.final_prices else np.zeros(0)
+        return {
+            'replays': replays,
+            'final_price_mean': self.final_price / replays if replays else 0,
+            'final_price_p95': float(np.quantile(prices, 0.95)) if replays else 0,
+            'bot_win_rate': self.bot_wins / replays if replays else 0,
+            'human_win_rate': self.human_wins / replays if replays else 0,
+            'extensions_mean': self.extensions / replays if replays else 0,
+            'extensions_max': self.max_extensions,
+            'bot_bids_mean': self.bot_bids / replays if replays else 0,
+        }
+
+
+def _replay(history, grid, runs, rng, config, totals):
+    """Replay one chunk of auctions under every parameter set, adding the outcomes to `totals`."""
+    shape = (len(grid), history.size, runs)
+
+    # Parameters as (sets, 1, 1) columns; increment sets are padded to one width
+    def column(key, convert=float):
+        return np.array([convert(params[key]) for params in grid], dtype=float).reshape(-1, 1, 1)
+
+    probability = np.array(
+        [roll_probability({'PHASE_3_BID_PROBABILITY': params['PHASE_3_BID_PROBABILITY']}) for params in grid]
+    ).reshape(-1, 1, 1)
+    wait_1 = column('PHASE_1_WAIT_PERCENTAGE')
+    wait_2 = column('PHASE_2_WAIT_PERCENTAGE')
+    width = max(len(params['BID_INCREMENTS']) for params in grid)
+    increments = np.array([
+        list(params['BID_INCREMENTS']) + [params['BID_INCREMENTS'][-1]] * (width - len(params['BID_INCREMENTS']))
+        for params in grid
+    ], dtype=float)
+    increment_count = column('BID_INCREMENTS', len).astype(np.int64)
+    parameter_set = np.arange(len(grid)).reshape(-1, 1, 1)
+
+    # Auction timing as (1, auctions, 1) columns
+    duration = history.duration.reshape(1, -1, 1)
+    max_bid = history.max_bid.reshape(1, -1, 1)
+    phase_1_end = duration * 0.25
+    phase_2_end = duration * 0.75
+    wait_1_at = phase_1_end * wait_1
+    wait_2_at = phase_1_end + (phase_2_end - phase_1_end) * wait_2
+    extension_time = config['PHASE_3_EXTENSION_TIME']
+    max_extension = config.get('PHASE_3_MAX_EXTENSION', 30)
+    delay_low, delay_high = config['BOT_REACTION_DELAY_MIN'], config['BOT_REACTION_DELAY_MAX']
+
+    price = np.broadcast_to(history.start_price.reshape(1, -1, 1), shape).copy()
+    end = np.broadcast_to(duration, shape).copy()
+    leader = np.full(shape, _NOBODY, dtype=np.int64)
+    active = np.ones(shape, dtype=bool)
+    extended = np.zeros(shape)
+    bot_bids = np.zeros(shape, dtype=np.int64)
+    bid_in_phase_1 = np.zeros(shape, dtype=bool)
+    bid_in_phase_2 = np.zeros(shape, dtype=bool)
+    reaction_at = np.full(shape, np.inf)
+    reaction_phase = np.zeros(shape, dtype=np.int8)
+    answer_again = np.zeros(shape, dtype=bool)
+
+    # Human bids grouped by second; bids of one auction within a second are applied in order
+    order = np.lexsort((np.arange(len(history.bid_second)), history.bid_second))
+    bid_second = history.bid_second[order]
+    bid_auction = history.bid_auction[order]
+    bid_slot = history.bid_slot[order]
+    bid_raise = history.bid_raise[order]
+    first_of_group = np.ones(len(order), dtype=bool)
+    first_of_group[1:] = (bid_second[1:] != bid_second[:-1]) | (bid_auction[1:] != bid_auction[:-1])
+    group_start = np.maximum.accumulate(np.where(first_of_group, np.arange(len(order)), 0))
+    bid_rank = np.arange(len(order)) - group_start
+    slot_cap = history.cap[bid_slot] if len(bid_slot) else np.zeros(0)
+
+    steps = int(math.ceil(history.duration.max() + max_extension)) + 1
+    bounds = np.searchsorted(bid_second, np.arange(steps + 1))
+    for second in range(steps):
+        now = float(second)
+        active &= now < end
+        if not active.any():
+            break
+        in_phase_1 = now <= phase_1_end
+        in_phase_3 = now > phase_2_end
+        in_phase_2 = ~in_phase_1 & ~in_phase_3
+
+        delay = np.ceil(delay_low + (delay_high - delay_low) * rng.random((1, history.size, runs)))
+
+        # Human bids of this second
+        answer_now = np.zeros(shape, dtype=bool)
+        rows = slice(bounds[second], bounds[second + 1])
+        for rank in range(int(bid_rank[rows].max(initial=-1)) + 1):
+            pick = np.flatnonzero(bid_rank[rows] == rank) + rows.start
+            auction, slot = bid_auction[pick], bid_slot[pick]
+            amount = price[:, auction, :] + bid_raise[pick].reshape(1, -1, 1)
+            accepted = (
+                active[:, auction, :]
+                & (leader[:, auction, :] != slot.reshape(1, -1, 1))
+                & (amount <= slot_cap[pick].reshape(1, -1, 1))
+                & (amount <= max_bid[:, auction, :])
+            )
+            price[:, auction, :] = np.where(accepted, amount, price[:, auction, :])
+            leader[:, auction, :] = np.where(accepted, slot.reshape(1, -1, 1), leader[:, auction, :])
+
+            # Phase 3 answers at once; Phases 1 and 2 after the reaction delay
+            late = np.broadcast_to(in_phase_3[:, auction, :], accepted.shape)
+            answer_now[:, auction, :] |= accepted & late
+            waiting = np.isfinite(reaction_at[:, auction, :])
+            react = accepted & ~late & ~waiting
+            answer_again[:, auction, :] |= accepted & ~late & waiting
+            reaction_at[:, auction, :] = np.where(react, now + delay[:, auction, :], reaction_at[:, auction, :])
+            reaction_phase[:, auction, :] = np.where(
+                react, np.where(in_phase_1[:, auction, :], 1, 2), reaction_phase[:, auction, :]
+            )
+
+        # The bot's decisions for this second
+        reacting = reaction_at <= now
+        bid_phase = np.where(reacting, reaction_phase, 0)
+        wait_point_1 = in_phase_1 & (now >= wait_1_at) & ~bid_in_phase_1
+        wait_point_2 = in_phase_2 & (now >= wait_2_at) & ~bid_in_phase_2
+        bid_phase = np.where((bid_phase == 0) & wait_point_1, 1, bid_phase)
+        bid_phase = np.where((bid_phase == 0) & wait_point_2, 2, bid_phase)
+        roll = rng.random((1, history.size, runs)) < probability
+        bid_phase = np.where((bid_phase == 0) & in_phase_3 & (answer_now | roll), 3, bid_phase)
+
+        bids = active & (bid_phase > 0) & (price < max_bid)
+        # A reaction is spent even when the bot cannot bid; a pending answer re-arms it
+        spent = reacting & active
+        reaction_at = np.where(spent & answer_again, now + delay, np.where(spent, np.inf, reaction_at))
+        answer_again &= ~spent
+
+        choice = (rng.random((1, history.size, runs)) * increment_count).astype(np.int64)
+        increment = increments[parameter_set, choice]
+        price = np.where(bids, np.minimum(price + increment, max_bid), price)
+        leader = np.where(bids, _BOT, leader)
+        bot_bids += bids
+        bid_in_phase_1 |= bids & (bid_phase == 1)
+        bid_in_phase_2 |= bids & (bid_phase == 2)
+
+        # Phase 3 bids in the last seconds extend the auction, up to the cap
+        extend = bids & (bid_phase == 3) & (end - now <= 5)
+        extension = np.where(extend, np.minimum(extension_time, max_extension - extended), 0)
+        extension = np.maximum(extension, 0)
+        end += extension
+        extended += extension
+
+        active &= price < max_bid
+
+    for index, total in enumerate(totals):
+        total.add(price[index], leader[index], extended[index] / extension_time, bot_bids[index])
@@ -0,0 +1,158 @@
+"""
+Conditional (compare-and-set) bid commits.
+
+A bid only lands if the auction is still active and its current price is still
+below the bid. The check and the price change happen in a single
+UPDATE ... WHERE that writes only the bid's columns. Concurrent human and bot
+bids on the same auction cannot overwrite each other. The bid that loses gets
+a BidConflict, and no auction row is locked while a bid is being decided.
+
+Proxy bids: a user can leave a standing ceiling (ProxyBid) on an auction.
+Every committed bid is answered, inside the same transaction, by the proxies
+it outbid, with the smallest BID_INCREMENTS step. When two proxies compete
+the lower one bids its whole ceiling and the higher one tops it by a step,
+so a war between proxies takes two bids instead of one per step.
+"""
+import logging
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from .models import Auction, AuctionLog, Bid, ProxyBid
+from . import log_writer, read_cache
+
+logger = logging.getLogger('auctions')
+
+
+class BidConflict(Exception):
+    """The auction changed under a bid so that it can no longer be accepted."""
+
+    def __init__(self, message, status=None, current_price=None):
+        super().__init__(message)
+        self.status = status
+        self.current_price = current_price
+
+
+def commit_bid(bid, log=None, changes=None, min_increment=0, require_time_left=False, proxies=True):
+    """
+    Save `bid` (and queue `log`) if the auction still accepts `bid.amount`.
+
+    The auction's current_price, bid counters, latest_bid and version are updated
+    together with any extra column values or F() expressions in `changes`.
+    The bid must be at least `min_increment` above the stored price (strictly
+    above when 0); with `require_time_left` the auction's end_time must also
+    lie ahead. With `proxies`, standing proxy bids answer the bid before the
+    transaction commits (see respond_with_proxies).
+
+    Raises BidConflict when another bid or a status change got there first.
+    """
+    now = timezone.now()
+    conditions = Q(pk=bid.auction_id, status='active')
+    if min_increment:
+        conditions &= Q(current_price__lte=bid.amount - min_increment)
+    else:
+        conditions &= Q(current_price__lt=bid.amount)
+    if require_time_left:
+        conditions &= Q(end_time__gt=now)
+
+    counter = 'human_bids_count' if bid.bidder_type == 'human' else 'bot_bids_count'
+    with transaction.atomic():
+        # Insert first so the auction can point at the bid; a conflict rolls both back
+        bid.save()
+        updated = Auction.objects.filter(conditions).update(
+            current_price=bid.amount,
+            updated_at=now,
+            total_bids=F('total_bids') + 1,
+            latest_bid=bid.pk,
+            version=F('version') + 1,
+            **{counter: F(counter) + 1},
+            **(changes or {})
+        )
+        if not updated:
+            raise _conflict(bid, now)
+        if log is not None:
+            log_writer.write(log)
+        read_cache.invalidate(bid.auction_id)
+        if proxies:
+            leader_id = bid.bidder_id if bid.bidder_type == 'human' else None
+            respond_with_proxies(bid.auction, bid.amount, leader_id)
+    return bid
+
+
+def _conflict(bid, now):
+    """Build the BidConflict explaining why the auction rejected `bid`."""
+    current = Auction.objects.filter(pk=bid.auction_id).values('status', 'current_price', 'end_time').first()
+    if current is None:
+        return BidConflict("Auction no longer exists.")
+    if current['status'] != 'active':
+        return BidConflict("Auction is not active.", current['status'], current['current_price'])
+    if current['end_time'] and current['end_time'] <= now:
+        return BidConflict("Auction has ended.", current['status'], current['current_price'])
+    logger.info(f"Bid of ₹{bid.amount} on auction {bid.auction_id} lost to a concurrent bid")
+    return BidConflict(
+        f"Another bid was placed first. Current price is ₹{current['current_price']}.",
+        current['status'],
+        current['current_price'],
+    )
+
+
+def respond_with_proxies(auction, price, leader_id):
+    """
+    Let the proxy bids on `auction` answer a bid that just committed, in the caller's transaction.
+
+    `price` is the auction's price after that bid and `leader_id` the leading
+    user (None when the bot leads). `auction` is only read for its timing.
+    Returns the proxy bids placed.
+    """
+    step = min(settings.AUCTION_CONFIG['BID_INCREMENTS'])
+    proxies = list(
+        ProxyBid.objects.filter(auction_id=auction.pk, ceiling__gte=price + step)
+        .select_related('bidder').order_by('-ceiling', 'created_at')[:2]
+    )
+    if not proxies:
+        return []
+
+    # On equal ceilings the earlier proxy is on top
+    top, runner_up = proxies[0], (proxies[1] if len(proxies) > 1 else None)
+    answers = []
+    if runner_up and runner_up.bidder_id != leader_id:
+        if runner_up.ceiling + step > top.ceiling:
+            # The top proxy could not answer its ceiling bid; the top proxy
+            # bids its own ceiling instead, which the runner-up cannot beat
+            answers.append((top, top.ceiling))
+            runner_up = None
+            leader_id = top.bidder_id
+        else:
+            # It would lose to the top proxy step by step; bid its ceiling at once
+            answers.append((runner_up, runner_up.ceiling))
+            price, leader_id = runner_up.ceiling, runner_up.bidder_id
+    if top.bidder_id != leader_id and top.ceiling >= price + step:
+        target = price + step
+        if runner_up:
+            target = max(target, runner_up.ceiling + step)
+        answers.append((top, min(top.ceiling, target)))
+
+    placed = []
+    for proxy, amount in answers:
+        bid = Bid(
+            auction=auction,
+            bidder=proxy.bidder,
+            bidder_type='human',
+            amount=amount,
+            phase=auction.current_phase
+        )
+        log = AuctionLog(
+            auction=auction,
+            event_type='bid_placed',
+            message=f"Proxy bid placed: ₹{amount} for {proxy.bidder.username} (up to ₹{proxy.ceiling})",
+            metadata={'bidder': proxy.bidder.username, 'amount': float(amount), 'phase': bid.phase, 'proxy': True}
+        )
+        try:
+            commit_bid(bid, log, min_increment=step, require_time_left=True, proxies=False)
+        except BidConflict as e:
+            # Only the proxy bid is rolled back (savepoint); the bid it answered stands
+            logger.info(f"Proxy bid of ₹{amount} on auction {auction.pk} rejected: {e}")
+            break
+        logger.info(f"Proxy bid placed: ₹{amount} for {proxy.bidder.username} on auction {auction.pk}")
+        placed.append(bid)
+    return placed
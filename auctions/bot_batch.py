@@ -0,0 +1,93 @@
+"""
+Set-based commit of bot bids collected from a batch of bot ticks.
+
+In batch mode the bot engine evaluates every due auction against snapshots
+loaded in one query, with each AuctionBot writing its bid intents to a shared
+sink instead of the database. place_bot_bids() then commits them all with a
+fixed number of round-trips: one locked re-read of the affected auctions,
+a bulk insert of the bids, and one bulk update of the auctions. The logs go
+to the batched log writer. Auctions with proxy bids then get their answers
+through bidding.respond_with_proxies().
+"""
+import logging
+from django.db import transaction
+from django.utils import timezone
+from .bidding import respond_with_proxies
+from .models import Auction, Bid, ProxyBid
+from . import log_writer, read_cache, stats
+from .signals import announce_bids
+
+logger = logging.getLogger('auctions')
+
+# Auction columns a bot bid can change
+BOT_BID_FIELDS = [
+    'current_price', 'bot_current_bid', 'end_time', 'extended_time',
+    'total_bids', 'bot_bids_count', 'latest_bid', 'version', 'updated_at',
+]
+
+
+def place_bot_bids(intents):
+    """
+    Commit (bot, phase) bid intents from a batch of ticks.
+
+    Returns the list of created bids.
+    """
+    if not intents:
+        return []
+
+    with transaction.atomic():
+        auction_ids = {bot.auction.pk for bot, _ in intents}
+        locked = {
+            auction.pk: auction
+            for auction in Auction.objects.select_for_update().filter(pk__in=auction_ids)
+        }
+
+        adopted = set()
+        bids, logs, changed = [], [], {}
+        for bot, phase in intents:
+            row = locked.get(bot.auction.pk)
+            if row is None:
+                continue
+            # Re-read once per auction; a second intent builds on the first one's changes
+            if row.pk not in adopted:
+                bot.adopt_row(row)
+                adopted.add(row.pk)
+
+            built = bot.build_bid(phase)
+            if built is None:
+                continue
+            bid, log = built
+            # The row is locked, so the counters can be bumped in memory
+            bot.auction.total_bids += 1
+            bot.auction.bot_bids_count += 1
+            bot.auction.latest_bid_id = bid.pk
+            bot.auction.version += 1
+            bids.append(bid)
+            logs.append(log)
+            changed[row.pk] = bot.auction
+
+        if not bids:
+            return []
+
+        now = timezone.now()
+        for auction in changed.values():
+            auction.updated_at = now
+
+        Bid.objects.bulk_create(bids)
+        log_writer.write(*logs)
+        Auction.objects.bulk_update(list(changed.values()), BOT_BID_FIELDS)
+
+        # bulk_create skips post_save, so announce and count the bids explicitly
+        announce_bids(bids)
+        stats.record_bids(bids)
+        read_cache.invalidate(*changed)
+
+        # Standing proxy bids answer in the same transaction; one query finds the auctions that have any
+        for auction_id in ProxyBid.objects.filter(auction_id__in=list(changed)).values_list(
+            'auction_id', flat=True
+        ).distinct():
+            auction = changed[auction_id]
+            respond_with_proxies(auction, auction.current_price, None)
+
+    logger.info(f"Bot batch placed {len(bids)} bids across {len(changed)} auctions")
+    return bids
@@ -1,23 +1,111 @@
 """
 Intelligent Auction Bot with Phase-Based Bidding Strategy
+
+The bot's timing and random draws come from a seeded BotPlan (see
+bot_plan.py); a tick only checks the plan against the clock and the
+auction's state.
 """
-import random
 import logging
 from django.utils import timezone
-from django.db import transaction
+from django.db.models import Exists, F, OuterRef, Subquery
 from django.conf import settings
+from . import clock
+from .bidding import BidConflict, commit_bid
+from .bot_plan import PHASE_BOUNDARY_SLACK, BotPlan
+from .completion import complete_auctions, is_due
 from .models import Auction, Bid, AuctionLog
 
 logger = logging.getLogger('auctions')
 
+# Marker for "latest human bid not supplied by the caller"
+_UNKNOWN = object()
+
+
+def snapshot_queryset():
+    """
+    Auctions annotated with everything the bot decides on, in one query.
+    
+    Adds `latest_human_bid_at` and `bot_bid_phase_1/2/3` flags so a tick
+    needs no per-decision bid lookups.
+    """
+    human_bids = Bid.objects.filter(auction=OuterRef('pk'), bidder_type='human')
+    bot_bids = Bid.objects.filter(auction=OuterRef('pk'), bidder_type='bot')
+    return Auction.objects.annotate(
+        latest_human_bid_at=Subquery(
+            human_bids.order_by('-timestamp').values('timestamp')[:1]
+        ),
+        bot_bid_phase_1=Exists(bot_bids.filter(phase=1)),
+        bot_bid_phase_2=Exists(bot_bids.filter(phase=2)),
+        bot_bid_phase_3=Exists(bot_bids.filter(phase=3)),
+    )
+
 
 class AuctionBot:
     """Smart auction bot with phase-based bidding strategy."""
     
-    def __init__(self, auction):
+    # Fraction of Phase 1 / Phase 2 the bot waits before its unprompted bid
+    PHASE_1_WAIT_PERCENTAGE = 0.5
+    PHASE_2_WAIT_PERCENTAGE = 0.6
+    # Seconds between probability rolls in Phase 3
+    PHASE_3_ROLL_INTERVAL = 1
+    
+    def __init__(self, auction, last_human_bid_at=_UNKNOWN, bid_sink=None, plan=None):
         self.auction = auction
         self.config = settings.AUCTION_CONFIG
         self.bid_increments = self.config['BID_INCREMENTS']
+        # Timestamp of the latest human bid the bot has not answered yet, as
+        # pushed by the bot engine. Left unknown, it is looked up on demand.
+        self.last_human_bid_at = last_human_bid_at
+        # Optional list collecting (bot, phase) bid intents instead of writing them
+        self.bid_sink = bid_sink
+        # Plan kept by the caller from earlier ticks; reseeded after human bids
+        self._plan = plan
+    
+    @property
+    def plan(self):
+        """The bot's BotPlan, replanned when a human bid has arrived since it was made."""
+        plan = self._plan
+        if plan is None or plan.start_time != self.auction.start_time:
+            if not self.auction.start_time:
+                return None
+            plan = self._plan = BotPlan(
+                self.auction,
+                self.config,
+                phase_1_wait=self.PHASE_1_WAIT_PERCENTAGE,
+                phase_2_wait=self.PHASE_2_WAIT_PERCENTAGE,
+                roll_interval=self.PHASE_3_ROLL_INTERVAL
+            )
+        elif plan.human_bids != self.auction.human_bids_count:
+            plan.reseed(self.auction)
+        return plan
+    
+    def has_recent_human_bid(self, seconds):
+        """Check if a human has bid within the last `seconds` seconds."""
+        since = clock.now() - timezone.timedelta(seconds=seconds)
+        latest = self.last_human_bid_at
+        if latest is _UNKNOWN:
+            if not hasattr(self.auction, 'latest_human_bid_at'):
+                return self.auction.bids.filter(
+                    bidder_type='human',
+                    timestamp__gte=since
+                ).exists()
+            latest = self.auction.latest_human_bid_at
+        return latest is not None and latest >= since
+    
+    def has_bot_bid_in_phase(self, phase):
+        """Check if the bot has already placed a bid in the given phase."""
+        flag = getattr(self.auction, f'bot_bid_phase_{phase}', None)
+        if flag is not None:
+            return flag
+        return self.auction.bids.filter(
+            bidder_type='bot',
+            phase=phase
+        ).exists()
+    
+    def adopt_row(self, row):
+        """Take the column values of a freshly read auction row, keeping snapshot annotations."""
+        for field in Auction._meta.concrete_fields:
+            setattr(self.auction, field.attname, getattr(row, field.attname))
     
     def can_bid(self):
         """Check if bot can place a bid."""
@@ -47,8 +135,8 @@ class AuctionBot:
         current = float(self.auction.current_price)
         max_bid = float(self.auction.max_bid)
         
-        # Choose a random increment
-        increment = random.choice(self.bid_increments)
+        # The plan's increment for this bid
+        increment = self.plan.increment(self.auction.bot_bids_count)
         next_bid = current + increment
         
         # Ensure we don't exceed max_bid
@@ -62,95 +150,122 @@ class AuctionBot:
         
         return next_bid
     
-    def should_bid_in_phase_1(self, elapsed_time, phase_duration):
+    def should_bid_in_phase_1(self, now):
         """Determine if bot should bid in Phase 1."""
-        logger.info(f"Phase 1 check: elapsed={elapsed_time:.1f}s, duration={phase_duration:.1f}s")
+        logger.info(f"Phase 1 check: {(self.plan.phase_1_wait - now).total_seconds():.1f}s until planned bid")
         
         # Check if human has bid recently (within last 10 seconds)
-        recent_human_bid = self.auction.bids.filter(
-            bidder_type='human',
-            timestamp__gte=timezone.now() - timezone.timedelta(seconds=10)
-        ).exists()
+        recent_human_bid = self.has_recent_human_bid(10)
         
         if recent_human_bid:
             logger.info("Human bid detected in Phase 1, bot will react")
             return True
         
         # Bid after 50% of Phase 1 (more aggressive than default 75%)
-        wait_percentage = 0.5
-        wait_time = phase_duration * wait_percentage
-        
-        if elapsed_time >= wait_time:
+        if now >= self.plan.phase_1_wait:
             # Check if bot has already bid in this phase
-            phase_bids = self.auction.bids.filter(
-                bidder_type='bot',
-                phase=1
-            ).exists()
-            
-            if not phase_bids:
-                logger.info(f"Bot will bid in Phase 1 after waiting {wait_time:.1f}s")
+            if not self.has_bot_bid_in_phase(1):
+                logger.info("Bot will bid in Phase 1 after its planned wait")
                 return True
         
         return False
     
-    def should_bid_in_phase_2(self, elapsed_time, phase_start, phase_duration):
+    def should_bid_in_phase_2(self, now):
         """Determine if bot should bid in Phase 2."""
-        phase_elapsed = elapsed_time - phase_start
-        logger.info(f"Phase 2 check: phase_elapsed={phase_elapsed:.1f}s, duration={phase_duration:.1f}s")
+        logger.info(f"Phase 2 check: {(self.plan.phase_2_wait - now).total_seconds():.1f}s until planned bid")
         
         # Check if human has bid recently (within last 10 seconds - same as Phase 1)
-        recent_human_bid = self.auction.bids.filter(
-            bidder_type='human',
-            timestamp__gte=timezone.now() - timezone.timedelta(seconds=10)
-        ).exists()
+        recent_human_bid = self.has_recent_human_bid(10)
         
         if recent_human_bid:
             logger.info("Human bid detected in Phase 2, bot will react")
             return True
         
         # More aggressive: Wait only 60% of Phase 2 (instead of 75%)
-        wait_percentage = 0.6
-        wait_time = phase_duration * wait_percentage
-        
         # If no human bid, bid once after 60% of phase
-        if phase_elapsed >= wait_time:
-            phase_bids = self.auction.bids.filter(
-                bidder_type='bot',
-                phase=2
-            ).exists()
-            
-            if not phase_bids:
-                logger.info(f"Bot will bid in Phase 2 after waiting {wait_time:.1f}s")
+        if now >= self.plan.phase_2_wait:
+            if not self.has_bot_bid_in_phase(2):
+                logger.info("Bot will bid in Phase 2 after its planned wait")
                 return True
         
         return False
     
-    def should_bid_in_phase_3(self):
+    def should_bid_in_phase_3(self, now):
         """Determine if bot should bid in Phase 3."""
         # Check if human has bid recently (within last 10 seconds)
-        recent_human_bid = self.auction.bids.filter(
-            bidder_type='human',
-            timestamp__gte=timezone.now() - timezone.timedelta(seconds=10)
-        ).exists()
+        recent_human_bid = self.has_recent_human_bid(10)
         
         if recent_human_bid:
             logger.info("Human bid detected in Phase 3, bot will react")
             return True
         
-        # If no recent human bids, use probability (but higher chance)
-        probability = min(0.60, self.config['PHASE_3_BID_PROBABILITY'] * 2)  # 60% chance
-        should_bid = random.random() < probability
+        # If no recent human bids, use the plan's probability roll for now (60% chance)
+        should_bid = self.plan.take_roll(now)
         
         if should_bid:
-            logger.info("Bot decided to bid in Phase 3 (random)")
+            logger.info("Bot decided to bid in Phase 3 (planned roll)")
         
         return should_bid
     
     def get_reaction_delay(self):
-        """Get random reaction delay for bot."""
-        min_delay = self.config['BOT_REACTION_DELAY_MIN']
-        max_delay = self.config['BOT_REACTION_DELAY_MAX']
-        return random.uniform(min_delay, max_delay)
+        """Get the planned reaction delay for the latest human bid."""
+        return self.plan.reaction_delay
+    
+    def build_bid(self, phase=None):
+        """
+        Apply a bot bid to the in-memory auction.
+        
+        Returns the unsaved (Bid, AuctionLog) pair, or None if the bot cannot
+        bid. The caller is responsible for holding the auction's row lock and
+        persisting the bid, the auction and the log.
+        """
+        if not self.can_bid():
+            return None
+        
+        # Calculate next bid amount
+        next_bid = self.get_next_bid_amount()
+        
+        # Check if we can afford it
+        if next_bid > self.auction.max_bid:
+            return None
+        
+        # Determine phase if not provided
+        if phase is None:
+            phase = self.auction.current_phase
+        
+        bid = Bid(
+            auction=self.auction,
+            bidder=None,
+            bidder_type='bot',
+            amount=next_bid,
+            phase=phase
+        )
+        
+        # Update auction - only update current_price if this bid is higher
+        if next_bid > self.auction.current_price:
+            self.auction.current_price = next_bid
+        self.auction.bot_current_bid = next_bid
+        
+        # Extend time in Phase 3 if needed, up to the extension cap
+        if phase == 3 and self.auction.remaining_time <= 5:
+            extension_time = min(
+                self.config['PHASE_3_EXTENSION_TIME'],
+                self.config.get('PHASE_3_MAX_EXTENSION', 30) - self.auction.extended_time
+            )
+            if self.auction.end_time and extension_time > 0:
+                self.auction.end_time += timezone.timedelta(seconds=extension_time)
+                self.auction.extended_time += extension_time
+        
+        log = AuctionLog(
+            auction=self.auction,
+            event_type='bot_action',
+            message=f"Bot placed bid: ₹{next_bid} in Phase {phase}",
+            metadata={'amount': float(next_bid), 'phase': phase}
+        )
+        
+        if phase in (1, 2, 3):
+            setattr(self.auction, f'bot_bid_phase_{phase}', True)
+        return bid, log
     
     def place_bid(self, phase=None):
         """Place a bid on behalf of the bot."""
@@ -160,67 +275,77 @@ class AuctionBot:
             logger.info("Bot cannot bid - conditions not met")
             return False
         
-        with transaction.atomic():
-            # Refresh auction from database
-            self.auction.refresh_from_db()
-            
-            if not self.can_bid():
-                return False
-            
-            # Calculate next bid amount
-            next_bid = self.get_next_bid_amount()
-            
-            # Check if we can afford it
-            if next_bid > self.auction.max_bid:
-                return False
-            
-            # Determine phase if not provided
-            if phase is None:
-                phase = self.auction.current_phase
-            
-            # Create the bid
-            bid = Bid.objects.create(
-                auction=self.auction,
-                bidder=None,
-                bidder_type='bot',
-                amount=next_bid,
-                phase=phase
-            )
-            
-            # Update auction - only update current_price if this bid is higher
-            if next_bid > self.auction.current_price:
-                self.auction.current_price = next_bid
-            self.auction.bot_current_bid = next_bid
-            
-            # Extend time in Phase 3 if needed
-            if phase == 3 and self.auction.remaining_time <= 5:
-                extension_time = self.config['PHASE_3_EXTENSION_TIME']
-                if self.auction.end_time:
-                    self.auction.end_time += timezone.timedelta(seconds=extension_time)
-                    self.auction.extended_time += extension_time
-            
-            self.auction.save()
-            
-            # Create log
-            AuctionLog.objects.create(
-                auction=self.auction,
-                event_type='bot_action',
-                message=f"Bot placed bid: ₹{next_bid} in Phase {phase}",
-                metadata={'amount': float(next_bid), 'phase': phase}
-            )
-            
-            logger.info(f"Bot bid placed: ₹{next_bid} on auction {self.auction.id} in Phase {phase}")
+        # In batch mode the bid is committed later together with other auctions'
+        if self.bid_sink is not None:
+            self.bid_sink.append((self, phase))
+            if phase in (1, 2, 3):
+                setattr(self.auction, f'bot_bid_phase_{phase}', True)
+            return True
+        
+        extended_before = self.auction.extended_time
+        built = self.build_bid(phase)
+        if built is None:
+            return False
+        bid, log = built
+        
+        # Only the columns this bid changes, applied relative to the stored row
+        changes = {'bot_current_bid': bid.amount}
+        extension = self.auction.extended_time - extended_before
+        if extension:
+            changes['end_time'] = F('end_time') + timezone.timedelta(seconds=extension)
+            changes['extended_time'] = F('extended_time') + extension
+        
+        try:
+            commit_bid(bid, log, changes=changes)
+        except BidConflict as e:
+            logger.info(f"Bot bid on auction {self.auction.id} rejected: {e}")
+            # The snapshot is stale; pick up the winning bid for the next decision
+            self.adopt_row(Auction.objects.get(pk=self.auction.pk))
+            setattr(self.auction, f'bot_bid_phase_{bid.phase}', None)
+            return False
         
+        logger.info(f"Bot bid placed: ₹{bid.amount} on auction {self.auction.id} in Phase {bid.phase}")
         return True
     
-    def process_phase_1(self, elapsed_time, phase_duration):
+    def next_decision_time(self, now=None):
+        """
+        Get the wall-clock time of the bot's next time-based decision.
+        
+        Decision points come from the plan: the Phase 1/2 wait points (until
+        the bot has bid in that phase), the phase boundaries, the Phase 3
+        rolls that bid and end_time. Human bids are not time-based; they
+        wake the bot separately. Returns None when nothing is scheduled.
+        """
+        auction = self.auction
+        if auction.status != 'active' or not auction.start_time or not auction.end_time:
+            return None
+        
+        now = now or clock.now()
+        plan = self.plan
+        
+        candidates = [auction.end_time]
+        if now <= plan.phase_1_end:
+            if now < plan.phase_1_wait and not self.has_bot_bid_in_phase(1):
+                candidates.append(plan.phase_1_wait)
+            candidates.append(plan.phase_1_end + PHASE_BOUNDARY_SLACK)
+        elif now <= plan.phase_2_end:
+            if now < plan.phase_2_wait and not self.has_bot_bid_in_phase(2):
+                candidates.append(plan.phase_2_wait)
+            candidates.append(plan.phase_2_end + PHASE_BOUNDARY_SLACK)
+        else:
+            # Rolls that come out as no bid need no wakeup
+            roll = plan.next_bid_roll(now)
+            if roll is not None:
+                candidates.append(roll)
+        
+        upcoming = [candidate for candidate in candidates if candidate > now]
+        return min(upcoming) if upcoming else None
+    
+    def process_phase_1(self, now):
         """Process Phase 1 bidding logic."""
-        if self.should_bid_in_phase_1(elapsed_time, phase_duration):
+        if self.should_bid_in_phase_1(now):
             # Check for recent human bid
-            recent_human_bid = self.auction.bids.filter(
-                bidder_type='human',
-                timestamp__gte=timezone.now() - timezone.timedelta(seconds=5)
-            ).first()
+            recent_human_bid = self.has_recent_human_bid(5)
             
             if recent_human_bid:
                 # React with delay (handled by task scheduler)
@@ -231,13 +356,10 @@ class AuctionBot:
         
         return False
     
-    def process_phase_2(self, elapsed_time, phase_start, phase_duration):
+    def process_phase_2(self, now):
         """Process Phase 2 bidding logic."""
-        if self.should_bid_in_phase_2(elapsed_time, phase_start, phase_duration):
-            recent_human_bid = self.auction.bids.filter(
-                bidder_type='human',
-                timestamp__gte=timezone.now() - timezone.timedelta(seconds=5)
-            ).first()
+        if self.should_bid_in_phase_2(now):
+            recent_human_bid = self.has_recent_human_bid(5)
             
             if recent_human_bid:
                 return 'react'
@@ -246,73 +368,21 @@ class AuctionBot:
         
         return False
     
-    def process_phase_3(self):
+    def process_phase_3(self, now):
         """Process Phase 3 bidding logic."""
-        if self.should_bid_in_phase_3():
+        if self.should_bid_in_phase_3(now):
             return self.place_bid(phase=3)
         
         return False
     
     def check_and_complete(self):
         """Check if auction should be completed."""
-        if self.auction.status != 'active':
-            return
-        
-        # Check if max bid reached (by anyone)
-        if self.auction.current_price >= self.auction.max_bid:
+        # Max bid reached (by anyone) or time expired, extensions included
+        if is_due(self.auction):
             self.complete_auction()
-            return
-        
-        # Check if time expired
-        if self.auction.remaining_time <= 0:
-            # In Phase 3, allow some extension time for final bids, but eventually complete
-            if self.auction.current_phase == 3:
-                # Check if we've extended too much (more than 30 seconds past original end)
-                if self.auction.extended_time > 30:
-                    self.complete_auction()
-                    return
-            else:
-                # Complete immediately if not in Phase 3
-                self.complete_auction()
-                return
     
     def complete_auction(self):
-        """Complete the auction and determine winner."""
-        with transaction.atomic():
-            self.auction.refresh_from_db()
-            
-            if self.auction.status != 'active':
-                return
-            
-            self.auction.status = 'completed'
-            if not self.auction.end_time or timezone.now() < self.auction.end_time:
-                self.auction.end_time = timezone.now()
-            
-            # Determine winner (last bidder overall)
-            last_bid = self.auction.bids.first()  # Already ordered by -timestamp
-            if last_bid:
-                if last_bid.bidder_type == 'human':
-                    self.auction.winner = last_bid.bidder
-                else:
-                    # Bot won, set winner to None to indicate bot victory
-                    self.auction.winner = None
-            
-            self.auction.save()
-            
-            # Create log
-            if last_bid:
-                if last_bid.bidder_type == 'human':
-                    winner_name = self.auction.winner.username
-                else:
-                    winner_name = "Bot"
-            else:
-                winner_name = "No winner"
-                
-            AuctionLog.objects.create(
-                auction=self.auction,
-                event_type='completed',
-                message=f"Auction completed. Winner: {winner_name}, Final price: ₹{self.auction.current_price}"
-            )
-            
-            logger.info(f"Auction completed: {self.auction.id}, Winner: {winner_name}")
+        """Complete the auction and determine winner (see completion.complete_auctions)."""
+        complete_auctions([self.auction.pk])
+        self.auction.refresh_from_db()
 
@@ -0,0 +1,166 @@
+"""
+Precomputed, seeded bot bid plans.
+
+A BotPlan holds every time-based decision and random draw of an auction's
+bot: the phase boundaries, the Phase 1/2 wait points, which Phase 3
+probability rolls come out as bids, the delay before reacting to a human
+bid and the increment of each bot bid. The bot engine keeps the plan
+between ticks, so a tick compares the clock with the plan instead of
+re-deriving its decision, and in Phase 3 the bot sleeps until the next roll
+that bids rather than waking for every roll.
+
+Draws are counter-based: draw n of a stream is a keyed hash of the plan
+seed (BOT_PLAN_SEED, the auction id and its human bid count), the stream
+name and n. Any draw can be looked up on its own, so nothing is drawn
+ahead of time, and an auction in a given state always gets the same plan:
+after a lease takeover by another process, in the simulator and when
+reproducing a bot's behaviour (see describe()). A human bid changes the
+seed, which replans the rest of the auction (reseed()).
+"""
+import hashlib
+import math
+from django.conf import settings
+from django.utils import timezone
+
+# Slack added to phase boundaries so a wakeup lands inside the next phase
+PHASE_BOUNDARY_SLACK = timezone.timedelta(milliseconds=1)
+
+# Phase 3 rolls looked ahead for the next bid before giving up
+_ROLL_SCAN_LIMIT = 1000
+
+
+def plan_seed(auction, config=None):
+    """Seed of the plan for the auction's current state."""
+    config = config or settings.AUCTION_CONFIG
+    salt = config.get('BOT_PLAN_SEED') or settings.SECRET_KEY
+    return f"{salt}:{auction.pk}:{auction.human_bids_count}"
+
+
+def roll_probability(config=None):
+    """Chance that a Phase 3 roll bids: twice PHASE_3_BID_PROBABILITY, at most 60%."""
+    config = config or settings.AUCTION_CONFIG
+    return min(0.60, config['PHASE_3_BID_PROBABILITY'] * 2)
+
+
+def _hash(seed):
+    return hashlib.blake2b(seed.encode(), digest_size=8)
+
+
+class BotPlan:
+    """The planned decisions of one auction's bot until the next human bid."""
+
+    def __init__(self, auction, config=None, phase_1_wait=0.5, phase_2_wait=0.6, roll_interval=1):
+        config = config or settings.AUCTION_CONFIG
+        self.start_time = auction.start_time
+        self.human_bids = auction.human_bids_count
+        self._config = config
+        self._hash = _hash(plan_seed(auction, config))
+
+        phase_1_end = auction.duration * 0.25
+        phase_2_end = auction.duration * 0.75
+        self.phase_1_end = self.start_time + timezone.timedelta(seconds=phase_1_end)
+        self.phase_2_end = self.start_time + timezone.timedelta(seconds=phase_2_end)
+        self.phase_1_wait = self.start_time + timezone.timedelta(seconds=phase_1_end * phase_1_wait)
+        self.phase_2_wait = self.start_time + timezone.timedelta(
+            seconds=phase_1_end + (phase_2_end - phase_1_end) * phase_2_wait
+        )
+
+        self.roll_interval = timezone.timedelta(seconds=roll_interval)
+        self._roll_origin = self.phase_2_end + PHASE_BOUNDARY_SLACK
+        self.roll_probability = roll_probability(config)
+        # Rolls run from the start of Phase 3 to the latest possible end
+        self.last_roll = math.ceil(
+            (auction.duration - phase_2_end + config.get('PHASE_3_MAX_EXTENSION', 30)) / roll_interval
+        )
+        self._taken_roll = None
+        self._next_roll = (None, None)  # (first roll scanned, bidding roll found) by next_bid_roll
+        self._choices = list(config['BID_INCREMENTS'])
+        self._increment = (None, None)  # last (bid_number, increment) looked up
+
+    def _draw(self, stream, index):
+        """Uniform draw in [0, 1): number `index` of `stream`."""
+        digest = self._hash.copy()
+        digest.update(f"{stream}:{index}".encode())
+        return int.from_bytes(digest.digest(), 'big') / 2 ** 64
+
+    def reseed(self, auction):
+        """Replan after human bids: same timeline, fresh draws from the new seed."""
+        self.human_bids = auction.human_bids_count
+        self._hash = _hash(plan_seed(auction, self._config))
+        self._next_roll = (None, None)
+        self._increment = (None, None)
+
+    @property
+    def reaction_delay(self):
+        """Seconds the bot waits before answering a human bid."""
+        low, high = self._config['BOT_REACTION_DELAY_MIN'], self._config['BOT_REACTION_DELAY_MAX']
+        return low + (high - low) * self._draw('reaction', 0)
+
+    def phase_at(self, now):
+        """Phase (1, 2 or 3) at `now`, as Auction.current_phase computes it."""
+        if now <= self.phase_1_end:
+            return 1
+        if now <= self.phase_2_end:
+            return 2
+        return 3
+
+    def roll_time(self, roll):
+        """When Phase 3 roll number `roll` is due."""
+        return self._roll_origin + roll * self.roll_interval
+
+    def roll_at(self, now):
+        """Number of the Phase 3 roll due at `now` (negative before Phase 3)."""
+        return math.floor((now - self.phase_2_end) / self.roll_interval)
+
+    def roll_bids(self, roll):
+        """Whether Phase 3 roll number `roll` comes out as a bid."""
+        return 0 <= roll <= self.last_roll and self._draw('roll', roll) < self.roll_probability
+
+    def take_roll(self, now):
+        """Whether the Phase 3 roll due at `now` bids; each roll bids at most once."""
+        roll = self.roll_at(now)
+        if roll == self._taken_roll or not self.roll_bids(roll):
+            return False
+        self._taken_roll = roll
+        return True
+
+    def next_bid_roll(self, now):
+        """Time of the next Phase 3 roll that bids, or None."""
+        first = max(self.roll_at(now), 0)
+        scanned, found = self._next_roll
+        # The rolls the last scan skipped stay skipped
+        if found is not None and scanned <= first <= found and self.roll_time(found) > now:
+            return self.roll_time(found)
+        for roll in range(first, min(self.last_roll, first + _ROLL_SCAN_LIMIT) + 1):
+            if self.roll_time(roll) > now and self.roll_bids(roll):
+                self._next_roll = (first, roll)
+                return self.roll_time(roll)
+        return None
+
+    def increment(self, bid_number):
+        """Increment of the bot's bid number `bid_number` (its bot_bids_count before the bid)."""
+        if self._increment[0] != bid_number:
+            choice = self._choices[int(self._draw('increment', bid_number) * len(self._choices))]
+            self._increment = (bid_number, choice)
+        return self._increment[1]
+
+    def describe(self, full=True):
+        """
+        The plan as JSON-friendly data, for bot_status and debugging.
+
+        Without `full`, the reaction delay and the Phase 3 bid times are left
+        out: they would let a bidder time bids around the bot.
+        """
+        data = {
+            'human_bids': self.human_bids,
+            'phase_1_wait': self.phase_1_wait.isoformat(),
+            'phase_1_end': self.phase_1_end.isoformat(),
+            'phase_2_wait': self.phase_2_wait.isoformat(),
+            'phase_2_end': self.phase_2_end.isoformat(),
+        }
+        if full:
+            data['reaction_delay'] = round(self.reaction_delay, 3)
+            data['phase_3_bid_times'] = [
+                self.roll_time(roll).isoformat() for roll in range(self.last_roll + 1) if self.roll_bids(roll)
+            ]
+        return data
@@ -1,129 +1,565 @@
 """
-Simple bot runner using threading (no Celery/Redis needed).
+Bot engine: one scheduler thread drives every active auction bot.
+
+Each running bot has an entry in a timer heap keyed by its next decision time
+(see AuctionBot.next_decision_time). The scheduler pops due entries and hands
+them to a small fixed worker pool, so the number of threads (and database
+connections) stays flat no matter how many auctions are active. Human bids are
+pushed in through the event bus and wake the auction's bot right away, so
+between decision points a bot just sleeps.
+
+With several processes (gunicorn workers, nodes) each auction's bot runs in
+exactly one of them: the engine only runs bots it holds a lease for (see
+leases.py), and a keeper thread heartbeats those leases, takes over auctions
+whose owner died and picks up human bids placed in other processes. The
+leases are released when the process exits (on SIGTERM too, under gunicorn
+and uvicorn, which exit gracefully on it).
+
+In batch mode (AUCTION_CONFIG['BOT_ENGINE_BATCH']) wakeups are aligned to
+BOT_BATCH_WINDOW and every bot due in the same window is evaluated in one
+job: snapshots are loaded with one query and bids are committed with bulk
+writes (see bot_batch.py), so round-trips per tick do not grow with the number
+of auctions.
+No Celery/Redis needed.
 """
+import atexit
+import heapq
+import itertools
+import math
+import queue
 import threading
 import time
 import logging
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import Max
 from django.utils import timezone
-from .models import Auction
-from .bot_logic import AuctionBot
+from . import clock, events, leases
+from .models import Auction, Bid
+from .bot_logic import AuctionBot, snapshot_queryset
+from .bot_batch import place_bot_bids
 
 logger = logging.getLogger('auctions')
 
-# Store running bot threads
-_running_bots = {}
+# Delay meaning "nothing time-based to do, sleep until an event wakes the bot"
+SLEEP_UNTIL_WOKEN = float('inf')
 
+# How far back the cross-process bid watch looks to cover commit lag
+_BID_WATCH_OVERLAP = timezone.timedelta(seconds=2)
 
-def start_auction_bot(auction_id):
-    """Start bot for an auction using threading."""
-    auction_id_str = str(auction_id)
-    
-    # Check if bot is already running and alive
-    if auction_id_str in _running_bots:
-        existing_thread = _running_bots[auction_id_str]
-        if existing_thread.is_alive():
-            logger.info(f"Bot thread already running for auction {auction_id_str}")
-            return  # Don't restart if already running
-        else:
-            # Clean up dead thread
-            logger.info(f"Cleaning up dead bot thread for auction {auction_id_str}")
-            stop_auction_bot(auction_id_str)
-    
-    # Start new bot thread (non-daemon for better persistence)
-    thread = threading.Thread(
-        target=_run_bot,
-        args=(auction_id_str,),
-        daemon=False,  # Changed to False for better persistence
-        name=f"AuctionBot-{auction_id_str[:8]}"
-    )
-    thread.start()
-    _running_bots[auction_id_str] = thread
-    logger.info(f"Bot thread started for auction {auction_id_str}")
 
+class _BotState:
+    """Scheduling state for a single auction's bot."""
 
-def stop_auction_bot(auction_id):
-    """Stop bot for an auction."""
-    auction_id_str = str(auction_id)
-    if auction_id_str in _running_bots:
-        # Mark as stopped (thread will check and exit)
-        _running_bots.pop(auction_id_str, None)
-        logger.info(f"Bot thread stopped for auction {auction_id_str}")
-
-
-def _run_bot(auction_id_str):
-    """Main bot loop running in thread."""
-    logger.info(f"Bot thread starting for auction {auction_id_str}")
-    
-    while auction_id_str in _running_bots:
-        try:
-            auction = Auction.objects.get(id=auction_id_str)
-            logger.info(f"Bot processing auction {auction_id_str}: status={auction.status}, bot_active={auction.bot_active}")
-            
-            if auction.status != 'active':
-                logger.info(f"Auction {auction_id_str} not active, stopping bot")
-                break
-            
-            if not auction.bot_active:
-                logger.info(f"Bot not active for auction {auction_id_str}, stopping")
-                break
-            
-            bot = AuctionBot(auction)
-            
-            # Check if auction should be completed
-            bot.check_and_complete()
-            
-            # Refresh auction
-            auction.refresh_from_db()
-            if auction.status != 'active':
-                break
-            
-            # Get phase information
-            phase = auction.current_phase
-            if phase is None:
-                time.sleep(2)
-                continue
-            
-            elapsed_time = auction.elapsed_time
-            total_duration = auction.duration
-            phase_1_end = total_duration * 0.25
-            phase_2_end = total_duration * 0.75
-            
-            # Process based on phase
-            if phase == 1:
-                logger.info(f"Processing Phase 1 for auction {auction_id_str}")
-                result = bot.process_phase_1(elapsed_time, phase_1_end)
-                if result == 'react':
-                    # Schedule delayed reaction
-                    delay = bot.get_reaction_delay()
-                    logger.info(f"Bot reacting with {delay:.1f}s delay")
-                    time.sleep(delay)
-                    bot.place_bid(phase=1)
-                elif result:
-                    logger.info("Bot placing immediate bid in Phase 1")
-                    bot.place_bid(phase=1)
-            elif phase == 2:
-                phase_2_duration = phase_2_end - phase_1_end
-                result = bot.process_phase_2(elapsed_time, phase_1_end, phase_2_duration)
-                if result == 'react':
-                    time.sleep(bot.get_reaction_delay())
-                    bot.place_bid(phase=2)
-            elif phase == 3:
-                bot.process_phase_3()
-            
-            # Sleep before next check
-            if phase == 3:
-                time.sleep(1)  # Check every second in Phase 3
+    def __init__(self, auction_id):
+        self.auction_id = auction_id
+        self.deadline = None  # monotonic time of the next wakeup, None while not queued
+        self.running = False  # a worker is currently ticking this bot
+        self.pending_reaction = None  # phase to bid in once the reaction delay elapses
+        self.primed = False  # latest human bid has been looked up once
+        self.last_human_bid_at = None  # latest human bid not answered yet
+        self.human_bids_seen_until = timezone.now()  # newest human bid timestamp delivered so far
+        self.seen_human_bid_at = None  # value of last_human_bid_at the current tick worked from
+        self.woken = False  # an event arrived while a tick was in progress
+        self.plan = None  # the bot's BotPlan, kept between ticks
+
+
+class BotEngine:
+    """Timer-heap scheduler running auction bots on a fixed worker pool."""
+
+    def __init__(self, max_workers=None, batch=None):
+        config = settings.AUCTION_CONFIG
+        self.max_workers = max_workers or config.get('BOT_ENGINE_WORKERS', 4)
+        self.batch = config.get('BOT_ENGINE_BATCH', False) if batch is None else batch
+        self.batch_window = config.get('BOT_BATCH_WINDOW', 1.0)
+        self._bots = {}
+        self._heap = []
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._ready = queue.SimpleQueue()
+        self._workers = []
+        self._lateness = 0.0  # moving average of how late ticks are dispatched, in seconds
+        self._keeper = None
+        self._claim_orphans = False
+        self._watch_since = timezone.now()
+        events.subscribe(self._on_event)
+
+    # Public API
+
+    def start_bot(self, auction_id):
+        """
+        Start the bot for an auction and schedule its first tick.
+
+        Returns False if another process owns the auction's bot.
+        """
+        auction_id_str = str(auction_id)
+        if self.is_running(auction_id_str):
+            logger.info(f"Bot already running for auction {auction_id_str}")
+            return True
+
+        if not leases.acquire(auction_id_str):
+            logger.info(f"Bot for auction {auction_id_str} is owned by another process")
+            return False
+
+        self._register([auction_id_str])
+        logger.info(f"Bot started for auction {auction_id_str}")
+        return True
+
+    def start_bots(self, auction_ids):
+        """
+        Start the bots for many auctions at once, e.g. a drop of scheduled starts.
+
+        Leases are acquired in bulk and every bot is queued for its first tick
+        in one go. Returns the ids whose bots now run in this process.
+        """
+        auction_ids = [str(auction_id) for auction_id in auction_ids]
+        with self._cond:
+            running = [auction_id for auction_id in auction_ids if auction_id in self._bots]
+        owned = leases.acquire_many([auction_id for auction_id in auction_ids if auction_id not in running])
+        self._register(owned)
+        if owned:
+            logger.info(f"Bots started for {len(owned)} auctions")
+        return running + owned
+
+    def _register(self, auction_ids):
+        """Add bots whose leases this process holds and schedule their first tick."""
+        if not auction_ids:
+            return
+        with self._cond:
+            for auction_id in auction_ids:
+                if auction_id not in self._bots:
+                    state = _BotState(auction_id)
+                    self._bots[auction_id] = state
+                    self._schedule(state, 0)
+            self._ensure_started()
+        self.start_keeper()
+
+    def stop_bot(self, auction_id):
+        """Unregister a bot; any tick in progress finishes and is not rescheduled."""
+        auction_id_str = str(auction_id)
+        with self._cond:
+            stopped = self._bots.pop(auction_id_str, None) is not None
+            if stopped:
+                self._cond.notify()
+        if stopped:
+            leases.release(auction_id_str)
+            logger.info(f"Bot stopped for auction {auction_id_str}")
+
+    def shutdown(self):
+        """Stop every bot and release its lease so other processes can take over at once."""
+        with self._cond:
+            auction_ids = list(self._bots)
+            self._bots.clear()
+            self._claim_orphans = False
+            self._cond.notify()
+        leases.release_all()
+        logger.info(f"Bot engine shut down, released {len(auction_ids)} bots")
+
+    def start_keeper(self, claim_orphans=False):
+        """
+        Start the lease keeper thread.
+
+        With claim_orphans, the keeper also takes over every active auction
+        whose bot is not owned by a live process.
+        """
+        with self._cond:
+            if claim_orphans:
+                self._claim_orphans = True
+            if self._keeper is None or not self._keeper.is_alive():
+                self._keeper = threading.Thread(
+                    target=self._keep_leases,
+                    daemon=True,
+                    name='AuctionBot-leases'
+                )
+                self._keeper.start()
+
+    def claim_orphaned_bots(self):
+        """Start bots for active auctions nobody owns. Returns the claimed ids."""
+        return [
+            auction_id for auction_id in leases.orphaned_auction_ids()
+            if self.start_bot(auction_id)
+        ]
+
+    def notify_human_bid(self, auction_id, timestamp):
+        """Wake the auction's bot because a human just bid."""
+        with self._cond:
+            state = self._bots.get(str(auction_id))
+            if state is None:
+                return
+            # The same bid may arrive both from the event bus and the bid watch
+            if timestamp <= state.human_bids_seen_until:
+                return
+            state.human_bids_seen_until = timestamp
+            state.last_human_bid_at = timestamp
+            if state.running or state.pending_reaction is not None:
+                # A pending reaction keeps its delay; the new bid is looked at right after it
+                state.woken = True
             else:
-                time.sleep(2)  # Check every 2 seconds in other phases
-        
-        except Auction.DoesNotExist:
-            logger.error(f"Auction {auction_id_str} not found")
-            break
+                self._schedule(state, 0)
+
+    def is_running(self, auction_id):
+        with self._cond:
+            return str(auction_id) in self._bots
+
+    def is_alive(self):
+        with self._cond:
+            return self._thread is not None and self._thread.is_alive()
+
+    def running_count(self):
+        with self._cond:
+            return len(self._bots)
+
+    def lateness_ms(self):
+        """Average delay between a bot's decision time and its dispatch."""
+        with self._cond:
+            return self._lateness * 1000
+
+    # Leases
+
+    def _keep_leases(self):
+        """Heartbeat owned leases, claim orphans and watch for remote human bids."""
+        config = settings.AUCTION_CONFIG
+        heartbeat_interval = config.get('BOT_LEASE_HEARTBEAT', 5)
+        watch_interval = config.get('BOT_BID_WATCH_INTERVAL', 0.5)
+        next_heartbeat = 0
+        while True:
+            try:
+                if time.monotonic() >= next_heartbeat:
+                    next_heartbeat = time.monotonic() + heartbeat_interval
+                    self._heartbeat()
+                    if self._claim_orphans:
+                        self.claim_orphaned_bots()
+                self._watch_human_bids()
+            except Exception as e:
+                logger.error(f"Bot lease keeper error: {str(e)}")
+            finally:
+                close_old_connections()
+            time.sleep(watch_interval)
+
+    def _heartbeat(self):
+        """Renew this process's leases and drop bots whose lease was lost."""
+        with self._cond:
+            owned = list(self._bots)
+        kept = leases.renew(owned)
+        lost = [auction_id for auction_id in owned if auction_id not in kept]
+        if not lost:
+            return
+        with self._cond:
+            for auction_id in lost:
+                if self._bots.pop(auction_id, None) is not None:
+                    logger.warning(f"Lost bot lease for auction {auction_id}, stopping bot")
+            self._cond.notify()
+
+    def _watch_human_bids(self):
+        """Wake bots for human bids placed in other processes, in a single query."""
+        with self._cond:
+            owned = list(self._bots)
+        since = self._watch_since
+        self._watch_since = timezone.now() - _BID_WATCH_OVERLAP
+        if not owned:
+            return
+        latest_bids = Bid.objects.filter(
+            auction_id__in=owned,
+            bidder_type='human',
+            timestamp__gte=since
+        ).values('auction_id').annotate(latest=Max('timestamp'))
+        for row in latest_bids:
+            self.notify_human_bid(row['auction_id'], row['latest'])
+
+    # Scheduling
+
+    def _on_event(self, event):
+        if event['type'] == 'bid_placed' and event.get('bidder_type') == 'human':
+            self.notify_human_bid(event['auction_id'], event['timestamp'])
+
+    def _schedule(self, state, delay):
+        """Queue the next wakeup for a bot. Caller must hold the lock."""
+        if delay == SLEEP_UNTIL_WOKEN:
+            state.deadline = None
+            return
+        state.deadline = time.monotonic() + delay
+        if self.batch and delay > 0:
+            # Align to the batch grid so bots due around the same time share a batch
+            state.deadline = math.ceil(state.deadline / self.batch_window) * self.batch_window
+        heapq.heappush(self._heap, (state.deadline, next(self._sequence), state.auction_id))
+        self._cond.notify()
+
+    def _ensure_started(self):
+        """Start the scheduler thread and worker pool if needed. Caller must hold the lock."""
+        if not self._workers:
+            for i in range(self.max_workers):
+                worker = threading.Thread(
+                    target=self._work,
+                    daemon=True,
+                    name=f"AuctionBot-worker-{i}"
+                )
+                worker.start()
+                self._workers.append(worker)
+        if self._thread is None or not self._thread.is_alive():
+            # Non-daemon so a process that only runs bots (e.g. restart_bots)
+            # stays alive; the loop exits by itself once no bots are left.
+            self._thread = threading.Thread(
+                target=self._loop,
+                daemon=False,
+                name='AuctionBot-scheduler'
+            )
+            self._thread.start()
+
+    def _loop(self):
+        """Pop due bots off the heap and dispatch them to the worker pool."""
+        logger.info("Bot scheduler started")
+        while True:
+            with self._cond:
+                while True:
+                    if not self._bots:
+                        self._heap.clear()
+                        self._thread = None
+                        logger.info("Bot scheduler idle, exiting")
+                        return
+
+                    now = time.monotonic()
+                    due = []
+                    while self._heap and self._heap[0][0] <= now:
+                        deadline, _, auction_id = heapq.heappop(self._heap)
+                        state = self._bots.get(auction_id)
+                        # Skip entries superseded by a newer schedule or a stopped bot
+                        if state is None or state.running or state.deadline != deadline:
+                            continue
+                        self._lateness += 0.1 * ((now - deadline) - self._lateness)
+                        state.deadline = None
+                        state.running = True
+                        due.append(state)
+
+                    if due:
+                        break
+                    timeout = self._heap[0][0] - now if self._heap else None
+                    self._cond.wait(timeout)
+
+            if self.batch:
+                self._ready.put(due)
+            else:
+                for state in due:
+                    self._ready.put([state])
+
+    def _work(self):
+        """Worker thread: run ticks handed over by the scheduler."""
+        while True:
+            states = self._ready.get()
+            if self.batch:
+                self._run_batch(states)
+            else:
+                self._run_tick(states[0])
+
+    def _run_tick(self, state):
+        """Run one tick on a worker and reschedule the bot."""
+        try:
+            delay = _tick(state)
+        except Exception as e:
+            logger.error(f"Error in bot for {state.auction_id}: {str(e)}")
+            delay = 5  # Wait before retrying
+        finally:
+            close_old_connections()
+
+        self._finish_tick(state, delay)
+
+    def _run_batch(self, states):
+        """Run one batched tick for several bots and reschedule each of them."""
+        try:
+            delays = _tick_batch(states)
         except Exception as e:
-            logger.error(f"Error in bot for {auction_id_str}: {str(e)}")
-            time.sleep(5)  # Wait before retrying
-    
-    # Clean up
-    _running_bots.pop(auction_id_str, None)
-    logger.info(f"Bot thread ended for auction {auction_id_str}")
+            logger.error(f"Error in bot batch of {len(states)} auctions: {str(e)}")
+            delays = {}
+        finally:
+            close_old_connections()
+
+        for state in states:
+            self._finish_tick(state, delays.get(state.auction_id, 5))
+
+    def _finish_tick(self, state, delay):
+        """Reschedule a bot after its tick, or retire it if the tick returned None."""
+        with self._cond:
+            state.running = False
+            if self._bots.get(state.auction_id) is not state:
+                return
+            ended = delay is None
+            if ended:
+                self._bots.pop(state.auction_id, None)
+                self._cond.notify()
+            else:
+                # The tick has answered the human bid it saw; newer ones remain pending
+                if state.last_human_bid_at == state.seen_human_bid_at:
+                    state.last_human_bid_at = None
+                if state.woken and state.pending_reaction is None:
+                    state.woken = False
+                    delay = 0
+                self._schedule(state, delay)
+
+        if ended:
+            try:
+                leases.release(state.auction_id)
+            except Exception as e:
+                # The lease simply expires if it cannot be released
+                logger.error(f"Failed to release bot lease for {state.auction_id}: {str(e)}")
+            finally:
+                close_old_connections()
+            logger.info(f"Bot ended for auction {state.auction_id}")
+
+
+def _tick(state):
+    """
+    Evaluate the bot for one auction once.
+
+    Returns the delay in seconds until the next tick, or None to stop the bot.
+    """
+    try:
+        auction = snapshot_queryset().get(id=state.auction_id)
+    except Auction.DoesNotExist:
+        logger.error(f"Auction {state.auction_id} not found")
+        return None
+    return _evaluate(state, _bot_for(state, auction))
+
+
+def _tick_batch(states):
+    """
+    Evaluate a batch of bots with one snapshot query and bulk bid writes.
+
+    Returns a dict of auction id -> delay (None to stop the bot).
+    """
+    snapshots = {
+        str(auction.id): auction
+        for auction in snapshot_queryset().filter(id__in=[state.auction_id for state in states])
+    }
+
+    intents = []
+    delays = {}
+    for state in states:
+        auction = snapshots.get(state.auction_id)
+        if auction is None:
+            logger.error(f"Auction {state.auction_id} not found")
+            delays[state.auction_id] = None
+            continue
+        delays[state.auction_id] = _evaluate(state, _bot_for(state, auction, bid_sink=intents))
+
+    place_bot_bids(intents)
+    return delays
+
+
+def _bot_for(state, auction, bid_sink=None):
+    """Build the bot for a tick from a snapshot and the engine's view of human bids."""
+    # The first tick takes recent human bids from the snapshot; after that they are pushed
+    state.seen_human_bid_at = state.last_human_bid_at
+    if state.primed:
+        return AuctionBot(auction, last_human_bid_at=state.seen_human_bid_at, bid_sink=bid_sink, plan=state.plan)
+    state.primed = True
+    return AuctionBot(auction, bid_sink=bid_sink, plan=state.plan)
+
+
+def _evaluate(state, bot):
+    """Run the bot's decision logic for one tick and return the next delay."""
+    auction = bot.auction
+    auction_id_str = state.auction_id
+
+    logger.info(f"Bot processing auction {auction_id_str}: status={auction.status}, bot_active={auction.bot_active}")
+
+    if auction.status != 'active':
+        logger.info(f"Auction {auction_id_str} not active, stopping bot")
+        return None
+
+    if not auction.bot_active:
+        logger.info(f"Bot not active for auction {auction_id_str}, stopping")
+        return None
+
+    # The plan is kept for later ticks; a human bid since the last tick replans it
+    state.plan = bot.plan
 
+    # A reaction delay has elapsed: place the delayed bid
+    if state.pending_reaction is not None:
+        phase = state.pending_reaction
+        state.pending_reaction = None
+        state.seen_human_bid_at = None  # bids that arrived meanwhile still need an answer
+        bot.place_bid(phase=phase)
+        return _seconds_until_next_check(bot)
+
+    # Check if auction should be completed (updates the snapshot in place)
+    bot.check_and_complete()
+    if auction.status != 'active':
+        return None
+
+    if state.plan is None:
+        return _seconds_until_next_check(bot)
+
+    # Get phase information
+    now = clock.now()
+    phase = state.plan.phase_at(now)
+
+    # Process based on phase
+    if phase == 1:
+        logger.info(f"Processing Phase 1 for auction {auction_id_str}")
+        result = bot.process_phase_1(now)
+        if result == 'react':
+            # Schedule delayed reaction
+            delay = bot.get_reaction_delay()
+            logger.info(f"Bot reacting with {delay:.1f}s delay")
+            state.pending_reaction = 1
+            return delay
+    elif phase == 2:
+        result = bot.process_phase_2(now)
+        if result == 'react':
+            state.pending_reaction = 2
+            return bot.get_reaction_delay()
+    elif phase == 3:
+        bot.process_phase_3(now)
+
+    return _seconds_until_next_check(bot)
+
+
+def _seconds_until_next_check(bot):
+    """
+    Delay until the bot's next decision point, or SLEEP_UNTIL_WOKEN.
+
+    The delay is taken from the plan's wall-clock timeline on every tick,
+    so time spent processing a tick never accumulates as drift.
+    """
+    decision_time = bot.next_decision_time()
+    if decision_time is None:
+        return SLEEP_UNTIL_WOKEN
+    return max(0, (decision_time - clock.now()).total_seconds())
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    """Return the process-wide bot engine, creating it on first use."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = BotEngine()
+        return _engine
+
+
+def _shutdown_on_exit():
+    """Release this process's leases at exit, so a deploy does not stall bots for BOT_LEASE_TTL."""
+    # Nothing to release if the engine never ran a bot or was shut down already
+    if _engine is None or not _engine.running_count():
+        return
+    try:
+        _engine.shutdown()
+    except Exception as e:
+        # The leases simply expire if they cannot be released
+        logger.error(f"Failed to release bot leases on exit: {str(e)}")
+
+
+atexit.register(_shutdown_on_exit)
+
+
+def start_auction_bot(auction_id):
+    """Start bot for an auction on the shared engine. Returns False if owned elsewhere."""
+    return get_engine().start_bot(auction_id)
+
+
+def stop_auction_bot(auction_id):
+    """Stop bot for an auction."""
+    get_engine().stop_bot(auction_id)
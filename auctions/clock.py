@@ -0,0 +1,50 @@
+"""
+Injectable clock for time-based auction logic.
+
+Auction timing properties and the bot read the current time through now().
+Normally that is timezone.now(); the simulator installs a VirtualClock for
+its thread so auctions can be played out faster than real time.
+"""
+import threading
+from contextlib import contextmanager
+from django.utils import timezone
+
+_local = threading.local()
+
+
+def now():
+    """Current time according to the clock installed for this thread."""
+    clock = getattr(_local, 'clock', None)
+    if clock is None:
+        return timezone.now()
+    return clock.now()
+
+
+@contextmanager
+def override(clock):
+    """Use `clock` for now() in the current thread within the block."""
+    previous = getattr(_local, 'clock', None)
+    _local.clock = clock
+    try:
+        yield clock
+    finally:
+        _local.clock = previous
+
+
+class VirtualClock:
+    """A clock that only moves when told to."""
+
+    def __init__(self, start=None):
+        self._now = start or timezone.now()
+
+    def now(self):
+        return self._now
+
+    def advance_to(self, moment):
+        """Move the clock forward to `moment` (never backwards)."""
+        if moment > self._now:
+            self._now = moment
+
+    def advance(self, seconds):
+        """Move the clock forward by `seconds`."""
+        self._now += timezone.timedelta(seconds=seconds)
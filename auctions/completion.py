@@ -0,0 +1,151 @@
+"""
+Auction completion, independent of the auction bots.
+
+An auction is due for completion once its price reaches max_bid or its
+end_time (including any Phase 3 extensions, which are capped at
+PHASE_3_MAX_EXTENSION seconds past the original end) has passed. Bots
+complete their own auction when they notice; the sweeper completes every
+other due auction, including auctions whose bot is switched off or died.
+
+The sweeper is one thread per process. Each pass completes the due auctions
+found by a single query on the (status, end_time) index and then sleeps
+until the next end_time, or at most COMPLETION_SWEEP_INTERVAL seconds, so
+its cost depends on the number of auctions ending, not on the number of
+bots. complete_auctions() locks the rows it completes, so bots and the
+sweepers of other processes never complete an auction twice.
+"""
+import logging
+import threading
+import time
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from . import clock, read_cache, stats
+from .models import Auction, AuctionLog, Bid
+from .summaries import record_summaries
+
+logger = logging.getLogger('auctions')
+
+# Auctions completed per transaction by the sweeper
+SWEEP_BATCH = 100
+
+_thread = None
+_thread_lock = threading.Lock()
+
+
+def _config(key, default):
+    return settings.AUCTION_CONFIG.get(key, default)
+
+
+def is_due(auction, now=None):
+    """Whether an active auction should be completed now."""
+    if auction.status != 'active':
+        return False
+    if auction.current_price >= auction.max_bid:
+        return True
+    return auction.end_time is not None and auction.end_time <= (now or clock.now())
+
+
+def due_auctions(now=None):
+    """Active auctions that should be completed now (the queryset form of is_due)."""
+    return Auction.objects.filter(status='active').filter(
+        Q(end_time__lte=now or clock.now()) | Q(current_price__gte=F('max_bid'))
+    )
+
+
+def complete_auctions(auction_ids, now=None):
+    """
+    Complete the given auctions that are still due, in one transaction.
+
+    The last bid wins: a human bid makes its bidder the winner, a bot bid
+    leaves the auction without a winning user. Returns the completed auctions.
+    """
+    now = now or clock.now()
+    with transaction.atomic():
+        auctions = list(due_auctions(now).select_for_update().filter(pk__in=auction_ids))
+        if not auctions:
+            return []
+        latest_bids = Bid.objects.select_related('bidder').in_bulk(
+            [auction.latest_bid_id for auction in auctions if auction.latest_bid_id]
+        )
+
+        logs = []
+        for auction in auctions:
+            last_bid = latest_bids.get(auction.latest_bid_id)
+            auction.status = 'completed'
+            if not auction.end_time or now < auction.end_time:
+                auction.end_time = now
+            auction.winner = last_bid.bidder if last_bid and last_bid.bidder_type == 'human' else None
+            # The row is locked, so the version can be bumped in memory
+            auction.version += 1
+            auction.updated_at = timezone.now()
+
+            if last_bid:
+                winner_name = auction.winner.username if auction.winner else "Bot"
+            else:
+                winner_name = "No winner"
+            logs.append(AuctionLog(
+                auction=auction,
+                event_type='completed',
+                message=f"Auction completed. Winner: {winner_name}, Final price: ₹{auction.current_price}"
+            ))
+            logger.info(f"Auction completed: {auction.id}, Winner: {winner_name}")
+
+        Auction.objects.bulk_update(auctions, ['status', 'end_time', 'winner', 'version', 'updated_at'])
+        AuctionLog.objects.bulk_create(logs)
+        record_summaries(auctions)
+        stats.record_completions(auctions)
+        read_cache.invalidate(*[auction.id for auction in auctions])
+    return auctions
+
+
+def sweep(now=None):
+    """Complete every due auction. Returns how many were completed."""
+    completed = 0
+    while True:
+        auction_ids = list(due_auctions(now).order_by('end_time').values_list('pk', flat=True)[:SWEEP_BATCH])
+        if not auction_ids:
+            return completed
+        completed += len(complete_auctions(auction_ids, now))
+        if len(auction_ids) < SWEEP_BATCH:
+            return completed
+
+
+def seconds_until_next_end(now=None):
+    """Seconds until the earliest end_time of an active auction, or None."""
+    end_time = Auction.objects.filter(status='active', end_time__isnull=False).order_by(
+        'end_time'
+    ).values_list('end_time', flat=True).first()
+    if end_time is None:
+        return None
+    return max(0, (end_time - (now or clock.now())).total_seconds())
+
+
+def start_sweeper():
+    """Start this process's completion sweeper thread, once."""
+    global _thread
+    with _thread_lock:
+        if _thread is not None and _thread.is_alive():
+            return
+        _thread = threading.Thread(target=_run, daemon=True, name='AuctionCompletion-sweeper')
+        _thread.start()
+
+
+def _run():
+    interval = _config('COMPLETION_SWEEP_INTERVAL', 5)
+    while True:
+        delay = interval
+        try:
+            completed = sweep()
+            if completed:
+                logger.info(f"Completion sweeper completed {completed} auctions")
+            until_next = seconds_until_next_end()
+            if until_next is not None:
+                delay = min(interval, until_next)
+        except Exception as e:
+            logger.error(f"Completion sweeper error: {str(e)}")
+        finally:
+            close_old_connections()
+        # Never spin: an auction ending right now is picked up on the next pass
+        time.sleep(max(delay, 0.05))
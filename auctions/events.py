@@ -0,0 +1,40 @@
+"""
+In-process notification bus for auction events.
+
+Publishers (signals, views) call publish(); listeners such as the bot engine
+subscribe a callback. Callbacks run synchronously in the publisher's thread,
+so they must be quick and must not hit the database.
+"""
+import threading
+import logging
+
+logger = logging.getLogger('auctions')
+
+_subscribers = []
+_lock = threading.Lock()
+
+
+def subscribe(callback):
+    """Register a callback receiving every published event dict."""
+    with _lock:
+        if callback not in _subscribers:
+            _subscribers.append(callback)
+
+
+def unsubscribe(callback):
+    """Remove a previously registered callback."""
+    with _lock:
+        if callback in _subscribers:
+            _subscribers.remove(callback)
+
+
+def publish(event_type, auction_id, **data):
+    """Deliver an event to all subscribers."""
+    event = {'type': event_type, 'auction_id': str(auction_id), **data}
+    with _lock:
+        subscribers = list(_subscribers)
+    for callback in subscribers:
+        try:
+            callback(event)
+        except Exception as e:
+            logger.error(f"Event subscriber failed for {event_type} on auction {auction_id}: {str(e)}")
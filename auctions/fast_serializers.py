@@ -0,0 +1,192 @@
+"""
+Fast read-only serialization for hot endpoints.
+
+ModelSerializer builds a model instance per row and then renders it field by
+field through DRF's field machinery. For the read-only lists polled most
+(active auctions, a user's bids, the bids feed) that dominates CPU once the
+queries are fixed. Here rows come straight from .values() and each shape has
+a dict builder whose column names are resolved once, when it is created.
+
+The output matches BidSerializer / AuctionSerializer value for value and key
+for key; benchmark_serializers checks that the rendered bytes are identical.
+When a field is added to one of those serializers, add it here too.
+"""
+import re
+from decimal import Decimal
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from .models import Auction, Bid
+
+try:
+    import orjson
+except ImportError:  # Optional; the stdlib encoder is used without it
+    orjson = None
+
+_CENTS = Decimal('0.01')
+
+# A JSON number the stdlib would write differently: in exponent notation, or
+# below 1e-4 (which the stdlib writes as 1e-05 and orjson as 0.00001)
+_FLOAT_MISMATCH = re.compile(rb'[:,\[]-?(?:[0-9]+(?:\.[0-9]+)?[eE]|0\.0000)')
+
+BIDDER_TYPE_DISPLAY = dict(Bid.BIDDER_TYPE_CHOICES)
+
+# Bid columns in BidSerializer field order
+BID_COLUMNS = [
+    'id', 'auction_id', 'bidder_id', 'bidder__username', 'bidder_type', 'amount', 'phase', 'timestamp',
+]
+
+AUCTION_COLUMNS = [
+    'id', 'title', 'description', 'start_price', 'max_bid', 'current_price', 'duration', 'status',
+    'scheduled_start', 'start_time', 'end_time', 'extended_time', 'bot_active', 'bot_current_bid',
+    'winner_id', 'winner__username', 'created_by_id', 'created_by__username', 'created_at', 'updated_at',
+    'total_bids', 'human_bids_count', 'bot_bids_count', 'version',
+    *(f'latest_bid__{column}' for column in BID_COLUMNS),
+]
+
+
+def decimal_value(value):
+    """Render a 2-decimal-place DecimalField like DRF (a string)."""
+    if value is None:
+        return None
+    return format(Decimal(value).quantize(_CENTS), 'f')
+
+
+def datetime_value(value):
+    """Render a DateTimeField like DRF: ISO 8601 in the current time zone, UTC as 'Z'."""
+    if value is None:
+        return None
+    value = timezone.localtime(value).isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+def bid_builder(prefix=''):
+    """Return a function turning a .values(*BID_COLUMNS) row (keys under `prefix`) into a bid dict."""
+    id_, auction, bidder, username, bidder_type, amount, phase, timestamp = (
+        prefix + column for column in BID_COLUMNS
+    )
+
+    def build(row):
+        if row[id_] is None:
+            return None
+        data = {
+            'id': str(row[id_]),
+            'auction': str(row[auction]),
+            'bidder': row[bidder],
+        }
+        if row[bidder] is not None:
+            # DRF skips a dotted source through a null relation
+            data['bidder_username'] = row[username]
+        data['bidder_type'] = row[bidder_type]
+        data['bidder_type_display'] = BIDDER_TYPE_DISPLAY.get(row[bidder_type], row[bidder_type])
+        data['amount'] = decimal_value(row[amount])
+        data['phase'] = row[phase]
+        data['timestamp'] = datetime_value(row[timestamp])
+        return data
+    return build
+
+
+build_bid = bid_builder()
+_build_latest_bid = bid_builder('latest_bid__')
+
+
+class _AuctionTiming:
+    """Just enough of an Auction to evaluate its timing properties from a values() row."""
+    __slots__ = ['status', 'start_time', 'end_time', 'duration']
+
+    elapsed_time = Auction.elapsed_time
+    remaining_time = Auction.remaining_time
+    current_phase = Auction.current_phase
+    phase_progress = Auction.phase_progress
+
+    def __init__(self, row):
+        self.status = row['status']
+        self.start_time = row['start_time']
+        self.end_time = row['end_time']
+        self.duration = row['duration']
+
+
+def build_auction(row):
+    """Turn a .values(*AUCTION_COLUMNS) row into an AuctionSerializer-shaped dict."""
+    timing = _AuctionTiming(row)
+    current_phase = timing.current_phase
+    data = {
+        'id': str(row['id']),
+        'title': row['title'],
+        'description': row['description'],
+        'start_price': decimal_value(row['start_price']),
+        'max_bid': decimal_value(row['max_bid']),
+        'current_price': decimal_value(row['current_price']),
+        'duration': row['duration'],
+        'status': row['status'],
+        'scheduled_start': datetime_value(row['scheduled_start']),
+        'start_time': datetime_value(row['start_time']),
+        'end_time': datetime_value(row['end_time']),
+        'extended_time': row['extended_time'],
+        'bot_active': row['bot_active'],
+        'bot_current_bid': decimal_value(row['bot_current_bid']),
+        'winner': row['winner_id'],
+    }
+    if row['winner_id'] is not None:
+        data['winner_username'] = row['winner__username']
+    data.update({
+        'created_by': row['created_by_id'],
+        'created_by_username': row['created_by__username'],
+        'created_at': datetime_value(row['created_at']),
+        'updated_at': datetime_value(row['updated_at']),
+        'current_phase': None if current_phase is None else int(current_phase),
+        'phase_progress': float(timing.phase_progress),
+        'remaining_time': float(timing.remaining_time),
+        'elapsed_time': float(timing.elapsed_time),
+        'total_bids': row['total_bids'],
+        'human_bids_count': row['human_bids_count'],
+        'bot_bids_count': row['bot_bids_count'],
+        'latest_bid': _build_latest_bid(row),
+        'version': row['version'],
+    })
+    return data
+
+
+def bid_rows(queryset):
+    """The .values() rows build_bid expects, for a Bid queryset."""
+    return queryset.values(*BID_COLUMNS)
+
+
+def serialize_bids(queryset):
+    """BidSerializer(many=True) output for a Bid queryset, in one query."""
+    return [build_bid(row) for row in bid_rows(queryset)]
+
+
+def serialize_auctions(queryset):
+    """AuctionSerializer(many=True) output for an Auction queryset, in one query."""
+    return [build_auction(row) for row in queryset.values(*AUCTION_COLUMNS)]
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer producing the same bytes, faster for plain dict/list data.
+
+    Uses orjson when installed. orjson writes some floats differently from
+    the stdlib (1e16 vs 1e+16, 0.00001 vs 1e-05), so output containing such
+    a number is re-encoded with the stdlib encoder; text that merely looks
+    like one (",1e5" in a title) only costs the speedup. Data orjson cannot
+    encode as the stdlib would (datetimes, Decimal, lazy strings) goes through
+    JSONRenderer unchanged.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        renderer_context = renderer_context or {}
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, option=orjson.OPT_PASSTHROUGH_DATETIME)
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        if _FLOAT_MISMATCH.search(ret):
+            return super().render(data, accepted_media_type, renderer_context)
+        # Same escaping as JSONRenderer, for JavaScript compatibility
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
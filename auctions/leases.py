@@ -0,0 +1,136 @@
+"""
+Bot ownership leases shared by all processes through the database.
+
+Exactly one process may run an auction's bot at a time. A process acquires a
+lease with a conditional UPDATE (only if it already owns the lease or the
+lease has expired), keeps it alive with heartbeats, and releases it when the
+bot stops or the process exits. When an owner dies its leases expire after BOT_LEASE_TTL seconds
+and any other process can take the auctions over.
+"""
+import os
+import socket
+import uuid
+import logging
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+from .models import Auction, BotLease
+
+logger = logging.getLogger('auctions')
+
+_owner_id = None
+_owner_pid = None
+
+
+def owner_id():
+    """Identifier of this process, recomputed after a fork (e.g. gunicorn workers)."""
+    global _owner_id, _owner_pid
+    pid = os.getpid()
+    if _owner_pid != pid:
+        _owner_id = f"{socket.gethostname()}:{pid}:{uuid.uuid4().hex[:8]}"
+        _owner_pid = pid
+    return _owner_id
+
+
+def lease_ttl():
+    return timezone.timedelta(seconds=settings.AUCTION_CONFIG.get('BOT_LEASE_TTL', 15))
+
+
+def acquire(auction_id):
+    """Take or renew the lease for an auction. Returns True if this process owns it."""
+    now = timezone.now()
+    owner = owner_id()
+    expires_at = now + lease_ttl()
+
+    updated = BotLease.objects.filter(auction_id=auction_id).filter(
+        Q(owner=owner) | Q(expires_at__lte=now)
+    ).update(owner=owner, expires_at=expires_at, heartbeat_at=now, acquired_at=now)
+    if updated:
+        return True
+
+    try:
+        with transaction.atomic():
+            BotLease.objects.create(
+                auction_id=auction_id,
+                owner=owner,
+                expires_at=expires_at,
+                heartbeat_at=now,
+                acquired_at=now
+            )
+        return True
+    except IntegrityError:
+        # Either another process holds a live lease or it won the race
+        return False
+
+
+def acquire_many(auction_ids):
+    """Take or renew the leases for many auctions at once. Returns the ids this process owns."""
+    auction_ids = [str(auction_id) for auction_id in auction_ids]
+    if not auction_ids:
+        return []
+
+    now = timezone.now()
+    owner = owner_id()
+    expires_at = now + lease_ttl()
+    lease = {'owner': owner, 'expires_at': expires_at, 'heartbeat_at': now, 'acquired_at': now}
+
+    BotLease.objects.filter(auction_id__in=auction_ids).filter(
+        Q(owner=owner) | Q(expires_at__lte=now)
+    ).update(**lease)
+    # Rows another process creates first stay theirs
+    BotLease.objects.bulk_create(
+        [BotLease(auction_id=auction_id, **lease) for auction_id in auction_ids],
+        ignore_conflicts=True
+    )
+    owned = {
+        str(auction_id) for auction_id in BotLease.objects.filter(
+            auction_id__in=auction_ids, owner=owner
+        ).values_list('auction_id', flat=True)
+    }
+    return [auction_id for auction_id in auction_ids if auction_id in owned]
+
+
+def renew(auction_ids):
+    """Heartbeat the given leases. Returns the ids this process still owns."""
+    auction_ids = [str(auction_id) for auction_id in auction_ids]
+    if not auction_ids:
+        return set()
+
+    now = timezone.now()
+    owned = BotLease.objects.filter(owner=owner_id(), auction_id__in=auction_ids)
+    updated = owned.update(expires_at=now + lease_ttl(), heartbeat_at=now)
+    if updated == len(auction_ids):
+        return set(auction_ids)
+    return {str(auction_id) for auction_id in owned.values_list('auction_id', flat=True)}
+
+
+def release(auction_id):
+    """Give up the lease for an auction if this process holds it."""
+    BotLease.objects.filter(auction_id=auction_id, owner=owner_id()).delete()
+
+
+def release_all():
+    """Give up every lease this process holds, e.g. on shutdown."""
+    BotLease.objects.filter(owner=owner_id()).delete()
+
+
+def orphaned_auction_ids():
+    """Active, bot-enabled auctions whose bot nobody currently owns."""
+    now = timezone.now()
+    return [
+        str(auction_id) for auction_id in Auction.objects.filter(
+            status='active',
+            bot_active=True
+        ).exclude(
+            bot_lease__expires_at__gt=now
+        ).values_list('id', flat=True)
+    ]
+
+
+def current_owner(auction_id):
+    """Owner of the live lease for an auction, or None."""
+    return BotLease.objects.filter(
+        auction_id=auction_id,
+        expires_at__gt=timezone.now()
+    ).values_list('owner', flat=True).first()
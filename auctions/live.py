@@ -0,0 +1,321 @@
+"""
+Server-Sent Events stream of live auction state.
+
+Viewers of an active auction subscribe to a per-auction AuctionFeed instead
+of polling status_info/ and bids/. Each feed is the single state source for
+its auction in this process: one task loads the auction row (and any new
+bids) once per LIVE_POLL_INTERVAL, or immediately when a bid_placed event
+arrives on the event bus, and broadcasts the changes as pre-encoded SSE
+frames to every connected viewer. Database and encoding cost therefore
+scales with auctions and events, not with viewers.
+
+Events sent to clients:
+
+- ``state``: the status_info fields, whenever anything but the clock changed
+- ``time``: remaining_time, elapsed_time, current_phase and phase_progress,
+  once per poll while the auction runs
+- ``bid``: a new bid, serialized like the bids/ endpoint
+- ``bids``: the most recent bids, sent once on connect
+- ``end``: the auction is no longer active; the stream closes after it
+
+The stream is served by stream_app, a plain ASGI application mounted in
+auction_bot/asgi.py, so it can watch for client disconnects while it waits
+for events. Bids committed by other processes are picked up by the poll.
+"""
+import asyncio
+import json
+import logging
+import re
+import threading
+import uuid
+from collections import deque
+from http.cookies import SimpleCookie
+from importlib import import_module
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user
+from django.http import HttpRequest
+from rest_framework.utils.encoders import JSONEncoder
+
+from . import events
+from .models import Auction
+from .serializers import BidSerializer
+
+logger = logging.getLogger('auctions')
+
+# Bids replayed to a viewer when it connects
+RECENT_BIDS = 20
+
+# Maximum auctions a single multiplexed stream may watch
+MAX_STREAM_AUCTIONS = 50
+
+STREAM_PATH = re.compile(r'^/api/auctions/(?:(?P<auction_id>[0-9a-f-]{36})/)?stream/$')
+
+# Fields that change every second while an auction runs; sent as `time` events
+CLOCK_FIELDS = ['auction_id', 'remaining_time', 'elapsed_time', 'current_phase', 'phase_progress']
+
+_feeds = {}
+_feeds_lock = threading.Lock()
+
+
+def _config(key, default):
+    return settings.AUCTION_CONFIG.get(key, default)
+
+
+def _without_clock(state):
+    if state is None:
+        return None
+    return {field: value for field, value in state.items() if field not in CLOCK_FIELDS[1:]}
+
+
+def _frame(event_type, data):
+    """Encode one SSE message."""
+    payload = json.dumps(data, cls=JSONEncoder, separators=(',', ':'))
+    return f"event: {event_type}\ndata: {payload}\n\n".encode()
+
+
+class AuctionFeed:
+    """Shared live state of one auction, fanned out to its subscribers."""
+
+    def __init__(self, auction_id, loop):
+        self.auction_id = auction_id
+        self.loop = loop
+        self.subscribers = set()
+        self.state = None
+        self.recent_bids = deque(maxlen=RECENT_BIDS)
+        self.last_bid_time = None
+        self.ended = False
+        self._wake = asyncio.Event()
+        self._task = None
+
+    # Subscribers
+
+    def subscribe(self, queue):
+        self.subscribers.add(queue)
+        if self._task is None:
+            self._task = self.loop.create_task(self._run())
+        elif self.state is not None:
+            # Late joiners start from the shared snapshot, without a query
+            self._send_snapshot(queue)
+
+    def unsubscribe(self, queue):
+        self.subscribers.discard(queue)
+
+    def wake(self):
+        """Ask the feed to reload now; safe to call from any thread."""
+        self.loop.call_soon_threadsafe(self._wake.set)
+
+    def _send_snapshot(self, queue):
+        self._offer(queue, _frame('state', self.state))
+        self._offer(queue, _frame('bids', {'auction_id': self.auction_id, 'bids': list(self.recent_bids)}))
+        if self.ended:
+            self._offer(queue, _frame('end', {'auction_id': self.auction_id, 'status': self.state['status']}))
+
+    def _broadcast(self, frame):
+        for queue in list(self.subscribers):
+            self._offer(queue, frame)
+
+    def _offer(self, queue, frame):
+        try:
+            queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            # A viewer this far behind reconnects and starts from a fresh snapshot
+            self.subscribers.discard(queue)
+            queue.overflowed = True
+
+    # State source
+
+    def _load(self, initial):
+        """Read the auction row and any bids newer than the last one seen."""
+        auction = Auction.objects.filter(pk=self.auction_id).first()
+        if auction is None:
+            return None, []
+
+        bids = auction.bids.select_related('bidder')
+        if initial:
+            new_bids = list(reversed(bids[:RECENT_BIDS]))
+        elif self.state is not None and auction.total_bids == self.state['total_bids']:
+            new_bids = []
+        elif self.last_bid_time is not None:
+            new_bids = list(bids.filter(timestamp__gt=self.last_bid_time).order_by('timestamp'))
+        else:
+            new_bids = list(bids.order_by('timestamp'))
+
+        state = {'auction_id': self.auction_id, **auction.get_status_info()}
+        return state, [BidSerializer(bid).data for bid in new_bids]
+
+    async def _refresh(self, initial=False):
+        state, new_bids = await sync_to_async(self._load)(initial)
+        if state is None:
+            state = dict(self.state or {'auction_id': self.auction_id}, status='deleted')
+
+        for bid in new_bids:
+            self.recent_bids.appendleft(bid)
+            self.last_bid_time = bid['timestamp']
+            if not initial:
+                self._broadcast(_frame('bid', {'auction_id': self.auction_id, **bid}))
+
+        previous, self.state = self.state, state
+        if initial:
+            for queue in list(self.subscribers):
+                self._send_snapshot(queue)
+        elif _without_clock(previous) != _without_clock(state):
+            self._broadcast(_frame('state', state))
+        else:
+            self._broadcast(_frame('time', {field: state.get(field) for field in CLOCK_FIELDS}))
+
+        if state['status'] != 'active' and not self.ended:
+            self.ended = True
+            self._broadcast(_frame('end', {'auction_id': self.auction_id, 'status': state['status']}))
+
+    async def _run(self):
+        interval = _config('LIVE_POLL_INTERVAL', 1.0)
+        try:
+            await self._refresh(initial=True)
+            while self.subscribers and not self.ended:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+                if self.subscribers:
+                    await self._refresh()
+        except Exception as e:
+            logger.error(f"Live feed for auction {self.auction_id} failed: {str(e)}")
+        finally:
+            with _feeds_lock:
+                if _feeds.get((self.loop, self.auction_id)) is self:
+                    del _feeds[(self.loop, self.auction_id)]
+            if not self.ended:
+                # Close remaining viewers; they reconnect to a fresh feed
+                self._broadcast(None)
+
+
+def _feed_for(auction_id):
+    loop = asyncio.get_running_loop()
+    with _feeds_lock:
+        feed = _feeds.get((loop, auction_id))
+        if feed is None or feed.ended:
+            feed = _feeds[(loop, auction_id)] = AuctionFeed(auction_id, loop)
+    return feed
+
+
+def _on_event(event):
+    """Event bus callback: wake the feeds of the auction that got a bid."""
+    if event['type'] != 'bid_placed':
+        return
+    with _feeds_lock:
+        feeds = [feed for (loop, auction_id), feed in _feeds.items() if auction_id == event['auction_id']]
+    for feed in feeds:
+        feed.wake()
+
+
+events.subscribe(_on_event)
+
+
+# ASGI endpoint
+
+def _authenticate(headers):
+    """Resolve the user from the session cookie or a DRF token header, like the API does."""
+    request = HttpRequest()
+    authorization = headers.get(b'authorization', b'').decode('latin-1')
+    if authorization.startswith('Token '):
+        from rest_framework.authentication import TokenAuthentication
+        from rest_framework.exceptions import AuthenticationFailed
+        try:
+            user, _ = TokenAuthentication().authenticate_credentials(authorization[len('Token '):].strip())
+            return user
+        except AuthenticationFailed:
+            return None
+
+    cookies = SimpleCookie(headers.get(b'cookie', b'').decode('latin-1'))
+    morsel = cookies.get(settings.SESSION_COOKIE_NAME)
+    if morsel is None:
+        return None
+    request.session = import_module(settings.SESSION_ENGINE).SessionStore(morsel.value)
+    user = get_user(request)
+    return user if user.is_authenticated else None
+
+
+async def _respond(send, status, message):
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', b'application/json')],
+    })
+    await send({'type': 'http.response.body', 'body': json.dumps({'detail': message}).encode()})
+
+
+async def stream_app(scope, receive, send):
+    """
+    ASGI application serving /api/auctions/<id>/stream/ and
+    /api/auctions/stream/?ids=<id>,<id> as text/event-stream.
+    """
+    match = STREAM_PATH.match(scope['path'])
+    if scope['method'] != 'GET':
+        return await _respond(send, 405, 'Method not allowed.')
+
+    if match.group('auction_id'):
+        auction_ids = [match.group('auction_id')]
+    else:
+        query = parse_qs(scope.get('query_string', b'').decode())
+        auction_ids = [value for ids in query.get('ids', []) for value in ids.split(',') if value]
+    try:
+        auction_ids = list(dict.fromkeys(str(uuid.UUID(auction_id)) for auction_id in auction_ids))
+    except ValueError:
+        return await _respond(send, 400, 'Invalid auction id.')
+    if not auction_ids or len(auction_ids) > MAX_STREAM_AUCTIONS:
+        return await _respond(send, 400, f'Provide between 1 and {MAX_STREAM_AUCTIONS} auction ids.')
+
+    user = await sync_to_async(_authenticate)(dict(scope['headers']))
+    if user is None:
+        return await _respond(send, 401, 'Authentication credentials were not provided.')
+
+    queue = asyncio.Queue(maxsize=_config('LIVE_QUEUE_SIZE', 100))
+    queue.overflowed = False
+    feeds = [_feed_for(auction_id) for auction_id in auction_ids]
+    for feed in feeds:
+        feed.subscribe(queue)
+
+    await send({
+        'type': 'http.response.start',
+        'status': 200,
+        'headers': [
+            (b'content-type', b'text/event-stream'),
+            (b'cache-control', b'no-cache'),
+            (b'x-accel-buffering', b'no'),
+        ],
+    })
+
+    async def pump():
+        await send({'type': 'http.response.body', 'body': b'retry: 3000\n\n', 'more_body': True})
+        open_feeds = len(feeds)
+        heartbeat = _config('LIVE_HEARTBEAT', 15)
+        while open_feeds and not queue.overflowed:
+            try:
+                frame = await asyncio.wait_for(queue.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                frame = b': keep-alive\n\n'
+            if frame is None:
+                break
+            await send({'type': 'http.response.body', 'body': frame, 'more_body': True})
+            if frame.startswith(b'event: end\n'):
+                open_feeds -= 1
+
+    async def disconnected():
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+
+    tasks = [asyncio.ensure_future(pump()), asyncio.ensure_future(disconnected())]
+    try:
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        if tasks[0] in done:
+            tasks[0].result()
+            await send({'type': 'http.response.body', 'body': b''})
+    finally:
+        for feed in feeds:
+            feed.unsubscribe(queue)
@@ -0,0 +1,122 @@
+"""
+Batched, off-request writer for AuctionLog rows.
+
+Bid paths hand their log entries to write() instead of inserting them in the
+bid transaction, which saves the bid commit one INSERT round-trip. Entries
+are queued once the bid's transaction commits (a rolled-back bid logs
+nothing) and a background thread inserts them with bulk_create when
+LOG_BATCH_SIZE entries are waiting or LOG_FLUSH_INTERVAL seconds have
+passed, whichever comes first.
+
+A log's timestamp is the time it is inserted, so the logs feed's ``after``
+cursors never skip a late row. After each flush the affected auctions'
+version is bumped so ETags and the read cache pick up the new entries.
+
+With LOG_FLUSH_ON_EXIT the queue is flushed synchronously at interpreter
+shutdown; entries still queued when a process is killed outright are lost.
+Set LOG_WRITER_SYNC (e.g. in tests) to save every entry immediately, in the
+caller's transaction, as before.
+"""
+import atexit
+import logging
+import threading
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from .models import Auction, AuctionLog
+from . import read_cache
+
+logger = logging.getLogger('auctions')
+
+_queue = []
+_lock = threading.Lock()
+_flush_lock = threading.Lock()
+_wakeup = threading.Event()
+_thread = None
+
+
+def _config(key, default):
+    return settings.AUCTION_CONFIG.get(key, default)
+
+
+def write(*logs):
+    """Queue AuctionLog instances for insertion after the current transaction commits."""
+    if not logs:
+        return
+    if _config('LOG_WRITER_SYNC', False):
+        AuctionLog.objects.bulk_create(logs)
+        return
+    transaction.on_commit(lambda: _enqueue(logs))
+
+
+def _enqueue(logs):
+    with _lock:
+        _queue.extend(logs)
+        backlog = len(_queue)
+    _ensure_thread()
+    if backlog >= _config('LOG_BATCH_SIZE', 100):
+        _wakeup.set()
+
+
+def _ensure_thread():
+    global _thread
+    with _lock:
+        if _thread is not None and _thread.is_alive():
+            return
+        _thread = threading.Thread(target=_run, name='auction-log-writer', daemon=True)
+        _thread.start()
+
+
+def _run():
+    while True:
+        _wakeup.wait(timeout=_config('LOG_FLUSH_INTERVAL', 0.5))
+        _wakeup.clear()
+        try:
+            close_old_connections()
+            flush()
+        except Exception as e:
+            logger.error(f"Auction log writer failed: {str(e)}")
+        finally:
+            close_old_connections()
+
+
+def flush():
+    """Insert every queued entry now. Returns the number written."""
+    with _flush_lock:
+        with _lock:
+            batch = _queue[:]
+            del _queue[:]
+        if not batch:
+            return 0
+        try:
+            AuctionLog.objects.bulk_create(batch, batch_size=_config('LOG_BATCH_SIZE', 100))
+        except Exception as e:
+            # Most likely an auction deleted meanwhile; write the rest, once
+            existing = set(Auction.objects.filter(pk__in={log.auction_id for log in batch}).values_list('pk', flat=True))
+            batch = [log for log in batch if log.auction_id in existing]
+            logger.warning(f"Auction log batch failed ({str(e)}); retrying {len(batch)} entries")
+            AuctionLog.objects.bulk_create(batch, batch_size=_config('LOG_BATCH_SIZE', 100))
+
+        auction_ids = {log.auction_id for log in batch}
+        Auction.objects.filter(pk__in=auction_ids).update(version=F('version') + 1)
+        read_cache.invalidate(*auction_ids)
+        return len(batch)
+
+
+def pending():
+    """Number of entries waiting to be written."""
+    with _lock:
+        return len(_queue)
+
+
+def _flush_on_exit():
+    if not _config('LOG_FLUSH_ON_EXIT', True) or not pending():
+        return
+    try:
+        written = flush()
+        logger.info(f"Auction log writer flushed {written} entries on shutdown")
+    except Exception as e:
+        logger.error(f"Auction log writer lost {pending()} entries on shutdown: {str(e)}")
+
+
+atexit.register(_flush_on_exit)
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from auctions.models import Auction
+from auctions.summaries import fix_winner_types, record_summary
+import logging
+
+logger = logging.getLogger('auctions')
+
+
+class Command(BaseCommand):
+    help = 'Write summaries for completed auctions that do not have one yet and correct stored winner types'
+
+    def handle(self, *args, **options):
+        missing = Auction.objects.filter(status='completed', summary__isnull=True)
+        self.stdout.write(f'Found {missing.count()} completed auctions without a summary')
+        
+        created = 0
+        for auction in missing.iterator():
+            try:
+                record_summary(auction)
+                created += 1
+            except Exception as e:
+                self.stdout.write(
+                    self.style.ERROR(f'Failed to summarize auction {auction.id}: {str(e)}')
+                )
+                logger.error(f'Failed to summarize auction {auction.id}: {str(e)}')
+        
+        self.stdout.write(self.style.SUCCESS(f'Recorded {created} auction summaries'))
+        
+        # Summaries written before winner_type followed auction.winner
+        fixed = fix_winner_types()
+        self.stdout.write(self.style.SUCCESS(f'Corrected the winner type of {fixed} summaries'))
@@ -0,0 +1,84 @@
+from django.core.management.base import BaseCommand, CommandError
+from auctions.models import Auction
+import json
+import time
+
+
+class Command(BaseCommand):
+    help = 'Backtest a grid of bot strategy parameters against the bid history of completed auctions'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--grid', action='append', default=[], metavar='KEY=VALUES',
+                            help='Values to try for a strategy parameter (JSON list), '
+                                 'e.g. --grid PHASE_3_BID_PROBABILITY=[0.1,0.2,0.3] '
+                                 '--grid BID_INCREMENTS=[[100],[100,500,1000]]')
+        parser.add_argument('--runs', type=int, default=8, help='Replays of each auction per parameter set')
+        parser.add_argument('--seed', type=int, help='Random seed for a reproducible backtest')
+        parser.add_argument('--limit', type=int, help='Only the most recently started N completed auctions')
+        parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+
+    def handle(self, *args, **options):
+        try:
+            from auctions.backtest import History, backtest, parameter_grid
+        except ImportError as e:
+            raise CommandError(f'Backtesting needs numpy ({str(e)}); pip install numpy')
+
+        values = {}
+        for entry in options['grid']:
+            key, sep, value = entry.partition('=')
+            if not sep:
+                raise CommandError(f'Expected KEY=VALUES, got {entry!r}')
+            try:
+                values[key] = json.loads(value)
+            except ValueError:
+                raise CommandError(f'Values for {key} must be JSON, got {value!r}')
+            if not isinstance(values[key], list) or not values[key]:
+                raise CommandError(f'Values for {key} must be a non-empty JSON list')
+        try:
+            grid = parameter_grid(values)
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        auctions = Auction.objects.filter(status='completed')
+        if options['limit']:
+            auctions = Auction.objects.filter(
+                pk__in=list(auctions.order_by('-start_time').values_list('pk', flat=True)[:options['limit']])
+            )
+
+        started = time.perf_counter()
+        history = History.load(auctions)
+        loaded = time.perf_counter()
+        results = backtest(history, grid, runs=options['runs'], seed=options['seed'])
+        finished = time.perf_counter()
+
+        if options['json']:
+            self.stdout.write(json.dumps({
+                'history': history.summary(),
+                'load_seconds': loaded - started,
+                'backtest_seconds': finished - loaded,
+                'results': results,
+            }, indent=2))
+            return
+
+        summary = history.summary()
+        self.stdout.write(self.style.SUCCESS(
+            f"Backtested {len(grid)} parameter sets on {summary['auctions']} auctions "
+            f"({summary['human_bids']} human bids, {options['runs']} runs each) "
+            f"in {finished - loaded:.2f}s (history loaded in {loaded - started:.2f}s)"
+        ))
+        self.stdout.write(
+            f"History: final price mean ₹{summary['final_price_mean']:.2f}, "
+            f"human win rate {summary['human_win_rate']:.1%}"
+        )
+        self.stdout.write(
+            f"{'P3 prob':>8} {'wait 1':>6} {'wait 2':>6} {'increments':<18} "
+            f"{'price mean':>12} {'price p95':>12} {'bot wins':>9} {'ext mean':>9} {'ext max':>8}"
+        )
+        for result in results:
+            increments = ','.join(f'{increment:g}' for increment in result['BID_INCREMENTS'])
+            self.stdout.write(
+                f"{result['PHASE_3_BID_PROBABILITY']:>8.2f} {result['PHASE_1_WAIT_PERCENTAGE']:>6.2f} "
+                f"{result['PHASE_2_WAIT_PERCENTAGE']:>6.2f} {increments:<18} "
+                f"₹{result['final_price_mean']:>11.2f} ₹{result['final_price_p95']:>11.2f} "
+                f"{result['bot_win_rate']:>9.1%} {result['extensions_mean']:>9.2f} {result['extensions_max']:>8.0f}"
+            )
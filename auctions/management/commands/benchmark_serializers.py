@@ -0,0 +1,113 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from auctions import clock
+from auctions.fast_serializers import FastJSONRenderer, serialize_auctions, serialize_bids
+from auctions.models import Auction, Bid
+from auctions.serializers import AuctionSerializer, BidSerializer
+from users.models import User
+import random
+import time
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = ('Compare DRF serializers with the fast read serializers: check the rendered '
+            'bytes are identical and time both (sample data is rolled back)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--auctions', type=int, default=200, help='Sample auctions to create')
+        parser.add_argument('--bids', type=int, default=2000, help='Sample bids to create')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per path (best is reported)')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                auctions, bids = self._create_sample(options['auctions'], options['bids'])
+                # Freeze time so both paths see identical remaining/elapsed times
+                with clock.override(clock.VirtualClock()):
+                    self._compare(
+                        'auctions',
+                        lambda: JSONRenderer().render(
+                            AuctionSerializer(AuctionSerializer.setup_eager_loading(auctions), many=True).data
+                        ),
+                        lambda: FastJSONRenderer().render(serialize_auctions(auctions)),
+                        options['repeat'],
+                    )
+                    self._compare(
+                        'bids',
+                        lambda: JSONRenderer().render(BidSerializer(bids.select_related('bidder'), many=True).data),
+                        lambda: FastJSONRenderer().render(serialize_bids(bids)),
+                        options['repeat'],
+                    )
+                raise _Rollback()
+        except _Rollback:
+            pass
+
+    def _create_sample(self, auction_count, bid_count):
+        rng = random.Random(0)
+        now = timezone.now()
+        user, _ = User.objects.get_or_create(
+            username='benchmark-serializers', defaults={'email': 'benchmark-serializers@example.com'}
+        )
+
+        auctions = []
+        for i in range(auction_count):
+            status = rng.choice(['pending', 'active', 'active', 'completed'])
+            started = now - timezone.timedelta(seconds=rng.uniform(0, 80)) if status != 'pending' else None
+            auctions.append(Auction(
+                title=f'Benchmark auction {i} – “quoted” ünïcode',
+                description='Sample data for benchmark_serializers',
+                start_price=1000,
+                max_bid=rng.choice([5000, 10000, 12345.67]),
+                current_price=1000 + 100 * rng.randrange(50),
+                status=status,
+                scheduled_start=now + timezone.timedelta(minutes=rng.randint(1, 60)) if status == 'pending' else None,
+                start_time=started,
+                end_time=started + timezone.timedelta(seconds=90) if started else None,
+                winner=user if status == 'completed' and rng.random() < 0.5 else None,
+                created_by=user,
+            ))
+        Auction.objects.bulk_create(auctions)
+
+        bids = [
+            Bid(
+                auction=rng.choice(auctions),
+                bidder=user if rng.random() < 0.5 else None,
+                bidder_type='human' if rng.random() < 0.5 else 'bot',
+                amount=1000 + 100 * rng.randrange(100),
+                phase=rng.randint(1, 3),
+            )
+            for _ in range(bid_count)
+        ]
+        Bid.objects.bulk_create(bids)
+        latest = {bid.auction_id: bid for bid in bids}
+        for auction in auctions:
+            if auction.pk in latest:
+                auction.latest_bid = latest[auction.pk]
+        Auction.objects.bulk_update(auctions, ['latest_bid'])
+
+        ids = [auction.pk for auction in auctions]
+        return Auction.objects.filter(pk__in=ids), Bid.objects.filter(auction_id__in=ids)
+
+    def _compare(self, name, drf, fast, repeat):
+        expected, actual = drf(), fast()
+        if expected != actual:
+            raise CommandError(f'Fast {name} output differs from the DRF serializer output')
+
+        drf_time = min(self._time(drf) for _ in range(repeat))
+        fast_time = min(self._time(fast) for _ in range(repeat))
+        self.stdout.write(self.style.SUCCESS(
+            f'{name}: identical output ({len(expected)} bytes); DRF {drf_time * 1000:.1f} ms, '
+            f'fast {fast_time * 1000:.1f} ms, {drf_time / fast_time:.1f}x faster'
+        ))
+
+    @staticmethod
+    def _time(func):
+        started = time.perf_counter()
+        func()
+        return time.perf_counter() - started
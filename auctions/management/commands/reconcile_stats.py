@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from auctions import stats
+import time
+import logging
+
+logger = logging.getLogger('auctions')
+
+
+class Command(BaseCommand):
+    help = 'Recompute the platform statistics counters and top bidders from the auctions and bids tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--every', type=float, metavar='SECONDS',
+                            help='Keep running and reconcile every SECONDS seconds')
+
+    def handle(self, *args, **options):
+        interval = options['every']
+        while True:
+            try:
+                totals = stats.reconcile()
+                self.stdout.write(self.style.SUCCESS(
+                    f"Reconciled statistics: {totals['total_auctions']} auctions, {totals['total_bids']} bids"
+                ))
+            except Exception as e:
+                if not interval:
+                    raise
+                self.stdout.write(self.style.ERROR(f'Failed to reconcile statistics: {str(e)}'))
+                logger.error(f'Failed to reconcile statistics: {str(e)}')
+
+            if not interval:
+                return
+            time.sleep(interval)
@@ -15,7 +15,9 @@ class Command(BaseCommand):
         
         for auction in active_auctions:
             try:
-                start_auction_bot(str(auction.id))
+                if not start_auction_bot(str(auction.id)):
+                    self.stdout.write(f'Bot for auction {auction.title} ({auction.id}) is owned by another process')
+                    continue
                 self.stdout.write(
                     self.style.SUCCESS(f'Started bot for auction: {auction.title} ({auction.id})')
                 )
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from auctions.bot_runner import get_engine
+from auctions.completion import start_sweeper
+from auctions.scheduled_starts import get_scheduler
+import signal
+import sys
+import time
+import logging
+
+logger = logging.getLogger('auctions')
+
+class Command(BaseCommand):
+    help = ('Run the bot engine, completion sweeper and start scheduler in the foreground, '
+            'owning bots for any auctions no other process owns')
+
+    def handle(self, *args, **options):
+        # Stop on SIGTERM (e.g. from a process manager) as on Ctrl-C, releasing the leases
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+        engine = get_engine()
+        claimed = engine.claim_orphaned_bots()
+        engine.start_keeper(claim_orphans=True)
+        start_sweeper()
+        get_scheduler().start()
+        
+        self.stdout.write(self.style.SUCCESS(f'Bot engine running, claimed {len(claimed)} auctions'))
+        logger.info(f'Bot engine started in foreground with {len(claimed)} auctions')
+        
+        try:
+            while True:
+                time.sleep(5)
+                self.stdout.write(f'Running bots: {engine.running_count()}')
+        except (KeyboardInterrupt, SystemExit):
+            engine.shutdown()
+            self.stdout.write(self.style.SUCCESS('Bot engine stopped'))
@@ -0,0 +1,69 @@
+from django.core.management.base import BaseCommand, CommandError
+from auctions.simulation import Simulation
+import json
+
+
+class Command(BaseCommand):
+    help = 'Simulate auctions on a virtual clock against scripted human bidders and report bot outcomes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--auctions', type=int, default=1000, help='Number of auctions to simulate')
+        parser.add_argument('--duration', type=int, help='Auction duration in seconds (default: DEFAULT_DURATION)')
+        parser.add_argument('--start-price', type=float, help='Start price (default: DEFAULT_START_PRICE)')
+        parser.add_argument('--max-bid', type=float, default=10000, help="Bot's maximum bid")
+        parser.add_argument('--humans', type=int, default=2, help='Scripted human bidders per auction')
+        parser.add_argument('--human-interval', type=float, default=8.0,
+                            help='Mean seconds between a human looking at the auction')
+        parser.add_argument('--seed', type=int, help='Random seed for a reproducible run')
+        parser.add_argument('--set', action='append', default=[], metavar='KEY=VALUE',
+                            help='Override an AUCTION_CONFIG value (JSON), e.g. --set PHASE_3_BID_PROBABILITY=0.2')
+        parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+
+    def handle(self, *args, **options):
+        config = {}
+        for override in options['set']:
+            key, sep, value = override.partition('=')
+            if not sep:
+                raise CommandError(f'Expected KEY=VALUE, got {override!r}')
+            try:
+                config[key] = json.loads(value)
+            except ValueError:
+                raise CommandError(f'Value for {key} must be JSON, got {value!r}')
+
+        simulation = Simulation(
+            auctions=options['auctions'],
+            duration=options['duration'],
+            start_price=options['start_price'],
+            max_bid=options['max_bid'],
+            humans=options['humans'],
+            human_interval=options['human_interval'],
+            config=config,
+            seed=options['seed'],
+        )
+        report = simulation.run()
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Simulated {report['auctions']} auctions in {report['wall_seconds']:.2f}s "
+            f"({report['decisions_per_second']:.0f} bot decisions/s)"
+        ))
+        self.stdout.write(
+            f"Completed: {report['completed']}, stalled: {report['stalled']}"
+        )
+        self.stdout.write(
+            f"Bot win rate: {report['bot_win_rate']:.1%} "
+            f"(bot {report['bot_wins']}, human {report['human_wins']}, no bids {report['no_bids']})"
+        )
+        self.stdout.write(
+            f"Final price: mean ₹{report['final_price_mean']:.2f}, median ₹{report['final_price_median']:.2f}, "
+            f"p95 ₹{report['final_price_p95']:.2f}, max ₹{report['final_price_max']:.2f}"
+        )
+        self.stdout.write(
+            f"Extensions: mean {report['extensions_mean']:.2f}, max {report['extensions_max']:.0f}"
+        )
+        self.stdout.write(
+            f"Bids: bot {report['bot_bids']}, human {report['human_bids']}; decisions {report['decisions']}"
+        )
@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from auctions.models import Auction, Bid
+
+
+def bid_counter_expressions():
+    """Expressions computing each auction's bid counters and latest bid from the bids table."""
+    bids = Bid.objects.filter(auction=OuterRef('pk')).order_by().values('auction')
+
+    def count(**filters):
+        return Coalesce(Subquery(bids.filter(**filters).annotate(n=Count('pk')).values('n')), 0)
+
+    return {
+        'total_bids': count(),
+        'human_bids_count': count(bidder_type='human'),
+        'bot_bids_count': count(bidder_type='bot'),
+        'latest_bid': Subquery(
+            Bid.objects.filter(auction=OuterRef('pk')).order_by('-timestamp').values('pk')[:1]
+        ),
+    }
+
+
+class Command(BaseCommand):
+    help = 'Backfill or verify the denormalized bid counters and latest bid on auctions'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verify', action='store_true',
+                            help='Only report auctions whose stored counters are wrong')
+
+    def handle(self, *args, **options):
+        if not options['verify']:
+            updated = Auction.objects.update(**bid_counter_expressions(), version=F('version') + 1)
+            self.stdout.write(self.style.SUCCESS(f'Rebuilt bid counters for {updated} auctions'))
+            return
+
+        expected = {f'expected_{name}': expression for name, expression in bid_counter_expressions().items()}
+        fields = ['total_bids', 'human_bids_count', 'bot_bids_count', 'latest_bid']
+
+        mismatched = 0
+        rows = Auction.objects.annotate(**expected).values('id', 'title', 'latest_bid_id', *fields[:-1], *expected)
+        for row in rows.iterator():
+            row['latest_bid'] = row['latest_bid_id']
+            wrong = [field for field in fields if row[field] != row[f'expected_{field}']]
+            if wrong:
+                mismatched += 1
+                details = ', '.join(f"{field}={row[field]} (expected {row[f'expected_{field}']})" for field in wrong)
+                self.stdout.write(f"Auction {row['title']} ({row['id']}): {details}")
+
+        if mismatched:
+            self.stdout.write(self.style.ERROR(
+                f'{mismatched} auctions have stale bid counters; run sync_bid_counters to rebuild them'
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS('All auction bid counters match the bids table'))
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-17 07:32
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auctions', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BotLease',
+            fields=[
+                ('auction', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='bot_lease', serialize=False, to='auctions.auction')),
+                ('owner', models.CharField(db_index=True, help_text='host:pid:nonce of the owning process', max_length=100)),
+                ('expires_at', models.DateTimeField(db_index=True)),
+                ('heartbeat_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('acquired_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'bot_leases',
+            },
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 4.2.7 on 2026-10-17 07:48
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+import django.db.models.deletion
+
+
+def backfill_bid_counters(apps, schema_editor):
+    Auction = apps.get_model('auctions', 'Auction')
+    Bid = apps.get_model('auctions', 'Bid')
+    bids = Bid.objects.filter(auction=OuterRef('pk')).order_by().values('auction')
+
+    def count(**filters):
+        return Coalesce(Subquery(bids.filter(**filters).annotate(n=Count('pk')).values('n')), 0)
+
+    Auction.objects.update(
+        total_bids=count(),
+        human_bids_count=count(bidder_type='human'),
+        bot_bids_count=count(bidder_type='bot'),
+        latest_bid=Subquery(Bid.objects.filter(auction=OuterRef('pk')).order_by('-timestamp').values('pk')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auctions', '0002_bot_lease'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='auction',
+            name='bot_bids_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='auction',
+            name='human_bids_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='auction',
+            name='latest_bid',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='auctions.bid'),
+        ),
+        migrations.AddField(
+            model_name='auction',
+            name='total_bids',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_bid_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-17 07:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auctions', '0003_bid_counters'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='auction',
+            index=models.Index(fields=['status', '-end_time', '-id'], name='auctions_status_e43c57_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.7 on 2026-10-17 07:53
+
+import django.core.serializers.json
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auctions', '0004_auction_completed_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuctionSummary',
+            fields=[
+                ('auction', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='summary', serialize=False, to='auctions.auction')),
+                ('final_price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('price_increase_amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('price_increase_percentage', models.FloatField()),
+                ('duration_seconds', models.FloatField(help_text='Actual duration from start to completion')),
+                ('winner_type', models.CharField(choices=[('human', 'Human'), ('bot', 'Bot'), ('none', 'No winner')], max_length=10)),
+                ('total_bids', models.IntegerField()),
+                ('human_bids', models.IntegerField()),
+                ('bot_bids', models.IntegerField()),
+                ('phase_1_bids', models.IntegerField()),
+                ('phase_2_bids', models.IntegerField()),
+                ('phase_3_bids', models.IntegerField()),
+                ('bidders', models.JSONField(default=list, encoder=django.core.serializers.json.DjangoJSONEncoder, help_text='Per-bidder participation: username, bidder_type, bid_count, total_amount, max_bid')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'auction_summaries',
+            },
+        ),
+    ]
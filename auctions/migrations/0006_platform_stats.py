@@ -0,0 +1,76 @@
+# Generated by Django 4.2.7 on 2026-10-17 07:56
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+import django.db.models.deletion
+
+
+def backfill_platform_stats(apps, schema_editor):
+    Auction = apps.get_model('auctions', 'Auction')
+    Bid = apps.get_model('auctions', 'Bid')
+    PlatformStatsShard = apps.get_model('auctions', 'PlatformStatsShard')
+    BidderStats = apps.get_model('auctions', 'BidderStats')
+
+    auctions = Auction.objects.order_by().aggregate(
+        total_auctions=Count('id'),
+        pending_auctions=Count('id', filter=Q(status='pending')),
+        active_auctions=Count('id', filter=Q(status='active')),
+        completed_auctions=Count('id', filter=Q(status='completed')),
+        cancelled_auctions=Count('id', filter=Q(status='cancelled')),
+        total_revenue=Sum('current_price', filter=Q(status='completed', winner__isnull=False)),
+    )
+    bids = Bid.objects.order_by().aggregate(total_bids=Count('id'), total_bid_amount=Sum('amount'))
+    totals = {**auctions, **bids}
+    totals = {field: value or 0 for field, value in totals.items()}
+
+    PlatformStatsShard.objects.bulk_create(
+        [PlatformStatsShard(shard=0, **totals)] + [PlatformStatsShard(shard=shard) for shard in range(1, 8)]
+    )
+    BidderStats.objects.bulk_create([
+        BidderStats(user_id=row['bidder'], bid_count=row['bid_count'], total_amount=row['total_amount'])
+        for row in Bid.objects.filter(bidder_type='human', bidder__isnull=False).order_by().values(
+            'bidder'
+        ).annotate(bid_count=Count('id'), total_amount=Sum('amount'))
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+        ('auctions', '0005_auction_summary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BidderStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='bid_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('bid_count', models.IntegerField(db_index=True, default=0)),
+                ('total_amount', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+            ],
+            options={
+                'db_table': 'bidder_stats',
+            },
+        ),
+        migrations.CreateModel(
+            name='PlatformStatsShard',
+            fields=[
+                ('shard', models.PositiveSmallIntegerField(primary_key=True, serialize=False)),
+                ('total_auctions', models.IntegerField(default=0)),
+                ('pending_auctions', models.IntegerField(default=0)),
+                ('active_auctions', models.IntegerField(default=0)),
+                ('completed_auctions', models.IntegerField(default=0)),
+                ('cancelled_auctions', models.IntegerField(default=0)),
+                ('total_bids', models.IntegerField(default=0)),
+                ('total_bid_amount', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('total_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'platform_stats_shards',
+            },
+        ),
+        migrations.RunPython(backfill_platform_stats, migrations.RunPython.noop),
+    ]
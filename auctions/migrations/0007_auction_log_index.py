@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-17 08:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auctions', '0006_platform_stats'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='auctionlog',
+            index=models.Index(fields=['auction', '-timestamp'], name='auction_log_auction_7ac506_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 08:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auctions', '0007_auction_log_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='auction',
+            name='version',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+    ]
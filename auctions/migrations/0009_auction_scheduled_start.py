@@ -0,0 +1,22 @@
+# Generated by Django 4.2.7 on 2026-10-17 08:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auctions', '0008_auction_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='auction',
+            name='scheduled_start',
+            field=models.DateTimeField(blank=True, help_text='Start automatically at this time', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='auction',
+            index=models.Index(fields=['status', 'scheduled_start'], name='auctions_status_1a6d8d_idx'),
+        ),
+    ]
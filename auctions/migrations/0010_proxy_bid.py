@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-17 08:24
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('auctions', '0009_auction_scheduled_start'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProxyBid',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ceiling', models.DecimalField(decimal_places=2, help_text='Highest amount to bid automatically', max_digits=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('auction', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='proxy_bids', to='auctions.auction')),
+                ('bidder', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='proxy_bids', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'proxy_bids',
+                'indexes': [models.Index(fields=['auction', '-ceiling'], name='proxy_bids_auction_702744_idx')],
+                'unique_together': {('auction', 'bidder')},
+            },
+        ),
+    ]
@@ -1,8 +1,11 @@
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.core.serializers.json import DjangoJSONEncoder
 from django.utils import timezone
 import uuid
 
+from . import clock
+
 User = get_user_model()
 
 
@@ -25,6 +28,7 @@ class Auction(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     
     # Timing fields
+    scheduled_start = models.DateTimeField(null=True, blank=True, help_text="Start automatically at this time")
     start_time = models.DateTimeField(null=True, blank=True)
     end_time = models.DateTimeField(null=True, blank=True)
     extended_time = models.IntegerField(default=0, help_text="Total extended time in seconds")
@@ -33,6 +37,16 @@ class Auction(models.Model):
     bot_active = models.BooleanField(default=True)
     bot_current_bid = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
     
+    # Bid counters and latest bid, kept in step with the bids table on every bid
+    # commit (see bidding.py and bot_batch.py); sync_bid_counters rebuilds them
+    total_bids = models.IntegerField(default=0)
+    human_bids_count = models.IntegerField(default=0)
+    bot_bids_count = models.IntegerField(default=0)
+    latest_bid = models.ForeignKey('Bid', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    
+    # Bumped by every change clients can see (bids, extensions, status changes, edits); drives ETags
+    version = models.PositiveBigIntegerField(default=0)
+    
     # Winner
     winner = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='won_auctions')
     
@@ -43,16 +57,31 @@ class Auction(models.Model):
     class Meta:
         db_table = 'auctions'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', '-end_time', '-id']),
+            models.Index(fields=['status', 'scheduled_start']),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.status}"
     
+    def save(self, *args, **kwargs):
+        """Save, bumping the state version of an existing auction."""
+        if self._state.adding:
+            return super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'version'}
+        self.version = models.F('version') + 1
+        super().save(*args, **kwargs)
+        self.refresh_from_db(fields=['version'])
+    
     @property
     def elapsed_time(self):
         """Calculate elapsed time in seconds."""
         if not self.start_time:
             return 0
-        now = timezone.now()
+        now = clock.now()
         if self.end_time and now > self.end_time:
             return (self.end_time - self.start_time).total_seconds()
         return (now - self.start_time).total_seconds()
@@ -64,7 +93,7 @@ class Auction(models.Model):
             return self.duration  # Show full duration for pending auctions
         if not self.start_time or not self.end_time:
             return 0
-        now = timezone.now()
+        now = clock.now()
         remaining = (self.end_time - now).total_seconds()
         return max(0, remaining)
     
@@ -110,12 +139,29 @@ class Auction(models.Model):
         """Get the display name for the winner."""
         if self.winner:
             return self.winner.username
-        elif self.status == 'completed' and self.bids.exists():
+        elif self.status == 'completed' and self.latest_bid_id:
             # Check if bot won
-            last_bid = self.bids.first()
-            if last_bid and last_bid.bidder_type == 'bot':
+            if self.latest_bid.bidder_type == 'bot':
                 return "Bot"
         return "No winner"
+    
+    def get_status_info(self):
+        """Live status fields, as served by the status endpoints. Reads only this row."""
+        return {
+            'status': self.status,
+            'current_phase': self.current_phase,
+            'phase_progress': self.phase_progress,
+            'remaining_time': self.remaining_time,
+            'elapsed_time': self.elapsed_time,
+            'current_price': float(self.current_price),
+            'max_bid': float(self.max_bid),
+            'bot_active': self.bot_active,
+            'bot_current_bid': float(self.bot_current_bid),
+            'total_bids': self.total_bids,
+            'human_bids': self.human_bids_count,
+            'bot_bids': self.bot_bids_count,
+            'version': self.version,
+        }
 
 
 class Bid(models.Model):
@@ -145,6 +191,25 @@ class Bid(models.Model):
         return f"{bidder_name} - ₹{self.amount} - {self.auction.title}"
 
 
+class ProxyBid(models.Model):
+    """A user's standing ceiling; the bid engine outbids others on their behalf up to it (see bidding.py)."""
+    auction = models.ForeignKey(Auction, on_delete=models.CASCADE, related_name='proxy_bids')
+    bidder = models.ForeignKey(User, on_delete=models.CASCADE, related_name='proxy_bids')
+    ceiling = models.DecimalField(max_digits=10, decimal_places=2, help_text="Highest amount to bid automatically")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'proxy_bids'
+        unique_together = [('auction', 'bidder')]
+        indexes = [
+            models.Index(fields=['auction', '-ceiling']),
+        ]
+
+    def __str__(self):
+        return f"{self.bidder.username} - up to ₹{self.ceiling} - {self.auction.title}"
+
+
 class AuctionLog(models.Model):
     """Log model for tracking auction events."""
     EVENT_TYPE_CHOICES = [
@@ -165,7 +230,103 @@ class AuctionLog(models.Model):
     class Meta:
         db_table = 'auction_logs'
         ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['auction', '-timestamp']),
+        ]
     
     def __str__(self):
         return f"{self.event_type} - {self.auction.title} - {self.timestamp}"
 
+
+class BotLease(models.Model):
+    """Cross-process ownership of an auction's bot, kept alive by heartbeats."""
+    auction = models.OneToOneField(Auction, on_delete=models.CASCADE, primary_key=True, related_name='bot_lease')
+    owner = models.CharField(max_length=100, db_index=True, help_text="host:pid:nonce of the owning process")
+    expires_at = models.DateTimeField(db_index=True)
+    heartbeat_at = models.DateTimeField(default=timezone.now)
+    acquired_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        db_table = 'bot_leases'
+    
+    def __str__(self):
+        return f"{self.auction_id} - {self.owner} until {self.expires_at}"
+
+
+class AuctionSummary(models.Model):
+    """Results of a completed auction, written once at completion and never changed."""
+    WINNER_TYPE_CHOICES = [
+        ('human', 'Human'),
+        ('bot', 'Bot'),
+        ('none', 'No winner'),
+    ]
+    
+    auction = models.OneToOneField(Auction, on_delete=models.CASCADE, primary_key=True, related_name='summary')
+    final_price = models.DecimalField(max_digits=10, decimal_places=2)
+    price_increase_amount = models.DecimalField(max_digits=10, decimal_places=2)
+    price_increase_percentage = models.FloatField()
+    duration_seconds = models.FloatField(help_text="Actual duration from start to completion")
+    winner_type = models.CharField(max_length=10, choices=WINNER_TYPE_CHOICES)
+    
+    # Bid breakdown
+    total_bids = models.IntegerField()
+    human_bids = models.IntegerField()
+    bot_bids = models.IntegerField()
+    phase_1_bids = models.IntegerField()
+    phase_2_bids = models.IntegerField()
+    phase_3_bids = models.IntegerField()
+    bidders = models.JSONField(
+        default=list, encoder=DjangoJSONEncoder,
+        help_text="Per-bidder participation: username, bidder_type, bid_count, total_amount, max_bid"
+    )
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'auction_summaries'
+    
+    def __str__(self):
+        return f"Summary - {self.auction.title}"
+    
+    @property
+    def phase_stats(self):
+        """Bid counts keyed by phase number."""
+        return {1: self.phase_1_bids, 2: self.phase_2_bids, 3: self.phase_3_bids}
+
+
+class PlatformStatsShard(models.Model):
+    """
+    One slice of the platform-wide counters.
+    
+    Writers bump a random shard so concurrent bids do not queue on one row;
+    readers sum the shards. See stats.py.
+    """
+    shard = models.PositiveSmallIntegerField(primary_key=True)
+    total_auctions = models.IntegerField(default=0)
+    pending_auctions = models.IntegerField(default=0)
+    active_auctions = models.IntegerField(default=0)
+    completed_auctions = models.IntegerField(default=0)
+    cancelled_auctions = models.IntegerField(default=0)
+    total_bids = models.IntegerField(default=0)
+    total_bid_amount = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    total_revenue = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'platform_stats_shards'
+    
+    def __str__(self):
+        return f"Stats shard {self.shard}"
+
+
+class BidderStats(models.Model):
+    """Per-user bidding totals backing the top bidders leaderboard."""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='bid_stats')
+    bid_count = models.IntegerField(default=0, db_index=True)
+    total_amount = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    
+    class Meta:
+        db_table = 'bidder_stats'
+    
+    def __str__(self):
+        return f"{self.user.username} - {self.bid_count} bids"
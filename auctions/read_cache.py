@@ -0,0 +1,109 @@
+"""
+Micro-TTL response cache for hot read endpoints.
+
+Every viewer of an auction asks for the same status_info, bids page or
+active auction list within the same second. Responses are cached for
+READ_CACHE_TTL (a fraction of a second) under a key that includes the
+auction's state version, so:
+
+- bid and completion paths call invalidate(), which bumps the version once
+  their transaction commits; the next read misses and sees the new state
+- while an entry is being recomputed, only one caller (per key, across all
+  workers sharing the cache) runs the query; the others return the previous
+  value, or briefly wait for the new one if there is none
+
+Expiry is checked against a timestamp stored with each value, so sub-second
+TTLs behave the same on backends whose timeouts have whole-second
+resolution. The cache alias is READ_CACHE_ALIAS: local memory by default,
+or a shared backend such as Redis for multiple workers (see CACHES).
+"""
+import logging
+import time
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+logger = logging.getLogger('auctions')
+
+# Version scope bumped by every invalidation; used by cross-auction reads
+ALL_AUCTIONS = 'all'
+
+# How long a recompute lock is held at most, and how long waiters poll for it
+LOCK_TIMEOUT = 5
+WAIT_TIMEOUT = 0.5
+WAIT_STEP = 0.01
+
+# Expired entries stay readable this long, to serve while one caller recomputes
+STALE_TIMEOUT = 5
+
+
+def _cache():
+    return caches[settings.AUCTION_CONFIG.get('READ_CACHE_ALIAS', 'default')]
+
+
+def _version_key(scope):
+    return f'read-cache:version:{scope}'
+
+
+def invalidate(*auction_ids):
+    """Bump the state version of `auction_ids` once the current transaction commits."""
+    transaction.on_commit(lambda: _bump_versions(auction_ids))
+
+
+def _bump_versions(auction_ids):
+    cache = _cache()
+    for scope in [*map(str, auction_ids), ALL_AUCTIONS]:
+        key = _version_key(scope)
+        try:
+            try:
+                cache.incr(key)
+            except ValueError:
+                # Missing key: start the counter, or bump it if another writer just did
+                if not cache.add(key, 1, timeout=None):
+                    cache.incr(key)
+        except Exception as e:
+            logger.error(f"Failed to invalidate read cache for {scope}: {str(e)}")
+
+
+def get_or_compute(scope, name, compute, variant=''):
+    """
+    Return the cached value of `name` for `scope` (an auction id or
+    ALL_AUCTIONS), calling `compute()` at most once per TTL per state version.
+
+    `variant` distinguishes responses that depend on query parameters.
+    """
+    ttl = settings.AUCTION_CONFIG.get('READ_CACHE_TTL', 0.5)
+    if not ttl:
+        return compute()
+
+    cache = _cache()
+    try:
+        version = cache.get(_version_key(scope), 0)
+        key = f'read-cache:{name}:{scope}:{version}:{variant}'
+        entry = cache.get(key)
+    except Exception as e:
+        logger.error(f"Read cache unavailable for {name}: {str(e)}")
+        return compute()
+
+    if entry is not None and entry[0] > time.time():
+        return entry[1]
+
+    lock = f'{key}:lock'
+    if cache.add(lock, 1, timeout=LOCK_TIMEOUT):
+        try:
+            value = compute()
+            cache.set(key, (time.time() + ttl, value), timeout=ttl + STALE_TIMEOUT)
+            return value
+        finally:
+            cache.delete(lock)
+
+    # Someone else is recomputing: serve the expired value, or wait for theirs
+    if entry is not None:
+        return entry[1]
+    deadline = time.time() + WAIT_TIMEOUT
+    while time.time() < deadline:
+        time.sleep(WAIT_STEP)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry[1]
+    return compute()
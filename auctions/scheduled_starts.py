@@ -0,0 +1,221 @@
+"""
+Auction starts, manual and scheduled.
+
+start_auctions() moves pending auctions to active in one transaction: one
+locked read, one status update conditional on status='pending' per distinct
+duration, one read of the started rows, one bulk insert of the `started` logs
+and one statistics write, whether it starts one auction or a whole drop. The
+bots of the started auctions are handed to the bot engine together once the
+transaction commits (BotEngine.start_bots), which acquires their leases in
+bulk and queues their first ticks at once.
+
+Pending auctions with a scheduled_start are started by the StartScheduler,
+one thread per process. It keeps a timer heap of the starts due within the
+next START_SCHEDULER_LOOKAHEAD seconds, loaded with one query on the
+(status, scheduled_start) index, and sleeps until the earliest one. Every
+auction due at that moment is started by a single start_auctions() call.
+Creating a scheduled auction wakes the scheduler of the same process; other
+processes see it at their next reload. start_auctions() only starts rows
+that are still pending, so several schedulers (and the start endpoint) never start an
+auction twice.
+
+Start latency, the delay between scheduled_start and the actual start, is
+stored in each started log's metadata and summarized by metrics().
+"""
+import heapq
+import logging
+import threading
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from . import clock, read_cache, stats
+from .models import Auction, AuctionLog
+
+logger = logging.getLogger('auctions')
+
+
+def _config(key, default):
+    return settings.AUCTION_CONFIG.get(key, default)
+
+
+def start_auctions(auction_ids, now=None, scheduled_only=False):
+    """
+    Start the given auctions that are still pending. Returns the started auctions.
+
+    With `scheduled_only`, only auctions whose scheduled_start has come are started.
+    """
+    now = now or clock.now()
+    with transaction.atomic():
+        pending = Auction.objects.select_for_update().filter(pk__in=auction_ids, status='pending')
+        if scheduled_only:
+            pending = pending.filter(scheduled_start__lte=now)
+        durations = {}
+        for auction_id, duration in pending.values_list('pk', 'duration'):
+            durations.setdefault(duration, []).append(auction_id)
+        if not durations:
+            return []
+
+        # Conditional on status, so the row lock is not all that keeps a start
+        # single (select_for_update is a no-op on SQLite): one update per
+        # distinct duration, since end_time depends on it
+        started = []
+        for duration, ids in durations.items():
+            updated = pending.filter(pk__in=ids).update(
+                status='active',
+                start_time=now,
+                end_time=now + timezone.timedelta(seconds=duration),
+                current_price=F('start_price'),
+                version=F('version') + 1,
+                updated_at=now
+            )
+            if updated == len(ids):
+                started.extend(ids)
+            elif updated:
+                # Another process started some of them: keep the rows this update changed
+                started.extend(Auction.objects.filter(
+                    pk__in=ids, status='active', start_time=now
+                ).values_list('pk', flat=True))
+        auctions = list(Auction.objects.filter(pk__in=started))
+        if not auctions:
+            return []
+
+        logs = []
+        for auction in auctions:
+            metadata = {}
+            if auction.scheduled_start:
+                metadata = {
+                    'scheduled_start': auction.scheduled_start.isoformat(),
+                    'start_latency_ms': round((now - auction.scheduled_start).total_seconds() * 1000, 3),
+                }
+            logs.append(AuctionLog(
+                auction=auction,
+                event_type='started',
+                message=f"Auction started. Duration: {auction.duration}s, Max bid: ₹{auction.max_bid}",
+                metadata=metadata
+            ))
+
+        AuctionLog.objects.bulk_create(logs)
+        stats.record_status_change('pending', 'active', count=len(auctions))
+        read_cache.invalidate(*[auction.id for auction in auctions])
+
+        bot_ids = [str(auction.id) for auction in auctions if auction.bot_active]
+        if bot_ids:
+            # Bots must not tick before they can see the auction active
+            transaction.on_commit(lambda: _start_bots(bot_ids))
+    return auctions
+
+
+def _start_bots(auction_ids):
+    from .bot_runner import get_engine
+    get_engine().start_bots(auction_ids)
+
+
+class StartScheduler:
+    """Timer heap of upcoming scheduled starts, driving start_auctions()."""
+
+    def __init__(self):
+        self.lookahead = _config('START_SCHEDULER_LOOKAHEAD', 5)
+        self._heap = []
+        self._reload = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        # Metrics
+        self._started = 0
+        self._batches = 0
+        self._latency = 0.0  # moving average of start latency, in seconds
+        self._max_latency = 0.0
+        self._last_batch = 0
+
+    def start(self):
+        """Start the scheduler thread, once."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, daemon=True, name='AuctionStart-scheduler')
+            self._thread.start()
+
+    def notify(self):
+        """A scheduled_start changed: reload the timer heap now."""
+        self._reload.set()
+
+    def metrics(self):
+        """Start counts and latency of the scheduled starts run by this process."""
+        with self._lock:
+            return {
+                'started': self._started,
+                'batches': self._batches,
+                'last_batch_size': self._last_batch,
+                'mean_latency_ms': round(self._latency * 1000, 3),
+                'max_latency_ms': round(self._max_latency * 1000, 3),
+            }
+
+    def _load(self, now):
+        """Upcoming (and overdue) scheduled starts, sorted, which makes them a valid heap."""
+        horizon = now + timezone.timedelta(seconds=self.lookahead)
+        return [
+            (scheduled_start, str(auction_id))
+            for scheduled_start, auction_id in Auction.objects.filter(
+                status='pending', scheduled_start__lte=horizon
+            ).order_by('scheduled_start').values_list('scheduled_start', 'id')
+        ]
+
+    def _run(self):
+        logger.info("Start scheduler started")
+        next_load = None
+        while True:
+            timeout = self.lookahead
+            try:
+                now = clock.now()
+                if next_load is None or now >= next_load:
+                    self._heap = self._load(now)
+                    next_load = now + timezone.timedelta(seconds=self.lookahead)
+
+                due = []
+                while self._heap and self._heap[0][0] <= now:
+                    due.append(heapq.heappop(self._heap)[1])
+                if due:
+                    self._start_due(due)
+
+                timeout = (next_load - clock.now()).total_seconds()
+                if self._heap:
+                    timeout = min(timeout, (self._heap[0][0] - clock.now()).total_seconds())
+            except Exception as e:
+                logger.error(f"Start scheduler error: {str(e)}")
+                next_load = None
+            finally:
+                close_old_connections()
+
+            if self._reload.wait(max(timeout, 0)):
+                self._reload.clear()
+                next_load = None
+
+    def _start_due(self, auction_ids):
+        started = start_auctions(auction_ids, scheduled_only=True)
+        if not started:
+            return
+        latencies = [(auction.start_time - auction.scheduled_start).total_seconds() for auction in started]
+        with self._lock:
+            self._started += len(started)
+            self._batches += 1
+            self._last_batch = len(started)
+            self._max_latency = max(self._max_latency, *latencies)
+            for latency in latencies:
+                self._latency += 0.1 * (latency - self._latency)
+        logger.info(
+            f"Started {len(started)} scheduled auctions, "
+            f"latency mean {sum(latencies) / len(latencies) * 1000:.1f} ms, max {max(latencies) * 1000:.1f} ms"
+        )
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """Return the process-wide start scheduler, creating it on first use."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = StartScheduler()
+        return _scheduler
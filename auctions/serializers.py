@@ -1,7 +1,9 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from .models import Auction, Bid, AuctionLog
+from .models import Auction, Bid, AuctionLog, ProxyBid
 from django.conf import settings
+from django.utils import timezone
+from django.db.models import Prefetch
 
 User = get_user_model()
 
@@ -37,38 +39,26 @@ class AuctionSerializer(serializers.ModelSerializer):
     phase_progress = serializers.FloatField(read_only=True)
     remaining_time = serializers.FloatField(read_only=True)
     elapsed_time = serializers.FloatField(read_only=True)
-    total_bids = serializers.SerializerMethodField()
-    human_bids_count = serializers.SerializerMethodField()
-    bot_bids_count = serializers.SerializerMethodField()
-    latest_bid = serializers.SerializerMethodField()
+    latest_bid = BidSerializer(read_only=True)
     
     class Meta:
         model = Auction
         fields = ['id', 'title', 'description', 'start_price', 'max_bid', 
-                  'current_price', 'duration', 'status', 'start_time', 'end_time',
+                  'current_price', 'duration', 'status', 'scheduled_start', 'start_time', 'end_time',
                   'extended_time', 'bot_active', 'bot_current_bid', 'winner',
                   'winner_username', 'created_by', 'created_by_username',
                   'created_at', 'updated_at', 'current_phase', 'phase_progress',
                   'remaining_time', 'elapsed_time', 'total_bids', 
-                  'human_bids_count', 'bot_bids_count', 'latest_bid']
-        read_only_fields = ['id', 'current_price', 'status', 'start_time', 
+                  'human_bids_count', 'bot_bids_count', 'latest_bid', 'version']
+        read_only_fields = ['id', 'current_price', 'status', 'scheduled_start', 'start_time', 
                            'end_time', 'extended_time', 'bot_current_bid',
-                           'winner', 'created_at', 'updated_at']
+                           'winner', 'created_at', 'updated_at', 'total_bids',
+                           'human_bids_count', 'bot_bids_count', 'version']
     
-    def get_total_bids(self, obj):
-        return obj.bids.count()
-    
-    def get_human_bids_count(self, obj):
-        return obj.bids.filter(bidder_type='human').count()
-    
-    def get_bot_bids_count(self, obj):
-        return obj.bids.filter(bidder_type='bot').count()
-    
-    def get_latest_bid(self, obj):
-        latest = obj.bids.first()
-        if latest:
-            return BidSerializer(latest).data
-        return None
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Load every relation the serializer reads, so a page costs a fixed number of queries."""
+        return queryset.select_related('created_by', 'winner', 'latest_bid__bidder')
 
 
 class AuctionDetailSerializer(AuctionSerializer):
@@ -78,6 +68,13 @@ class AuctionDetailSerializer(AuctionSerializer):
     
     class Meta(AuctionSerializer.Meta):
         fields = AuctionSerializer.Meta.fields + ['bids', 'logs']
+    
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return AuctionSerializer.setup_eager_loading(queryset).prefetch_related(
+            Prefetch('bids', queryset=Bid.objects.select_related('bidder')),
+            'logs',
+        )
 
 
 class BidCreateSerializer(serializers.Serializer):
@@ -140,15 +137,58 @@ class BidCreateSerializer(serializers.Serializer):
         return attrs
 
 
+class ProxyBidSerializer(serializers.ModelSerializer):
+    """Serializer for a user's standing proxy bid."""
+    bidder_username = serializers.CharField(source='bidder.username', read_only=True)
+    
+    class Meta:
+        model = ProxyBid
+        fields = ['id', 'auction', 'bidder_username', 'ceiling', 'created_at', 'updated_at']
+        read_only_fields = fields
+
+
+class ProxyBidCreateSerializer(serializers.Serializer):
+    """Serializer for setting a proxy bid ceiling."""
+    ceiling = serializers.DecimalField(max_digits=10, decimal_places=2)
+    
+    def validate(self, attrs):
+        auction = self.context['auction']
+        ceiling = attrs['ceiling']
+        
+        if auction.status != 'active':
+            raise serializers.ValidationError("Auction is not active.")
+        
+        if auction.remaining_time <= 0:
+            raise serializers.ValidationError("Auction has ended.")
+        
+        if ceiling > auction.max_bid:
+            raise serializers.ValidationError(
+                f"Ceiling cannot exceed maximum bid of ₹{auction.max_bid}."
+            )
+        
+        min_ceiling = auction.current_price + min(settings.AUCTION_CONFIG['BID_INCREMENTS'])
+        if ceiling < min_ceiling:
+            raise serializers.ValidationError(
+                f"Ceiling must be at least ₹{min_ceiling}. Current price is ₹{auction.current_price}."
+            )
+        
+        return attrs
+
+
 class AuctionCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating an auction."""
     
     class Meta:
         model = Auction
         fields = ['id', 'title', 'description', 'start_price', 'max_bid', 
-                  'duration', 'bot_active']
+                  'duration', 'bot_active', 'scheduled_start']
         read_only_fields = ['id']
     
+    def validate_scheduled_start(self, value):
+        if value is not None and value <= timezone.now():
+            raise serializers.ValidationError("Scheduled start must be in the future.")
+        return value
+    
     def validate_max_bid(self, value):
         if value <= 0:
             raise serializers.ValidationError("Max bid must be positive.")
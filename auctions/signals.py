@@ -1,6 +1,52 @@
 """
 Django signals for auctions app.
 """
-# Signals can be added here for future extensibility
-# Example: post_save signals, pre_delete signals, etc.
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 
+from . import events, stats
+from .models import Auction, Bid
+
+
+def announce_bids(bids):
+    """Publish bid_placed events for the given bids once the transaction commits."""
+    def publish():
+        for bid in bids:
+            events.publish(
+                'bid_placed',
+                bid.auction_id,
+                bidder_type=bid.bidder_type,
+                amount=float(bid.amount),
+                phase=bid.phase,
+                timestamp=bid.timestamp,
+            )
+
+    transaction.on_commit(publish)
+
+
+@receiver(post_save, sender=Bid)
+def publish_bid_placed(sender, instance, created, **kwargs):
+    """Announce new bids on the event bus."""
+    if created:
+        announce_bids([instance])
+
+
+@receiver(post_save, sender=Bid)
+def count_bid(sender, instance, created, **kwargs):
+    """Add new bids to the platform statistics."""
+    if created:
+        stats.record_bids([instance])
+
+
+@receiver(post_save, sender=Auction)
+def count_new_auction(sender, instance, created, **kwargs):
+    """Add new auctions to the platform statistics."""
+    if created:
+        stats.record_status_change(None, instance.status)
+
+
+@receiver(post_delete, sender=Auction)
+def uncount_deleted_auction(sender, instance, **kwargs):
+    """Remove deleted auctions from the platform statistics."""
+    stats.record_status_change(instance.status, None, revenue=-stats.auction_revenue(instance))
@@ -0,0 +1,288 @@
+"""
+Virtual-clock auction simulator.
+
+Plays out many auctions against scripted human bidders without a database
+or real waiting: every auction lives in memory, a VirtualClock jumps straight
+to the next event, and each bot tick runs the same decision code as the live
+engine (bot_runner._evaluate on an AuctionBot). Only persistence differs:
+SimulatedBot records bids and completions in the simulator's store. With a
+seed, auction ids and bot plan seeds are derived from it, so a run can be
+replayed exactly.
+
+Used by the simulate_auctions management command to tune AUCTION_CONFIG.
+"""
+import heapq
+import itertools
+import logging
+import random
+import statistics
+import time
+import uuid
+from django.conf import settings
+from django.utils import timezone
+from . import clock
+from .bot_logic import AuctionBot
+from .bot_runner import SLEEP_UNTIL_WOKEN, _BotState, _evaluate
+from .models import Auction, Bid
+
+logger = logging.getLogger('auctions')
+
+
+class SimulatedBot(AuctionBot):
+    """AuctionBot that writes its bids and completions to a simulated auction."""
+
+    def __init__(self, record, config):
+        super().__init__(record.auction, last_human_bid_at=record.state.last_human_bid_at, plan=record.state.plan)
+        self.config = config
+        self.bid_increments = config['BID_INCREMENTS']
+        self.record = record
+
+    def place_bid(self, phase=None):
+        built = self.build_bid(phase)
+        if built is None:
+            return False
+        bid, _ = built
+        self.record.add_bid(bid, bidder='Bot')
+        return True
+
+    def complete_auction(self):
+        self.record.complete()
+
+
+class ScriptedBidder:
+    """A human who bids at random intervals while the price is below their valuation."""
+
+    def __init__(self, name, valuation, mean_interval):
+        self.name = name
+        self.valuation = valuation
+        self.mean_interval = mean_interval
+
+    def next_attempt(self, rng):
+        """Seconds until this bidder next looks at the auction."""
+        return rng.expovariate(1 / self.mean_interval)
+
+    def bid_amount(self, auction, increments, rng):
+        """Amount to bid now, or None to sit this one out."""
+        amount = float(auction.current_price) + rng.choice(increments)
+        if amount > self.valuation or amount > auction.max_bid:
+            return None
+        return amount
+
+
+class _SimulatedAuction:
+    """One auction in the simulator's in-memory store."""
+
+    def __init__(self, auction, bidders):
+        self.auction = auction
+        self.bidders = bidders
+        self.state = _BotState(str(auction.id))
+        self.leader = None
+        self.bot_bids = 0
+        self.human_bids = 0
+        self.stalled = False
+
+    def add_bid(self, bid, bidder):
+        bid.timestamp = clock.now()
+        self.leader = bidder
+        if bid.bidder_type == 'bot':
+            self.bot_bids += 1
+            self.auction.bot_bids_count += 1
+        else:
+            self.human_bids += 1
+            self.auction.human_bids_count += 1
+
+    def complete(self):
+        auction = self.auction
+        if auction.status != 'active':
+            return
+        auction.status = 'completed'
+        if not auction.end_time or clock.now() < auction.end_time:
+            auction.end_time = clock.now()
+
+
+class Simulation:
+    """
+    Run auctions on a virtual clock.
+
+    `config` overrides AUCTION_CONFIG keys for the bots. Human bidders get
+    valuations drawn uniformly from `valuation_range` (fractions of max_bid)
+    and look at the auction every `human_interval` seconds on average. An
+    auction still active `max_overtime` seconds after its end_time is
+    counted as stalled and stopped.
+    """
+
+    def __init__(self, auctions=1000, duration=None, start_price=None, max_bid=10000,
+                 humans=2, human_interval=8.0, valuation_range=(0.5, 1.1),
+                 config=None, seed=None, max_overtime=300):
+        self.config = {**settings.AUCTION_CONFIG, **(config or {})}
+        if seed is not None and not self.config.get('BOT_PLAN_SEED'):
+            self.config['BOT_PLAN_SEED'] = f'simulation:{seed}'
+        self.auctions = auctions
+        self.duration = duration or self.config['DEFAULT_DURATION']
+        self.start_price = start_price or self.config['DEFAULT_START_PRICE']
+        self.max_bid = max_bid
+        self.humans = humans
+        self.human_interval = human_interval
+        self.valuation_range = valuation_range
+        self.seed = seed
+        self.max_overtime = timezone.timedelta(seconds=max_overtime)
+        self.clock = clock.VirtualClock()
+        self._queue = []
+        self._sequence = itertools.count()
+        self.decisions = 0
+
+    def run(self, quiet=True):
+        """Play every auction to the end and return the summary report."""
+        rng = random.Random(self.seed)
+
+        auctions_logger = logging.getLogger('auctions')
+        level = auctions_logger.level
+        if quiet:
+            auctions_logger.setLevel(logging.WARNING)
+
+        started = time.perf_counter()
+        try:
+            with clock.override(self.clock):
+                records = [self._open_auction(index, rng) for index in range(self.auctions)]
+                self._drain(rng)
+        finally:
+            auctions_logger.setLevel(level)
+        wall_seconds = time.perf_counter() - started
+
+        return self._report(records, wall_seconds)
+
+    def _open_auction(self, index, rng):
+        now = self.clock.now()
+        auction = Auction(
+            id=uuid.UUID(int=rng.getrandbits(128)),
+            title=f'Simulated auction {index + 1}',
+            start_price=self.start_price,
+            current_price=self.start_price,
+            max_bid=self.max_bid,
+            duration=self.duration,
+            status='active',
+            start_time=now,
+            end_time=now + timezone.timedelta(seconds=self.duration),
+        )
+        # Snapshot annotations, kept current in memory so the bot never queries
+        auction.latest_human_bid_at = None
+        for phase in (1, 2, 3):
+            setattr(auction, f'bot_bid_phase_{phase}', False)
+
+        low, high = self.valuation_range
+        bidders = [
+            ScriptedBidder(f'human-{number + 1}', rng.uniform(low, high) * self.max_bid, self.human_interval)
+            for number in range(self.humans)
+        ]
+        record = _SimulatedAuction(auction, bidders)
+        self._wake_bot(record, 0)
+        for bidder in bidders:
+            self._push(bidder.next_attempt(rng), 'human', record, bidder)
+        return record
+
+    def _push(self, delay, kind, record, payload=None):
+        when = self.clock.now() + timezone.timedelta(seconds=delay)
+        heapq.heappush(self._queue, (when, next(self._sequence), kind, record, payload))
+        return when
+
+    def _wake_bot(self, record, delay):
+        if delay is None or delay == SLEEP_UNTIL_WOKEN:
+            record.state.deadline = None
+            return
+        record.state.deadline = self._push(delay, 'bot', record)
+
+    def _drain(self, rng):
+        while self._queue:
+            when, _, kind, record, payload = heapq.heappop(self._queue)
+            auction = record.auction
+            if auction.status != 'active':
+                continue
+            self.clock.advance_to(when)
+
+            if auction.end_time and self.clock.now() - auction.end_time > self.max_overtime:
+                record.stalled = True
+                auction.status = 'stalled'
+                continue
+
+            if kind == 'bot':
+                if record.state.deadline != when:
+                    continue  # superseded by an earlier wakeup
+                self._bot_tick(record)
+            else:
+                self._human_attempt(record, payload, rng)
+
+    def _bot_tick(self, record):
+        state = record.state
+        state.deadline = None
+        state.seen_human_bid_at = state.last_human_bid_at
+        self.decisions += 1
+
+        delay = _evaluate(state, SimulatedBot(record, self.config))
+        if delay is None:
+            return
+
+        # Same bookkeeping as BotEngine._finish_tick
+        if state.last_human_bid_at == state.seen_human_bid_at:
+            state.last_human_bid_at = None
+        if state.woken and state.pending_reaction is None:
+            state.woken = False
+            delay = 0
+        self._wake_bot(record, delay)
+
+    def _human_attempt(self, record, bidder, rng):
+        auction = record.auction
+        if auction.remaining_time > 0 and record.leader != bidder.name:
+            amount = bidder.bid_amount(auction, self.config['BID_INCREMENTS'], rng)
+            if amount is not None:
+                bid = Bid(auction=auction, bidder_type='human', amount=amount, phase=auction.current_phase)
+                record.add_bid(bid, bidder=bidder.name)
+                auction.current_price = amount
+                auction.latest_human_bid_at = bid.timestamp
+
+                # Push the bid to the bot, as BotEngine.notify_human_bid does
+                state = record.state
+                state.last_human_bid_at = bid.timestamp
+                if state.pending_reaction is None:
+                    self._wake_bot(record, 0)
+                else:
+                    state.woken = True
+
+        if auction.remaining_time > 0:
+            self._push(bidder.next_attempt(rng), 'human', record, bidder)
+
+    def _report(self, records, wall_seconds):
+        completed = [record for record in records if record.auction.status == 'completed']
+        prices = [float(record.auction.current_price) for record in completed]
+        extensions = [
+            record.auction.extended_time / self.config['PHASE_3_EXTENSION_TIME']
+            for record in completed
+        ]
+        bot_wins = sum(1 for record in completed if record.leader == 'Bot')
+        human_wins = sum(1 for record in completed if record.leader not in (None, 'Bot'))
+
+        def quantile(values, q):
+            if not values:
+                return 0
+            ordered = sorted(values)
+            return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+        return {
+            'auctions': len(records),
+            'completed': len(completed),
+            'stalled': sum(1 for record in records if record.stalled),
+            'bot_wins': bot_wins,
+            'human_wins': human_wins,
+            'no_bids': len(completed) - bot_wins - human_wins,
+            'bot_win_rate': bot_wins / len(completed) if completed else 0,
+            'final_price_mean': statistics.fmean(prices) if prices else 0,
+            'final_price_median': statistics.median(prices) if prices else 0,
+            'final_price_p95': quantile(prices, 0.95),
+            'final_price_max': max(prices, default=0),
+            'extensions_mean': statistics.fmean(extensions) if extensions else 0,
+            'extensions_max': max(extensions, default=0),
+            'bot_bids': sum(record.bot_bids for record in records),
+            'human_bids': sum(record.human_bids for record in records),
+            'decisions': self.decisions,
+            'wall_seconds': wall_seconds,
+            'decisions_per_second': self.decisions / wall_seconds if wall_seconds else 0,
+        }
@@ -0,0 +1,184 @@
+"""
+Incrementally maintained platform statistics.
+
+The statistics endpoints read precomputed counters instead of aggregating the
+auctions and bids tables on every request:
+
+- PlatformStatsShard rows hold auction counts by status, bid totals and
+  revenue. Every write bumps one randomly chosen shard, so concurrent bids do
+  not queue on a single hot row. Readers sum the STATS_SHARDS rows.
+- BidderStats holds per-user bid counts and amounts for the top bidders
+  leaderboard.
+
+Bid and completion paths call record_bids() / record_status_change() inside
+their own transactions, so a rolled-back bid never counts. Anything that
+bypasses them (admin edits, cascaded deletes) is corrected by reconcile(),
+which the reconcile_stats command runs periodically.
+"""
+import random
+import logging
+from decimal import Decimal
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+from .models import Auction, Bid, BidderStats, PlatformStatsShard
+
+logger = logging.getLogger('auctions')
+
+STATS_SHARDS = 8
+
+# Auction status -> counter column
+STATUS_COUNTERS = {
+    'pending': 'pending_auctions',
+    'active': 'active_auctions',
+    'completed': 'completed_auctions',
+    'cancelled': 'cancelled_auctions',
+}
+
+COUNTER_FIELDS = [
+    'total_auctions', *STATUS_COUNTERS.values(),
+    'total_bids', 'total_bid_amount', 'total_revenue',
+]
+
+
+def _bump(**deltas):
+    """Add `deltas` to one randomly chosen shard."""
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    shard = random.randrange(STATS_SHARDS)
+    updates = {field: F(field) + delta for field, delta in deltas.items()}
+    if not PlatformStatsShard.objects.filter(shard=shard).update(**updates):
+        # Shard rows are created lazily; a concurrent creator may win the race
+        try:
+            with transaction.atomic():
+                PlatformStatsShard.objects.create(shard=shard, **deltas)
+        except IntegrityError:
+            PlatformStatsShard.objects.filter(shard=shard).update(**updates)
+
+
+def record_bids(bids):
+    """Count newly saved bids in the platform totals and the bidder leaderboard."""
+    if not bids:
+        return
+    _bump(total_bids=len(bids), total_bid_amount=sum(Decimal(str(bid.amount)) for bid in bids))
+
+    per_bidder = {}
+    for bid in bids:
+        if bid.bidder_type == 'human' and bid.bidder_id:
+            count, amount = per_bidder.get(bid.bidder_id, (0, Decimal(0)))
+            per_bidder[bid.bidder_id] = (count + 1, amount + Decimal(str(bid.amount)))
+
+    for user_id, (count, amount) in per_bidder.items():
+        updates = {'bid_count': F('bid_count') + count, 'total_amount': F('total_amount') + amount}
+        if BidderStats.objects.filter(user_id=user_id).update(**updates):
+            continue
+        try:
+            with transaction.atomic():
+                BidderStats.objects.create(user_id=user_id, bid_count=count, total_amount=amount)
+        except IntegrityError:
+            BidderStats.objects.filter(user_id=user_id).update(**updates)
+
+
+def record_status_change(old_status, new_status, revenue=0, count=1):
+    """
+    Move `count` auctions between status counters.
+
+    `old_status` is None for a new auction and `new_status` None for a
+    deleted one. `revenue` is added to (or, negative, removed from) the
+    platform revenue.
+    """
+    deltas = {'total_revenue': revenue}
+    if old_status is None:
+        deltas['total_auctions'] = count
+    elif old_status in STATUS_COUNTERS:
+        deltas[STATUS_COUNTERS[old_status]] = -count
+    if new_status is None:
+        deltas['total_auctions'] = deltas.get('total_auctions', 0) - count
+    elif new_status in STATUS_COUNTERS:
+        deltas[STATUS_COUNTERS[new_status]] = deltas.get(STATUS_COUNTERS[new_status], 0) + count
+    _bump(**deltas)
+
+
+def record_completions(auctions):
+    """Move auctions that just completed from the active to the completed counter, in one write."""
+    if not auctions:
+        return
+    _bump(
+        active_auctions=-len(auctions),
+        completed_auctions=len(auctions),
+        total_revenue=sum(auction_revenue(auction) for auction in auctions),
+    )
+
+
+def auction_revenue(auction):
+    """Revenue an auction contributes: its final price if a human won it."""
+    if auction.status == 'completed' and auction.winner_id:
+        return auction.current_price
+    return 0
+
+
+def snapshot():
+    """Current platform totals, summed over the shards in one query."""
+    totals = PlatformStatsShard.objects.aggregate(**{field: Sum(field) for field in COUNTER_FIELDS})
+    totals = {field: value or 0 for field, value in totals.items()}
+    totals['average_bid_amount'] = (
+        totals['total_bid_amount'] / totals['total_bids'] if totals['total_bids'] else 0
+    )
+    return totals
+
+
+def top_bidders(limit=10):
+    """Leaderboard rows shaped like the statistics API's top_bidders entries."""
+    return [
+        {
+            'bidder__username': stats.user.username,
+            'bid_count': stats.bid_count,
+            'total_amount': stats.total_amount,
+        }
+        for stats in BidderStats.objects.select_related('user').order_by('-bid_count')[:limit]
+    ]
+
+
+def reconcile():
+    """
+    Recompute every counter from the auctions and bids tables.
+
+    Holds the shard rows locked while it runs, so bids committing meanwhile
+    wait and are counted exactly once. Returns the corrected totals.
+    """
+    with transaction.atomic():
+        existing = set(PlatformStatsShard.objects.select_for_update().values_list('shard', flat=True))
+        missing = [PlatformStatsShard(shard=shard) for shard in range(STATS_SHARDS) if shard not in existing]
+        PlatformStatsShard.objects.bulk_create(missing, ignore_conflicts=True)
+
+        auctions = Auction.objects.order_by().aggregate(
+            total_auctions=Count('id'),
+            revenue=Sum('current_price', filter=Q(status='completed', winner__isnull=False)),
+            **{
+                counter: Count('id', filter=Q(status=status))
+                for status, counter in STATUS_COUNTERS.items()
+            }
+        )
+        bids = Bid.objects.order_by().aggregate(total_bids=Count('id'), total_bid_amount=Sum('amount'))
+
+        totals = {
+            'total_auctions': auctions['total_auctions'],
+            **{counter: auctions[counter] for counter in STATUS_COUNTERS.values()},
+            'total_bids': bids['total_bids'],
+            'total_bid_amount': bids['total_bid_amount'] or 0,
+            'total_revenue': auctions['revenue'] or 0,
+        }
+        PlatformStatsShard.objects.filter(shard=0).update(**totals)
+        PlatformStatsShard.objects.exclude(shard=0).update(**{field: 0 for field in COUNTER_FIELDS})
+
+        leaderboard = [
+            BidderStats(user_id=row['bidder'], bid_count=row['bid_count'], total_amount=row['total_amount'])
+            for row in Bid.objects.filter(bidder_type='human', bidder__isnull=False).order_by().values(
+                'bidder'
+            ).annotate(bid_count=Count('id'), total_amount=Sum('amount'))
+        ]
+        BidderStats.objects.all().delete()
+        BidderStats.objects.bulk_create(leaderboard)
+
+    logger.info(f"Platform statistics reconciled: {totals['total_auctions']} auctions, {totals['total_bids']} bids")
+    return totals
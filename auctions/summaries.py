@@ -0,0 +1,158 @@
+"""
+Materialized results of completed auctions.
+
+A completed auction cannot change, so its phase breakdown, bidder
+participation, duration and price increase are computed once when it
+completes. Detail pages and analytics then read a single AuctionSummary row
+instead of re-aggregating the bids table on every view.
+"""
+import logging
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Max, Q, Sum
+from .models import AuctionSummary, Bid
+
+logger = logging.getLogger('auctions')
+
+
+_COUNTS = {
+    'total': Count('id'),
+    'human': Count('id', filter=Q(bidder_type='human')),
+    'bot': Count('id', filter=Q(bidder_type='bot')),
+    'phase_1': Count('id', filter=Q(phase=1)),
+    'phase_2': Count('id', filter=Q(phase=2)),
+    'phase_3': Count('id', filter=Q(phase=3)),
+}
+
+_BIDDER_TOTALS = {
+    'bid_count': Count('id'),
+    'total_amount': Sum('amount'),
+    'max_bid': Max('amount'),
+}
+
+
+def _bidder_entry(row):
+    return {
+        'username': row['bidder__username'],
+        'bidder_type': row['bidder_type'],
+        'bid_count': row['bid_count'],
+        'total_amount': row['total_amount'],
+        'max_bid': row['max_bid'],
+    }
+
+
+def build_summary(auction):
+    """Compute an unsaved AuctionSummary for a completed auction from its bids."""
+    bids = auction.bids.order_by()
+    counts = bids.aggregate(**_COUNTS)
+    bidders = [
+        _bidder_entry(row)
+        for row in bids.values('bidder__username', 'bidder_type').annotate(**_BIDDER_TOTALS).order_by('-max_bid')
+    ]
+
+    return _summary(auction, counts, bidders)
+
+
+def _winner_type(auction, total_bids):
+    """
+    Who won, by the rule that set auction.winner.
+
+    Completion and manual stops pick the winning user differently, so the
+    winner type follows auction.winner rather than the last bid.
+    """
+    if auction.winner_id:
+        return 'human'
+    return 'bot' if total_bids else 'none'
+
+
+def fix_winner_types():
+    """Correct stored summaries whose winner_type disagrees with auction.winner. Returns how many changed."""
+    summaries = AuctionSummary.objects
+    return (
+        summaries.filter(auction__winner__isnull=False).exclude(winner_type='human').update(winner_type='human')
+        + summaries.filter(auction__winner__isnull=True, total_bids__gt=0).exclude(winner_type='bot')
+        .update(winner_type='bot')
+        + summaries.filter(auction__winner__isnull=True, total_bids=0).exclude(winner_type='none')
+        .update(winner_type='none')
+    )
+
+
+def _summary(auction, counts, bidders):
+    if auction.start_time and auction.end_time:
+        duration_seconds = (auction.end_time - auction.start_time).total_seconds()
+    else:
+        duration_seconds = 0
+
+    price_increase = auction.current_price - auction.start_price
+    if auction.start_price > 0:
+        price_increase_percentage = float(price_increase / auction.start_price * 100)
+    else:
+        price_increase, price_increase_percentage = 0, 0
+
+    return AuctionSummary(
+        auction=auction,
+        final_price=auction.current_price,
+        price_increase_amount=price_increase,
+        price_increase_percentage=price_increase_percentage,
+        duration_seconds=duration_seconds,
+        winner_type=_winner_type(auction, counts['total']),
+        total_bids=counts['total'],
+        human_bids=counts['human'],
+        bot_bids=counts['bot'],
+        phase_1_bids=counts['phase_1'],
+        phase_2_bids=counts['phase_2'],
+        phase_3_bids=counts['phase_3'],
+        bidders=bidders,
+    )
+
+
+def record_summaries(auctions):
+    """
+    Store the summaries of many completed auctions with a fixed number of queries.
+
+    Auctions that already have a summary are skipped.
+    """
+    existing = set(AuctionSummary.objects.filter(auction__in=auctions).values_list('auction_id', flat=True))
+    auctions = [auction for auction in auctions if auction.pk not in existing]
+    if not auctions:
+        return
+
+    bids = Bid.objects.filter(auction__in=auctions).order_by()
+    counts = {row['auction_id']: row for row in bids.values('auction_id').annotate(**_COUNTS)}
+    bidders = {}
+    for row in bids.values('auction_id', 'bidder__username', 'bidder_type').annotate(
+        **_BIDDER_TOTALS
+    ).order_by('auction_id', '-max_bid'):
+        bidders.setdefault(row['auction_id'], []).append(_bidder_entry(row))
+
+    no_bids = dict.fromkeys(_COUNTS, 0)
+    AuctionSummary.objects.bulk_create(
+        [
+            _summary(auction, counts.get(auction.pk, no_bids), bidders.get(auction.pk, []))
+            for auction in auctions
+        ],
+        # Written concurrently by another completion path
+        ignore_conflicts=True,
+    )
+    logger.info(f"Summaries recorded for {len(auctions)} auctions")
+
+
+def record_summary(auction):
+    """
+    Store the summary of a completed auction, once.
+
+    Returns the stored summary; if one already exists it is returned unchanged.
+    """
+    existing = AuctionSummary.objects.filter(auction=auction).first()
+    if existing:
+        return existing
+
+    summary = build_summary(auction)
+    try:
+        with transaction.atomic():
+            summary.save(force_insert=True)
+    except IntegrityError:
+        # Written concurrently by another completion path
+        return AuctionSummary.objects.get(auction=auction)
+
+    logger.info(f"Summary recorded for auction {auction.id}")
+    return summary
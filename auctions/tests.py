@@ -0,0 +1,554 @@
+from contextlib import contextmanager
+from io import StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from . import bot_runner, leases
+from .bidding import BidConflict, commit_bid, respond_with_proxies
+from .bot_batch import place_bot_bids
+from .bot_logic import AuctionBot, snapshot_queryset
+from .bot_runner import BotEngine, _BotState, _tick
+from .completion import complete_auctions
+from .models import Auction, AuctionSummary, Bid, BotLease, ProxyBid
+
+User = get_user_model()
+
+TEST_CONFIG = {**settings.AUCTION_CONFIG, 'LOG_WRITER_SYNC': True}
+
+
+@override_settings(AUCTION_CONFIG=TEST_CONFIG)
+class AuctionListQueryTests(TestCase):
+    """List endpoints cost the same number of queries whatever the page size."""
+
+    # Auctions rendered per page in each run; both below PAGE_SIZE
+    SIZES = (3, 12)
+
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+        self.bidder = User.objects.create_user(username='bidder', email='bidder@example.com', password='pw')
+        self.client = APIClient(HTTP_HOST='localhost')
+        self.client.force_authenticate(self.owner)
+
+    def make_auctions(self, count, status='active'):
+        """Create `count` auctions with human and bot bids, in `status`."""
+        now = timezone.now()
+        for i in range(count):
+            auction = Auction.objects.create(
+                title=f'Auction {i}',
+                start_price=1000,
+                current_price=1000,
+                max_bid=100000,
+                duration=300,
+                status='active',
+                start_time=now,
+                end_time=now + timezone.timedelta(seconds=300),
+                bot_active=False,
+                created_by=self.owner,
+            )
+            commit_bid(Bid(auction=auction, bidder=self.bidder, bidder_type='human', amount=1100, phase=1))
+            commit_bid(Bid(auction=auction, bidder_type='bot', amount=1200, phase=1))
+            commit_bid(Bid(auction=auction, bidder=self.bidder, bidder_type='human', amount=1300, phase=1))
+            if status == 'completed':
+                Auction.objects.filter(pk=auction.pk).update(status='completed', end_time=now, winner=self.bidder)
+        cache.clear()
+
+    def assert_constant_queries(self, url, queries, status='active', sizes=SIZES):
+        made = 0
+        for size in sizes:
+            with self.subTest(auctions=size):
+                self.make_auctions(size - made, status=status)
+                made = size
+                with self.assertNumQueries(queries):
+                    response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                cache.clear()
+
+    def test_list(self):
+        # The page and the pagination count
+        self.assert_constant_queries('/api/auctions/', 2)
+
+    def test_list_filtered_by_status(self):
+        self.assert_constant_queries('/api/auctions/?status=active', 2)
+
+    def test_active_auctions(self):
+        self.assert_constant_queries('/api/auctions/active/', 1)
+
+    def test_my_auctions(self):
+        self.assert_constant_queries('/api/auctions/my-auctions/', 1)
+
+    def test_statistics(self):
+        # Counters, top bidders and recent_auctions, which shows at most 5 completed auctions
+        self.assert_constant_queries('/api/auctions/statistics/', 3, status='completed', sizes=(2, 5))
+
+
+
+@override_settings(AUCTION_CONFIG=TEST_CONFIG)
+class AuctionDetailRouteTests(TestCase):
+    """The viewset's detail actions are served under /api/auctions/<id>/."""
+
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+        self.client = APIClient(HTTP_HOST='localhost')
+        self.client.force_authenticate(self.owner)
+
+    def make_auction(self):
+        return Auction.objects.create(
+            title='Routed auction',
+            start_price=1000,
+            current_price=1000,
+            max_bid=100000,
+            duration=300,
+            bot_active=False,
+            created_by=self.owner,
+        )
+
+    def test_detail_actions(self):
+        auction = self.make_auction()
+        url = f'/api/auctions/{auction.id}/'
+        for action in ('status_info', 'bids', 'logs', 'bot_status'):
+            with self.subTest(action=action):
+                self.assertEqual(self.client.get(url + f'{action}/').status_code, 200)
+
+        response = self.client.post(url + 'start/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['status'], 'active')
+        response = self.client.post(url + 'stop/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['status'], 'completed')
+
+    def test_delete_pending(self):
+        auction = self.make_auction()
+        response = self.client.delete(f'/api/auctions/{auction.id}/delete_pending/')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Auction.objects.filter(pk=auction.pk).exists())
+
+@override_settings(AUCTION_CONFIG=TEST_CONFIG)
+class BotTickQueryTests(TestCase):
+    """A bot tick costs a fixed, small number of queries."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+
+    def make_auction(self, elapsed):
+        """An active auction with its bot on, `elapsed` seconds into a 400s run."""
+        start = timezone.now() - timezone.timedelta(seconds=elapsed)
+        return Auction.objects.create(
+            title='Bot auction',
+            start_price=1000,
+            current_price=1000,
+            max_bid=100000,
+            duration=400,
+            status='active',
+            start_time=start,
+            end_time=start + timezone.timedelta(seconds=400),
+            bot_active=True,
+            created_by=self.owner,
+        )
+
+    def test_idle_tick(self):
+        # Phase 1 runs to 100s and the bot waits until 50s before bidding
+        auction = self.make_auction(elapsed=10)
+        state = _BotState(str(auction.id))
+        # The snapshot
+        with self.assertNumQueries(1):
+            delay = _tick(state)
+        self.assertIsNotNone(delay)
+        self.assertFalse(Bid.objects.filter(auction=auction).exists())
+
+    def test_phase_1_bidding_tick(self):
+        # Phase 1 runs to 100s and the bot bids once at 50s
+        auction = self.make_auction(elapsed=60)
+        state = _BotState(str(auction.id))
+        # The snapshot, then commit_bid: savepoint, bid, statistics, conditional
+        # auction update, log (LOG_WRITER_SYNC), proxy lookup, release
+        with self.assertNumQueries(8):
+            delay = _tick(state)
+        self.assertIsNotNone(delay)
+        self.assertEqual(Bid.objects.filter(auction=auction).count(), 1)
+        auction.refresh_from_db()
+        self.assertEqual(auction.bot_bids_count, 1)
+
+    def test_bidding_tick(self):
+        # Phase 2 runs from 100s to 300s and the bot bids at 220s
+        auction = self.make_auction(elapsed=230)
+        state = _BotState(str(auction.id))
+        # The snapshot, then commit_bid: savepoint, bid, statistics, conditional
+        # auction update, log (LOG_WRITER_SYNC), proxy lookup, release
+        with self.assertNumQueries(8):
+            delay = _tick(state)
+        self.assertIsNotNone(delay)
+        self.assertEqual(Bid.objects.filter(auction=auction, bidder_type='bot', phase=2).count(), 1)
+
+
+@override_settings(AUCTION_CONFIG=TEST_CONFIG)
+class ProxyBidTests(TestCase):
+    """Standing proxy bids answer other bids up to their ceilings (BID_INCREMENTS step 100)."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+        self.alice = User.objects.create_user(username='alice', email='alice@example.com', password='pw')
+        self.bob = User.objects.create_user(username='bob', email='bob@example.com', password='pw')
+        now = timezone.now()
+        self.auction = Auction.objects.create(
+            title='Proxy auction',
+            start_price=1000,
+            current_price=1000,
+            max_bid=100000,
+            duration=300,
+            status='active',
+            start_time=now,
+            end_time=now + timezone.timedelta(seconds=300),
+            bot_active=False,
+            created_by=self.owner,
+        )
+
+    def add_proxy(self, bidder, ceiling, seconds_ago=0):
+        proxy = ProxyBid.objects.create(auction=self.auction, bidder=bidder, ceiling=ceiling)
+        # Registration order decides ties; don't leave it to clock resolution
+        ProxyBid.objects.filter(pk=proxy.pk).update(
+            created_at=timezone.now() - timezone.timedelta(seconds=seconds_ago)
+        )
+        return proxy
+
+    def bot_bid(self, amount):
+        commit_bid(Bid(auction=self.auction, bidder_type='bot', amount=amount, phase=1))
+        self.auction.refresh_from_db()
+
+    def assert_leader(self, bidder, price):
+        self.assertEqual(self.auction.latest_bid.bidder, bidder)
+        self.assertEqual(self.auction.current_price, price)
+
+    def test_proxy_answers_bot_bid(self):
+        self.add_proxy(self.alice, 5000)
+        self.bot_bid(1200)
+        self.assert_leader(self.alice, 1300)
+        self.assertEqual(self.auction.total_bids, 2)
+
+    def test_proxies_bid_against_each_other(self):
+        self.add_proxy(self.alice, 3000, seconds_ago=2)
+        self.add_proxy(self.bob, 5000, seconds_ago=1)
+        self.bot_bid(1200)
+        # Alice bids her ceiling at once and Bob answers one step above it
+        self.assert_leader(self.bob, 3100)
+        self.assertEqual(self.auction.total_bids, 3)
+
+    def test_equal_ceilings_go_to_the_earlier_proxy(self):
+        self.add_proxy(self.bob, 5000, seconds_ago=1)
+        self.add_proxy(self.alice, 5000, seconds_ago=2)
+        self.bot_bid(1200)
+        self.assert_leader(self.alice, 5000)
+
+    def test_leading_owner_does_not_outbid_themselves(self):
+        commit_bid(Bid(auction=self.auction, bidder=self.alice, bidder_type='human', amount=1100, phase=1))
+        self.add_proxy(self.alice, 5000)
+        self.assertEqual(respond_with_proxies(self.auction, 1100, self.alice.id), [])
+        self.auction.refresh_from_db()
+        self.assert_leader(self.alice, 1100)
+        self.assertEqual(self.auction.total_bids, 1)
+
+    def test_proxy_endpoint(self):
+        client = APIClient(HTTP_HOST='localhost')
+        client.force_authenticate(self.alice)
+        url = f'/api/auctions/{self.auction.id}/proxy/'
+        self.assertEqual(client.get(url).status_code, 404)
+        self.assertIn(client.post(url, {'ceiling': 5000}, format='json').status_code, (200, 201))
+        self.assertEqual(client.get(url).json()['ceiling'], '5000.00')
+        self.assertEqual(client.delete(url).status_code, 204)
+        self.assertFalse(ProxyBid.objects.filter(auction=self.auction).exists())
+
+
+@override_settings(AUCTION_CONFIG=TEST_CONFIG)
+class AuctionSummaryTests(TestCase):
+    """A summary's winner_type agrees with the auction's winner."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+        self.bidder = User.objects.create_user(username='bidder', email='bidder@example.com', password='pw')
+
+    def make_auction(self, bidders, ended=False):
+        """An active auction with bids from `bidders` ('human' or 'bot'), in order."""
+        now = timezone.now()
+        start = now - timezone.timedelta(seconds=400 if ended else 10)
+        auction = Auction.objects.create(
+            title='Summarized auction',
+            start_price=1000,
+            current_price=1000,
+            max_bid=100000,
+            duration=300,
+            status='active',
+            start_time=start,
+            end_time=start + timezone.timedelta(seconds=300),
+            bot_active=False,
+            created_by=self.owner,
+        )
+        for i, bidder_type in enumerate(bidders, start=1):
+            bidder = self.bidder if bidder_type == 'human' else None
+            commit_bid(Bid(auction=auction, bidder=bidder, bidder_type=bidder_type, amount=1000 + 100 * i, phase=1))
+        return auction
+
+    def test_stopped_auction_last_bid_by_bot(self):
+        auction = self.make_auction(['human', 'bot'])
+        client = APIClient(HTTP_HOST='localhost')
+        client.force_authenticate(self.owner)
+        self.assertEqual(client.post(f'/api/auctions/{auction.id}/stop/').status_code, 200)
+        auction.refresh_from_db()
+        self.assertEqual(auction.winner, self.bidder)
+        self.assertEqual(auction.summary.winner_type, 'human')
+
+    def test_completed_auction_last_bid_by_bot(self):
+        auction = self.make_auction(['human', 'bot'], ended=True)
+        self.assertEqual(len(complete_auctions([auction.pk])), 1)
+        auction.refresh_from_db()
+        self.assertIsNone(auction.winner)
+        self.assertEqual(auction.summary.winner_type, 'bot')
+
+    def test_backfill_corrects_winner_type(self):
+        stale = self.make_auction(['human', 'bot'])
+        missing = self.make_auction([])
+        Auction.objects.filter(pk__in=[stale.pk, missing.pk]).update(status='completed')
+        Auction.objects.filter(pk=stale.pk).update(winner=self.bidder)
+        stale.refresh_from_db()
+        AuctionSummary.objects.create(
+            auction=stale, final_price=1200, price_increase_amount=200, price_increase_percentage=20,
+            duration_seconds=10, winner_type='bot', total_bids=2, human_bids=1, bot_bids=1,
+            phase_1_bids=2, phase_2_bids=0, phase_3_bids=0, bidders=[],
+        )
+        call_command('backfill_auction_summaries', stdout=StringIO())
+        self.assertEqual(AuctionSummary.objects.get(auction=stale).winner_type, 'human')
+        self.assertEqual(AuctionSummary.objects.get(auction=missing).winner_type, 'none')
+
+
+@contextmanager
+def as_process(owner):
+    """Run lease calls as if from the process `owner`."""
+    with mock.patch('auctions.leases.owner_id', return_value=owner):
+        yield
+
+
+@override_settings(AUCTION_CONFIG=TEST_CONFIG)
+@mock.patch.object(BotEngine, '_ensure_started')  # leases only; no ticks
+class BotLeaseTests(TestCase):
+    """Two engines, standing in for two processes, share bots through leases in one database."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+        self.auction_id = str(self.make_auction().id)
+        self.first, self.second = BotEngine(), BotEngine()
+
+    def make_auction(self):
+        now = timezone.now()
+        return Auction.objects.create(
+            title='Leased auction',
+            start_price=1000,
+            current_price=1000,
+            max_bid=100000,
+            duration=300,
+            status='active',
+            start_time=now,
+            end_time=now + timezone.timedelta(seconds=300),
+            created_by=self.owner,
+        )
+
+    def expire_lease(self):
+        BotLease.objects.filter(auction_id=self.auction_id).update(
+            expires_at=timezone.now() - timezone.timedelta(seconds=1)
+        )
+
+    def test_acquire(self, _):
+        with as_process('first'):
+            self.assertTrue(self.first.start_bot(self.auction_id))
+        with as_process('second'):
+            self.assertFalse(self.second.start_bot(self.auction_id))
+            self.assertEqual(self.second.claim_orphaned_bots(), [])
+        self.assertTrue(self.first.is_running(self.auction_id))
+        self.assertFalse(self.second.is_running(self.auction_id))
+        self.assertEqual(leases.current_owner(self.auction_id), 'first')
+
+    def test_heartbeat_renews(self, _):
+        with as_process('first'):
+            self.first.start_bot(self.auction_id)
+            BotLease.objects.filter(auction_id=self.auction_id).update(
+                expires_at=timezone.now() + timezone.timedelta(seconds=1)
+            )
+            self.first._heartbeat()
+        lease = BotLease.objects.get(auction_id=self.auction_id)
+        self.assertGreater(lease.expires_at, timezone.now() + timezone.timedelta(seconds=10))
+        self.assertTrue(self.first.is_running(self.auction_id))
+
+    def test_takeover_after_expiry(self, _):
+        with as_process('first'):
+            self.first.start_bot(self.auction_id)
+        self.expire_lease()
+        with as_process('second'):
+            self.assertEqual(self.second.claim_orphaned_bots(), [self.auction_id])
+        self.assertEqual(leases.current_owner(self.auction_id), 'second')
+        # The old owner notices at its next heartbeat and drops the bot
+        with as_process('first'):
+            self.first._heartbeat()
+        self.assertFalse(self.first.is_running(self.auction_id))
+        self.assertTrue(self.second.is_running(self.auction_id))
+
+    def test_stop_releases(self, _):
+        with as_process('first'):
+            self.first.start_bot(self.auction_id)
+            self.first.stop_bot(self.auction_id)
+        self.assertFalse(BotLease.objects.filter(auction_id=self.auction_id).exists())
+        with as_process('second'):
+            self.assertTrue(self.second.start_bot(self.auction_id))
+
+    def test_exit_releases_every_lease(self, _):
+        other_id = str(self.make_auction().id)
+        with as_process('first'):
+            self.first.start_bots([self.auction_id, other_id])
+        with as_process('second'):
+            self.second.start_bot(self.make_auction().id)
+        with as_process('first'), mock.patch.object(bot_runner, '_engine', self.first):
+            bot_runner._shutdown_on_exit()
+        self.assertEqual(list(BotLease.objects.values_list('owner', flat=True)), ['second'])
+        with as_process('second'):
+            self.assertEqual(sorted(self.second.claim_orphaned_bots()), sorted([self.auction_id, other_id]))
+
+
+@override_settings(AUCTION_CONFIG=TEST_CONFIG)
+class BidCommitTests(TestCase):
+    """commit_bid accepts a bid only if the stored price still allows it."""
+
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+        self.bidder = User.objects.create_user(username='bidder', email='bidder@example.com', password='pw')
+        self.rival = User.objects.create_user(username='rival', email='rival@example.com', password='pw')
+        now = timezone.now()
+        self.auction = Auction.objects.create(
+            title='Contested auction',
+            start_price=1000,
+            current_price=1000,
+            max_bid=100000,
+            duration=300,
+            status='active',
+            start_time=now,
+            end_time=now + timezone.timedelta(seconds=300),
+            bot_active=False,
+            created_by=self.owner,
+        )
+
+    def human_bid(self, bidder, amount, auction=None):
+        return Bid(auction=auction or self.auction, bidder=bidder, bidder_type='human', amount=amount, phase=1)
+
+    def test_commit_updates_the_auction(self):
+        bid = commit_bid(self.human_bid(self.bidder, 1100), min_increment=100)
+        self.auction.refresh_from_db()
+        self.assertEqual(self.auction.current_price, 1100)
+        self.assertEqual(self.auction.latest_bid_id, bid.pk)
+        self.assertEqual(self.auction.version, 1)
+        self.assertEqual(self.auction.total_bids, 1)
+        self.assertEqual(self.auction.human_bids_count, 1)
+
+    def test_stale_bid_conflicts(self):
+        stale = Auction.objects.get(pk=self.auction.pk)
+        winner = commit_bid(self.human_bid(self.rival, 1500), min_increment=100)
+        with self.assertRaises(BidConflict) as conflict:
+            commit_bid(self.human_bid(self.bidder, 1100, auction=stale), min_increment=100)
+        self.assertEqual(conflict.exception.current_price, 1500)
+        # The losing bid is rolled back with the update it depended on
+        self.assertEqual(list(Bid.objects.filter(auction=self.auction)), [winner])
+        self.auction.refresh_from_db()
+        self.assertEqual(self.auction.current_price, 1500)
+        self.assertEqual(self.auction.latest_bid_id, winner.pk)
+        self.assertEqual(self.auction.version, 1)
+        self.assertEqual(self.auction.total_bids, 1)
+
+    def test_place_bid_conflict_returns_409(self):
+        def rival_first(bid, *args, **kwargs):
+            # The rival's bid commits after the view has read the auction
+            commit_bid(self.human_bid(self.rival, 1500), min_increment=100)
+            return commit_bid(bid, *args, **kwargs)
+
+        client = APIClient(HTTP_HOST='localhost')
+        client.force_authenticate(self.bidder)
+        with mock.patch('auctions.views.commit_bid', side_effect=rival_first):
+            response = client.post(f'/api/auctions/{self.auction.id}/bid/', {'amount': 1100}, format='json')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(float(response.json()['current_price']), 1500)
+        self.assertFalse(Bid.objects.filter(bidder=self.bidder).exists())
+
+
+@override_settings(AUCTION_CONFIG=TEST_CONFIG)
+class BidCounterTests(TestCase):
+    """The bid counters and latest bid on Auction stay in step with the bids table."""
+
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+        self.alice = User.objects.create_user(username='alice', email='alice@example.com', password='pw')
+        self.bob = User.objects.create_user(username='bob', email='bob@example.com', password='pw')
+        now = timezone.now()
+        self.auction = Auction.objects.create(
+            title='Counted auction',
+            start_price=1000,
+            current_price=1000,
+            max_bid=100000,
+            duration=300,
+            status='active',
+            start_time=now,
+            end_time=now + timezone.timedelta(seconds=300),
+            created_by=self.owner,
+        )
+
+    def assert_counters_match(self):
+        self.auction.refresh_from_db()
+        bids = Bid.objects.filter(auction=self.auction)
+        self.assertEqual(self.auction.total_bids, bids.count())
+        self.assertEqual(self.auction.human_bids_count, bids.filter(bidder_type='human').count())
+        self.assertEqual(self.auction.bot_bids_count, bids.filter(bidder_type='bot').count())
+        self.assertEqual(self.auction.latest_bid, bids.first())
+
+    def verify(self):
+        out = StringIO()
+        call_command('sync_bid_counters', '--verify', stdout=out)
+        return out.getvalue()
+
+    def test_human_bot_and_proxy_bids(self):
+        ProxyBid.objects.create(auction=self.auction, bidder=self.bob, ceiling=50000)
+        client = APIClient(HTTP_HOST='localhost')
+        client.force_authenticate(self.alice)
+        # Alice's bid is answered by Bob's proxy
+        response = client.post(f'/api/auctions/{self.auction.id}/bid/', {'amount': 1100}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assert_counters_match()
+
+        # A bot bid, committed on its own and then in a batch; the proxy answers both
+        self.assertTrue(AuctionBot(snapshot_queryset().get(pk=self.auction.pk)).place_bid(phase=1))
+        self.assert_counters_match()
+        intents = []
+        AuctionBot(snapshot_queryset().get(pk=self.auction.pk), bid_sink=intents).place_bid(phase=2)
+        self.assertEqual(len(place_bot_bids(intents)), 1)
+        self.assert_counters_match()
+
+        self.assertEqual(self.auction.human_bids_count, 4)
+        self.assertEqual(self.auction.bot_bids_count, 2)
+        self.assertEqual(self.auction.latest_bid.bidder, self.bob)
+        self.assertIn('All auction bid counters match', self.verify())
+
+    def test_sync_detects_and_fixes_drift(self):
+        commit_bid(Bid(auction=self.auction, bidder=self.alice, bidder_type='human', amount=1100, phase=1))
+        commit_bid(Bid(auction=self.auction, bidder_type='bot', amount=1200, phase=1))
+        Auction.objects.filter(pk=self.auction.pk).update(total_bids=7, bot_bids_count=0, latest_bid=None)
+
+        report = self.verify()
+        self.assertIn('total_bids=7 (expected 2)', report)
+        self.assertIn('bot_bids_count=0 (expected 1)', report)
+        self.assertIn('1 auctions have stale bid counters', report)
+
+        call_command('sync_bid_counters', stdout=StringIO())
+        self.assert_counters_match()
+        self.assertIn('All auction bid counters match', self.verify())
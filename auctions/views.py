@@ -1,26 +1,52 @@
 from rest_framework import viewsets, status, generics
-from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.decorators import action, api_view, permission_classes, renderer_classes, throttle_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework.throttling import UserRateThrottle
 from django.utils import timezone
-from django.db.models import Q, Count, Sum, Avg
-from django.db import models
+from django.db.models import Q, F, DurationField, ExpressionWrapper, OuterRef, Subquery
 from django.shortcuts import get_object_or_404, render
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django.conf import settings
+from django.db import transaction
+from django.utils.dateparse import parse_datetime
 import logging
+import uuid
 
-from .models import Auction, Bid, AuctionLog
+from .models import Auction, Bid, AuctionLog, AuctionSummary, ProxyBid
 from .serializers import (
     AuctionSerializer, AuctionDetailSerializer, BidSerializer,
-    BidCreateSerializer, AuctionCreateSerializer, AuctionStatsSerializer
+    BidCreateSerializer, AuctionCreateSerializer, AuctionStatsSerializer,
+    ProxyBidSerializer, ProxyBidCreateSerializer
 )
+from . import read_cache, stats
+from .fast_serializers import FastJSONRenderer, bid_rows, build_bid, serialize_auctions, serialize_bids
+from .bidding import BidConflict, commit_bid, respond_with_proxies
+from .summaries import record_summary
 from .bot_logic import AuctionBot
-from .bot_runner import start_auction_bot, stop_auction_bot
+from .bot_runner import stop_auction_bot
+from .scheduled_starts import get_scheduler, start_auctions
+from .throttles import BiddingRateThrottle
 
 logger = logging.getLogger('auctions')
 
+# Completed auctions shown per page on the completed auctions page
+COMPLETED_AUCTIONS_PAGE_SIZE = 24
+
+# Renderers of the hot read endpoints that return fast_serializers output
+FAST_RENDERERS = [FastJSONRenderer, BrowsableAPIRenderer]
+
+# Most auctions one batch status request may ask for
+BATCH_STATUS_MAX_IDS = 100
+
+# Default and maximum page size of the bids/ and logs/ feeds
+FEED_PAGE_SIZE = 50
+FEED_MAX_PAGE_SIZE = 200
+
 # Frontend Views
 def home(request):
     """Home page with active auctions."""
@@ -37,16 +63,16 @@ def auction_detail(request, auction_id):
     bids = auction.bids.all().order_by('-timestamp')[:20]
     logs = auction.logs.all().order_by('-timestamp')[:10]
     
-    # Calculate bid counts
-    human_bids_count = auction.bids.filter(bidder_type='human').count()
-    bot_bids_count = auction.bids.filter(bidder_type='bot').count()
-    
     return render(request, 'auctions/auction_detail.html', {
         'auction': auction,
         'bids': bids,
         'logs': logs,
-        'human_bids_count': human_bids_count,
-        'bot_bids_count': bot_bids_count,
+        'human_bids_count': auction.human_bids_count,
+        'bot_bids_count': auction.bot_bids_count,
+        'proxy_bid': (
+            ProxyBid.objects.filter(auction=auction, bidder=request.user).first()
+            if request.user.is_authenticated else None
+        ),
     })
 
 def create_auction(request):
@@ -72,82 +98,186 @@ def my_auctions_view(request):
 
 def statistics_view(request):
     """Statistics dashboard."""
-    stats = {
-        'total_auctions': Auction.objects.count(),
-        'active_auctions': Auction.objects.filter(status='active').count(),
-        'pending_auctions': Auction.objects.filter(status='pending').count(),
-        'completed_auctions': Auction.objects.filter(status='completed').count(),
-        'cancelled_auctions': Auction.objects.filter(status='cancelled').count(),
-    }
-    return render(request, 'auctions/statistics.html', {'stats': stats})
+    totals = stats.snapshot()
+    return render(request, 'auctions/statistics.html', {
+        'stats': {field: totals[field] for field in (
+            'total_auctions', 'active_auctions', 'pending_auctions',
+            'completed_auctions', 'cancelled_auctions',
+        )},
+    })
 
 
 def completed_auctions_view(request):
-    """View list of completed auctions with basic info."""
+    """View completed auctions, newest first, one keyset page at a time."""
     completed_auctions = Auction.objects.filter(
-        status='completed'
-    ).select_related('created_by', 'winner').order_by('-end_time')
+        status='completed', end_time__isnull=False
+    ).select_related('created_by', 'winner', 'latest_bid').annotate(
+        actual_duration=ExpressionWrapper(F('end_time') - F('start_time'), output_field=DurationField())
+    ).order_by('-end_time', '-id')
+    
+    # Continue after the last auction of the previous page (end_time, id)
+    cursor = _parse_cursor(request.GET.get('cursor'))
+    if cursor:
+        end_time, auction_id = cursor
+        completed_auctions = completed_auctions.filter(
+            Q(end_time__lt=end_time) | Q(end_time=end_time, id__lt=auction_id)
+        )
     
-    # Add basic stats for each auction
-    for auction in completed_auctions:
-        auction.total_bids = auction.bids.count()
-        auction.human_bids_count = auction.bids.filter(bidder_type='human').count()
-        auction.bot_bids_count = auction.bids.filter(bidder_type='bot').count()
-        
-        # Calculate auction duration
-        if auction.start_time and auction.end_time:
-            auction.actual_duration = (auction.end_time - auction.start_time).total_seconds()
-        else:
-            auction.actual_duration = 0
+    page = list(completed_auctions[:COMPLETED_AUCTIONS_PAGE_SIZE + 1])
+    next_cursor = None
+    if len(page) > COMPLETED_AUCTIONS_PAGE_SIZE:
+        page = page[:COMPLETED_AUCTIONS_PAGE_SIZE]
+        last = page[-1]
+        next_cursor = f"{last.end_time.isoformat()},{last.id}"
     
     return render(request, 'auctions/completed_auctions.html', {
-        'completed_auctions': completed_auctions
+        'completed_auctions': page,
+        'next_cursor': next_cursor,
+        'is_first_page': cursor is None,
     })
 
 
+def _parse_cursor(value, id_type=uuid.UUID):
+    """Decode a "datetime,id" keyset cursor; None if missing or malformed."""
+    if not value:
+        return None
+    moment, _, object_id = value.partition(',')
+    try:
+        moment = parse_datetime(moment)
+        object_id = id_type(object_id)
+    except ValueError:
+        return None
+    if moment is None:
+        return None
+    return moment, object_id
+
+
+def _auction_scope(pk):
+    """Canonical auction id for read cache keys."""
+    try:
+        return str(uuid.UUID(str(pk)))
+    except ValueError:
+        return str(pk)
+
+
+def _auction_etag(with_clock):
+    """
+    ETag function for per-auction endpoints, computed from one narrow row read.
+
+    The ETag is the auction's version; representations that include the
+    clock-driven fields (remaining_time, phase progress) add the current
+    whole second while the auction runs.
+    """
+    def etag(request, pk=None, **kwargs):
+        try:
+            uuid.UUID(str(pk))
+        except ValueError:
+            return None
+        auction = Auction.objects.only(
+            'version', 'status', 'start_time', 'end_time', 'duration'
+        ).filter(pk=pk).first()
+        if auction is None:
+            return None
+        if with_clock and auction.status == 'active':
+            return f"{auction.version}-{int(auction.remaining_time)}"
+        return str(auction.version)
+    return etag
+
+
+# Conditional GET (ETag / If-None-Match -> 304) for auction reads
+auction_state_etag = method_decorator(condition(etag_func=_auction_etag(with_clock=False)))
+auction_live_etag = method_decorator(condition(etag_func=_auction_etag(with_clock=True)))
+
+
+def _cached_response(scope, name, view, variant=''):
+    """Serve the Response returned by `view()` through the micro-TTL read cache."""
+    def compute():
+        response = view()
+        return response.status_code, response.data
+    status_code, data = read_cache.get_or_compute(scope, name, compute, variant)
+    return Response(data, status=status_code)
+
+
+def _feed_cursor(item):
+    """Keyset cursor of a serialized bid or log entry: "timestamp,id"."""
+    return f"{item['timestamp']},{item['id']}"
+
+
+def _keyset_feed(request, queryset, serialize, id_type=uuid.UUID):
+    """
+    Page through timestamped rows of one auction by (timestamp, id) keyset.
+
+    `serialize` turns the sliced queryset into a list of dicts with
+    ``timestamp`` and ``id`` keys.
+
+    - ``?after=<cursor>`` returns rows newer than the cursor, oldest first.
+      ``cursor`` in the response is the position to poll from next (unchanged
+      when nothing is new); ``has_more`` means another page is waiting. An
+      empty cursor starts from the first row.
+    - Otherwise rows are returned newest first. ``?before=<cursor>`` continues
+      the history from a previous page's ``next`` cursor; the first page also
+      carries the ``cursor`` to start polling ``after`` from.
+
+    ``?limit=`` sets the page size (default FEED_PAGE_SIZE).
+    """
+    try:
+        limit = min(max(int(request.query_params.get('limit', FEED_PAGE_SIZE)), 1), FEED_MAX_PAGE_SIZE)
+    except ValueError:
+        limit = FEED_PAGE_SIZE
+
+    if 'after' in request.query_params:
+        after = _parse_cursor(request.query_params['after'], id_type)
+        if request.query_params['after'] and after is None:
+            return Response({'error': 'Invalid cursor.'}, status=status.HTTP_400_BAD_REQUEST)
+        if after:
+            timestamp, object_id = after
+            queryset = queryset.filter(Q(timestamp__gt=timestamp) | Q(timestamp=timestamp, id__gt=object_id))
+        rows = serialize(queryset.order_by('timestamp', 'id')[:limit + 1])
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        return Response({
+            'results': rows,
+            'cursor': _feed_cursor(rows[-1]) if rows else request.query_params['after'],
+            'has_more': has_more,
+        })
+
+    before = _parse_cursor(request.query_params.get('before'), id_type)
+    if request.query_params.get('before') and before is None:
+        return Response({'error': 'Invalid cursor.'}, status=status.HTTP_400_BAD_REQUEST)
+    if before:
+        timestamp, object_id = before
+        queryset = queryset.filter(Q(timestamp__lt=timestamp) | Q(timestamp=timestamp, id__lt=object_id))
+    rows = serialize(queryset.order_by('-timestamp', '-id')[:limit + 1])
+    next_cursor = _feed_cursor(rows[limit - 1]) if len(rows) > limit else None
+    rows = rows[:limit]
+
+    data = {'results': rows, 'next': next_cursor}
+    if not before:
+        # Poll `after` this; an empty cursor means "from the first row"
+        data['cursor'] = _feed_cursor(rows[0]) if rows else ''
+    return Response(data)
+
+
 def completed_auction_detail_view(request, auction_id):
     """View detailed history for a specific completed auction."""
-    auction = get_object_or_404(Auction, id=auction_id, status='completed')
-    
-    # Get comprehensive auction data
-    auction.total_bids = auction.bids.count()
-    auction.human_bids_count = auction.bids.filter(bidder_type='human').count()
-    auction.bot_bids_count = auction.bids.filter(bidder_type='bot').count()
+    auction = get_object_or_404(
+        Auction.objects.select_related('created_by', 'winner', 'latest_bid', 'summary'),
+        id=auction_id,
+        status='completed'
+    )
     auction.bid_history = auction.bids.select_related('bidder').order_by('timestamp')
     
-    # Calculate auction duration
-    if auction.start_time and auction.end_time:
-        auction.actual_duration = (auction.end_time - auction.start_time).total_seconds()
-    else:
-        auction.actual_duration = 0
-    
-    # Calculate price increase percentage
-    if auction.start_price > 0:
-        price_increase = auction.current_price - auction.start_price
-        auction.price_increase_amount = price_increase
-        auction.price_increase_percentage = (price_increase / auction.start_price) * 100
-    else:
-        auction.price_increase_amount = 0
-        auction.price_increase_percentage = 0
-    
-    # Get phase breakdown
-    phase_stats = {
-        1: auction.bids.filter(phase=1).count(),
-        2: auction.bids.filter(phase=2).count(),
-        3: auction.bids.filter(phase=3).count(),
-    }
-    
-    # Get bidder participation
-    unique_bidders = auction.bids.values('bidder__username', 'bidder_type').annotate(
-        bid_count=models.Count('id'),
-        total_amount=models.Sum('amount'),
-        max_bid=models.Max('amount')
-    ).order_by('-max_bid')
+    # Results are materialized at completion; older auctions get theirs on first view
+    try:
+        summary = auction.summary
+    except AuctionSummary.DoesNotExist:
+        summary = record_summary(auction)
     
     return render(request, 'auctions/completed_auction_detail.html', {
         'auction': auction,
-        'phase_stats': phase_stats,
-        'unique_bidders': unique_bidders,
+        'summary': summary,
+        'phase_stats': summary.phase_stats,
+        'unique_bidders': summary.bidders,
     })
 
 class AuctionViewSet(viewsets.ModelViewSet):
@@ -160,6 +290,10 @@ class AuctionViewSet(viewsets.ModelViewSet):
     ordering_fields = ['created_at', 'start_time', 'current_price']
     ordering = ['-created_at']
     
+    @auction_live_etag
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+    
     def get_serializer_class(self):
         if self.action == 'retrieve':
             return AuctionDetailSerializer
@@ -173,11 +307,17 @@ class AuctionViewSet(viewsets.ModelViewSet):
         status_filter = self.request.query_params.get('status')
         if status_filter:
             queryset = queryset.filter(status=status_filter)
+        # Only reads need the related rows the serializer renders
+        serializer_class = self.get_serializer_class()
+        if self.request.method == 'GET' and hasattr(serializer_class, 'setup_eager_loading'):
+            queryset = serializer_class.setup_eager_loading(queryset)
         return queryset
     
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user, current_price=serializer.validated_data['start_price'])
         logger.info(f"Auction created: {serializer.instance.title} by {self.request.user.username}")
+        if serializer.instance.scheduled_start:
+            get_scheduler().notify()
     
     @action(detail=True, methods=['post'])
     def start(self, request, pk=None):
@@ -196,24 +336,9 @@ class AuctionViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        # Start the auction
-        auction.status = 'active'
-        auction.start_time = timezone.now()
-        auction.end_time = auction.start_time + timezone.timedelta(seconds=auction.duration)
-        auction.current_price = auction.start_price
-        auction.save()
-        
-        # Create initial log
-        AuctionLog.objects.create(
-            auction=auction,
-            event_type='started',
-            message=f"Auction started. Duration: {auction.duration}s, Max bid: ₹{auction.max_bid}"
-        )
-        
-        # Start bot if enabled
-        if auction.bot_active:
-            start_auction_bot(str(auction.id))
-            logger.info(f"Bot started for auction: {auction.id}")
+        # Start the auction; its bot starts once the transaction commits
+        start_auctions([auction.pk])
+        auction.refresh_from_db()
         
         # No WebSocket broadcast needed (simplified version)
         
@@ -225,24 +350,32 @@ class AuctionViewSet(viewsets.ModelViewSet):
         """Check if bot is running for this auction."""
         auction = self.get_object()
         
-        from .bot_runner import _running_bots
+        from .bot_runner import get_engine
+        from . import leases
         import threading
         
         auction_id_str = str(auction.id)
-        is_running = auction_id_str in _running_bots
-        thread_alive = False
-        
-        if is_running:
-            thread = _running_bots[auction_id_str]
-            thread_alive = thread.is_alive()
+        engine = get_engine()
+        is_running = engine.is_running(auction_id_str)
+        lease_owner = leases.current_owner(auction_id_str)
+        # Plans are seeded, so this is the plan the owning process follows
+        plan = AuctionBot(auction).plan if auction.status == 'active' else None
+        # Only staff and the creator see the bot's upcoming bid times
+        full_plan = request.user.is_staff or auction.created_by_id == request.user.id
         
         return Response({
             'auction_id': auction_id_str,
             'bot_active': auction.bot_active,
             'bot_thread_exists': is_running,
-            'bot_thread_alive': thread_alive,
-            'active_threads': len(_running_bots),
-            'all_threads': [t.name for t in threading.enumerate() if 'AuctionBot' in t.name]
+            'bot_thread_alive': is_running and engine.is_alive(),
+            'active_threads': engine.running_count(),
+            'engine_workers': engine.max_workers,
+            'scheduler_lateness_ms': round(engine.lateness_ms(), 3),
+            'scheduled_starts': get_scheduler().metrics(),
+            'lease_owner': lease_owner,
+            'owned_by_this_process': lease_owner is not None and lease_owner == leases.owner_id(),
+            'all_threads': [t.name for t in threading.enumerate() if 'AuctionBot' in t.name],
+            'bot_plan': plan.describe(full=full_plan) if plan else None
         })
     
     @action(detail=True, methods=['delete'])
@@ -291,69 +424,143 @@ class AuctionViewSet(viewsets.ModelViewSet):
         
         # Stop the auction
         stop_auction_bot(str(auction.id))
-        auction.status = 'completed'
-        auction.end_time = timezone.now()
-        
-        # Determine winner (last human bidder)
-        last_human_bid = auction.bids.filter(bidder_type='human').first()
-        if last_human_bid:
-            auction.winner = last_human_bid.bidder
-        
-        auction.save()
+        now = timezone.now()
+        # Winner is the last human bidder, read when the row is completed
+        last_human_bidder = Bid.objects.filter(
+            auction=OuterRef('pk'), bidder_type='human'
+        ).order_by('-timestamp').values('bidder')[:1]
         
-        AuctionLog.objects.create(
-            auction=auction,
-            event_type='completed',
-            message=f"Auction stopped manually by {request.user.username}"
-        )
+        with transaction.atomic():
+            # Conditional, column-level update: bids committing meanwhile keep
+            # their price and counters, and the sweeper cannot complete it twice
+            updated = Auction.objects.filter(pk=auction.pk, status='active').update(
+                status='completed',
+                end_time=now,
+                winner=Subquery(last_human_bidder),
+                updated_at=now,
+                version=F('version') + 1
+            )
+            if not updated:
+                return Response(
+                    {'error': 'Auction is not active.'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            auction.refresh_from_db()
+            
+            AuctionLog.objects.create(
+                auction=auction,
+                event_type='completed',
+                message=f"Auction stopped manually by {request.user.username}"
+            )
+            record_summary(auction)
+            stats.record_status_change('active', 'completed', revenue=stats.auction_revenue(auction))
+        read_cache.invalidate(auction.id)
         
         # No WebSocket broadcast needed (simplified version)
         
         serializer = self.get_serializer(auction)
         return Response(serializer.data, status=status.HTTP_200_OK)
     
-    @action(detail=True, methods=['get'])
-    def bids(self, request, pk=None):
-        """Get all bids for an auction."""
+    @action(detail=True, methods=['get', 'post', 'delete'], url_path='proxy',
+            throttle_classes=[UserRateThrottle, BiddingRateThrottle])
+    def proxy(self, request, pk=None):
+        """Get, set or cancel the user's proxy bid (auto-bid ceiling) on an auction."""
         auction = self.get_object()
-        bids = auction.bids.all()
-        serializer = BidSerializer(bids, many=True)
-        return Response(serializer.data)
+        proxy_bid = ProxyBid.objects.filter(auction=auction, bidder=request.user).first()
+        
+        if request.method == 'GET':
+            if proxy_bid is None:
+                return Response({'error': 'No proxy bid on this auction.'}, status=status.HTTP_404_NOT_FOUND)
+            return Response(ProxyBidSerializer(proxy_bid).data)
+        
+        if request.method == 'DELETE':
+            if proxy_bid is None:
+                return Response({'error': 'No proxy bid on this auction.'}, status=status.HTTP_404_NOT_FOUND)
+            proxy_bid.delete()
+            logger.info(f"Proxy bid cancelled by {request.user.username} on auction {auction.id}")
+            return Response(status=status.HTTP_204_NO_CONTENT)
+        
+        serializer = ProxyBidCreateSerializer(data=request.data, context={'auction': auction})
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        with transaction.atomic():
+            proxy_bid, _ = ProxyBid.objects.update_or_create(
+                auction=auction,
+                bidder=request.user,
+                defaults={'ceiling': serializer.validated_data['ceiling']}
+            )
+            # A new ceiling bids right away unless its owner already leads
+            price, latest_bid_id = Auction.objects.filter(pk=auction.pk).values_list(
+                'current_price', 'latest_bid'
+            ).get()
+            leader = Bid.objects.filter(pk=latest_bid_id).values_list('bidder_type', 'bidder_id').first()
+            leader_id = leader[1] if leader and leader[0] == 'human' else None
+            placed = respond_with_proxies(auction, price, leader_id)
+        
+        logger.info(
+            f"Proxy bid set: up to ₹{proxy_bid.ceiling} by {request.user.username} on auction {auction.id}"
+        )
+        return Response({
+            'proxy_bid': ProxyBidSerializer(proxy_bid).data,
+            'bids': BidSerializer(placed, many=True).data,
+        }, status=status.HTTP_200_OK)
+    
+    @action(detail=True, methods=['get'], renderer_classes=FAST_RENDERERS)
+    @auction_state_etag
+    def bids(self, request, pk=None):
+        """Get an auction's bids, newest first, or only those after a cursor (?after=)."""
+        def compute():
+            auction = self.get_object()
+            return _keyset_feed(request, bid_rows(auction.bids), lambda rows: [build_bid(row) for row in rows])
+        return _cached_response(_auction_scope(pk), 'bids', compute, variant=request.GET.urlencode())
     
     @action(detail=True, methods=['get'])
+    @auction_state_etag
     def logs(self, request, pk=None):
-        """Get all logs for an auction."""
+        """Get an auction's logs, newest first, or only those after a cursor (?after=)."""
         auction = self.get_object()
-        logs = auction.logs.all()
         from .serializers import AuctionLogSerializer
-        serializer = AuctionLogSerializer(logs, many=True)
-        return Response(serializer.data)
+        return _keyset_feed(
+            request, auction.logs.all(), lambda rows: list(AuctionLogSerializer(rows, many=True).data), id_type=int
+        )
     
     @action(detail=True, methods=['get'])
+    @auction_live_etag
     def status_info(self, request, pk=None):
         """Get detailed status information for an auction."""
-        auction = self.get_object()
+        return _cached_response(_auction_scope(pk), 'status_info', lambda: Response(self.get_object().get_status_info()))
+    
+    @action(detail=False, methods=['get'], url_path='status')
+    def batch_status(self, request):
+        """
+        Get status information for many auctions in one query.
         
-        data = {
-            'status': auction.status,
-            'current_phase': auction.current_phase,
-            'phase_progress': auction.phase_progress,
-            'remaining_time': auction.remaining_time,
-            'elapsed_time': auction.elapsed_time,
-            'current_price': float(auction.current_price),
-            'max_bid': float(auction.max_bid),
-            'bot_active': auction.bot_active,
-            'bot_current_bid': float(auction.bot_current_bid),
-            'total_bids': auction.bids.count(),
-            'human_bids': auction.bids.filter(bidder_type='human').count(),
-            'bot_bids': auction.bids.filter(bidder_type='bot').count(),
-        }
+        Pass ?ids=<id>,<id>,... (up to BATCH_STATUS_MAX_IDS), or nothing for
+        all active auctions. Returns {auction_id: status_info}; unknown ids
+        are left out.
+        """
+        ids = [value for ids in request.query_params.getlist('ids') for value in ids.split(',') if value]
+        if ids:
+            if len(ids) > BATCH_STATUS_MAX_IDS:
+                return Response(
+                    {'error': f'At most {BATCH_STATUS_MAX_IDS} auction ids per request.'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            try:
+                ids = [uuid.UUID(value) for value in ids]
+            except ValueError:
+                return Response({'error': 'Invalid auction id.'}, status=status.HTTP_400_BAD_REQUEST)
+            auctions = Auction.objects.filter(id__in=ids)
+        else:
+            auctions = Auction.objects.filter(status='active')
         
-        return Response(data)
+        return Response({str(auction.id): auction.get_status_info() for auction in auctions})
 
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@throttle_classes([UserRateThrottle, BiddingRateThrottle])
 def place_bid(request, auction_id):
     """Place a bid on an auction."""
     auction = get_object_or_404(Auction, id=auction_id)
@@ -372,26 +579,33 @@ def place_bid(request, auction_id):
         # Find the closest valid increment
         increment = min(valid_increments, key=lambda x: abs(x - difference))
     
-    # Create the bid
-    bid = Bid.objects.create(
+    # Commit the bid only if the auction still accepts it
+    phase = auction.current_phase
+    bid = Bid(
         auction=auction,
         bidder=request.user,
         bidder_type='human',
         amount=amount,
-        phase=auction.current_phase
+        phase=phase
     )
-    
-    # Update auction
-    auction.current_price = amount
-    auction.save()
-    
-    # Create log
-    AuctionLog.objects.create(
+    log = AuctionLog(
         auction=auction,
         event_type='bid_placed',
         message=f"Human bid placed: ₹{amount} by {request.user.username}",
-        metadata={'bidder': request.user.username, 'amount': float(amount), 'phase': auction.current_phase}
+        metadata={'bidder': request.user.username, 'amount': float(amount), 'phase': phase}
     )
+    try:
+        commit_bid(
+            bid,
+            log,
+            min_increment=min(settings.AUCTION_CONFIG['BID_INCREMENTS']),
+            require_time_left=True
+        )
+    except BidConflict as e:
+        return Response(
+            {'error': str(e), 'current_price': e.current_price},
+            status=status.HTTP_409_CONFLICT
+        )
     
     logger.info(f"Bid placed: ₹{amount} by {request.user.username} on auction {auction.id}")
     
@@ -402,63 +616,51 @@ def place_bid(request, auction_id):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@renderer_classes(FAST_RENDERERS)
 def active_auctions(request):
     """Get all active auctions."""
-    auctions = Auction.objects.filter(status='active')
-    serializer = AuctionSerializer(auctions, many=True)
-    return Response(serializer.data)
+    def compute():
+        return Response(serialize_auctions(Auction.objects.filter(status='active')))
+    return _cached_response(read_cache.ALL_AUCTIONS, 'active_auctions', compute)
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def my_auctions(request):
     """Get auctions created by the current user."""
-    auctions = Auction.objects.filter(created_by=request.user)
+    auctions = AuctionSerializer.setup_eager_loading(Auction.objects.filter(created_by=request.user))
     serializer = AuctionSerializer(auctions, many=True)
     return Response(serializer.data)
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@renderer_classes(FAST_RENDERERS)
 def my_bids(request):
     """Get all bids placed by the current user."""
-    bids = Bid.objects.filter(bidder=request.user, bidder_type='human')
-    serializer = BidSerializer(bids, many=True)
-    return Response(serializer.data)
+    return Response(serialize_bids(Bid.objects.filter(bidder=request.user, bidder_type='human')))
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def statistics(request):
     """Get auction statistics."""
-    total_auctions = Auction.objects.count()
-    active_auctions = Auction.objects.filter(status='active').count()
-    completed_auctions = Auction.objects.filter(status='completed').count()
-    
-    total_bids = Bid.objects.count()
-    total_revenue = Auction.objects.filter(status='completed', winner__isnull=False).aggregate(
-        total=Sum('current_price')
-    )['total'] or 0
-    
-    avg_bid = Bid.objects.aggregate(avg=Avg('amount'))['avg'] or 0
+    # Counters are maintained incrementally (see stats.py), so this is O(1)
+    totals = stats.snapshot()
     
-    # Top bidders
-    top_bidders = Bid.objects.filter(bidder_type='human').values('bidder__username').annotate(
-        bid_count=Count('id'),
-        total_amount=Sum('amount')
-    ).order_by('-bid_count')[:10]
-    
-    recent_auctions = Auction.objects.filter(status='completed').order_by('-end_time')[:5]
+    recent_auctions = AuctionSerializer.setup_eager_loading(
+        Auction.objects.filter(status='completed')
+    ).order_by('-end_time')[:5]
     
     data = {
-        'total_auctions': total_auctions,
-        'active_auctions': active_auctions,
-        'completed_auctions': completed_auctions,
-        'total_bids': total_bids,
-        'total_revenue': float(total_revenue),
-        'average_bid_amount': float(avg_bid),
-        'top_bidders': list(top_bidders),
-        'recent_auctions': AuctionSerializer(recent_auctions, many=True).data
+        'total_auctions': totals['total_auctions'],
+        'active_auctions': totals['active_auctions'],
+        'completed_auctions': totals['completed_auctions'],
+        'total_bids': totals['total_bids'],
+        'total_revenue': float(totals['total_revenue']),
+        'average_bid_amount': float(totals['average_bid_amount']),
+        'top_bidders': stats.top_bidders(),
+        'recent_auctions': recent_auctions
     }
     
     serializer = AuctionStatsSerializer(data)